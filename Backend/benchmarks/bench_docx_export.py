@@ -0,0 +1,104 @@
+"""
+Benchmark: DOCX export throughput on the render executor
+
+Runs DOCX exports through RenderExecutor at several levels of concurrency:
+
+- "parse per export" saves the whole package in the worker with
+  DOCX_BASE_CACHE_SIZE=0, so every export parses python-docx's default
+  template as before;
+- "reused base" saves the whole package in the worker from a base document
+  parsed once per template and theme colour;
+- "streamed package" renders only document.xml's body in the worker and
+  writes the package around it in this process, as /resume/export/docx does.
+
+"first byte ms" is the mean time until the first chunk could be sent, one
+export at a time.
+
+Usage: python benchmarks/bench_docx_export.py [exports per level]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from typing import List
+
+# Add Backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.resume_document import ResumeDocument
+from templates.sample_data import get_sample_resume
+from utils.docx_generator import generate_docx_resume, render_docx_body
+from utils.docx_package import iter_docx_package
+from utils.render_executor import RenderExecutor
+
+THEME_COLORS = ('#3B82F6', '#10B981', '#8B5CF6', '#EF4444')
+CONCURRENCY = (1, 4, 16)
+
+
+async def saved(document: ResumeDocument, theme_color: str) -> float:
+    start = time.perf_counter()
+    await RenderExecutor.run(generate_docx_resume, document, template='auto_cv', theme_color=theme_color)
+    return time.perf_counter() - start
+
+
+async def streamed(document: ResumeDocument, theme_color: str) -> float:
+    start = time.perf_counter()
+    body = await RenderExecutor.run(render_docx_body, document, template='auto_cv', theme_color=theme_color)
+    chunks = iter_docx_package(body, 'auto_cv', theme_color)
+    next(chunks)
+    first_byte = time.perf_counter() - start
+    for _ in chunks:
+        pass
+    return first_byte
+
+
+async def throughput(export, document: ResumeDocument, exports: int, concurrency: int,
+                     first_bytes: List[float]) -> float:
+    """Exports per second with at most concurrency in flight"""
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(index: int):
+        async with slots:
+            first_bytes.append(await export(document, THEME_COLORS[index % len(THEME_COLORS)]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run(index) for index in range(exports)))
+    return exports / (time.perf_counter() - start)
+
+
+async def run_mode(export, document: ResumeDocument, exports: int, cache_size: str):
+    # Read by the workers' settings when the executor spawns them
+    os.environ['DOCX_BASE_CACHE_SIZE'] = cache_size
+    RenderExecutor.start()
+    try:
+        # Start every worker and, with reuse, build their bases and this process's packages
+        warm_up = RenderExecutor.max_workers * len(THEME_COLORS) * 2
+        await throughput(export, document, warm_up, RenderExecutor.max_workers, [])
+        first_bytes: List[float] = []
+        rates = [await throughput(export, document, exports, 1, first_bytes)]
+        rates += [await throughput(export, document, exports, concurrency, []) for concurrency in CONCURRENCY[1:]]
+        return rates, sum(first_bytes) / len(first_bytes) * 1000
+    finally:
+        RenderExecutor.shutdown()
+
+
+async def main():
+    exports = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    document = ResumeDocument.of(get_sample_resume('full'))
+
+    results = {
+        'parse per export': await run_mode(saved, document, exports, '0'),
+        'reused base': await run_mode(saved, document, exports, '16'),
+        'streamed package': await run_mode(streamed, document, exports, '16'),
+    }
+
+    print(f"📊 {exports} DOCX exports per level, {RenderExecutor.max_workers} render workers (exports/s)\n")
+    print(f"{'mode':<20}" + "".join(f"{f'x{concurrency}':>10}" for concurrency in CONCURRENCY)
+          + f"{'first byte ms':>15}")
+    for mode, (rates, first_byte_ms) in results.items():
+        print(f"{mode:<20}" + "".join(f"{rate:>10.1f}" for rate in rates) + f"{first_byte_ms:>15.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,93 @@
+"""
+Benchmark: LaTeX escaping of the sample resume
+
+"legacy" is the escape used before the translate table: a dict built per
+call and a per-character generator join. Escaping is timed over every
+string in the full sample resume, and each body template is timed with
+the table-driven escape.
+
+Usage: python benchmarks/bench_latex_escape.py [rounds]
+"""
+
+import os
+import sys
+import time
+
+# Add Backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.latex_escape import escape_latex
+from templates.latex_template_processor import LaTeXTemplateProcessor
+from templates.resume_document import ResumeDocument
+from templates.sample_data import get_sample_resume
+
+
+def legacy_escape(text: str) -> str:
+    if not text:
+        return ""
+
+    chars = {
+        '&': r'\&',
+        '%': r'\%',
+        '$': r'\$',
+        '#': r'\#',
+        '_': r'\_',
+        '{': r'\{',
+        '}': r'\}',
+        '~': r'\textasciitilde{}',
+        '^': r'\textasciicircum{}',
+        '\\': r'\textbackslash{}',
+    }
+
+    return "".join(chars.get(c, c) for c in str(text))
+
+
+def strings(value):
+    """Every string in a resume dict"""
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from strings(item)
+
+
+def per_resume(function, values, rounds: int) -> float:
+    """Mean microseconds to escape every string once"""
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for value in values:
+            function(value)
+    return (time.perf_counter() - start) / rounds * 1e6
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    resume_data = get_sample_resume('full')
+    values = list(strings(resume_data))
+    clean = sum(1 for value in values if escape_latex(value) is value)
+
+    print(f"📊 {len(values)} strings in the full sample ({clean} need no escaping), {rounds} rounds\n")
+    legacy = per_resume(legacy_escape, values, rounds)
+    table = per_resume(escape_latex, values, rounds)
+    print(f"{'escape':<22}{'µs/resume':>10}")
+    print(f"{'legacy':<22}{legacy:>10.1f}")
+    print(f"{'translate table':<22}{table:>10.1f}   ({legacy / table:.1f}x)\n")
+
+    resume = ResumeDocument.of(resume_data)
+    print(f"{'body template':<22}{'legacy µs':>10}{'table µs':>10}")
+    for name, body in LaTeXTemplateProcessor.BODY_TEMPLATES.items():
+        body_rounds = max(rounds // 10, 1)
+        timings = []
+        for escape in (legacy_escape, escape_latex):
+            start = time.perf_counter()
+            for _ in range(body_rounds):
+                body.render(resume, escape)
+            timings.append((time.perf_counter() - start) / body_rounds * 1e6)
+        print(f"{name:<22}{timings[0]:>10.1f}{timings[1]:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Benchmark: size and latency of optimize_pdf per template
+
+Each template renders the full sample resume once, with LaTeX when its
+engine is installed and with its ReportLab version otherwise (the
+"renderer" column says which). The PDF is then optimized repeatedly and
+the mean time is reported next to the render time it adds to.
+
+Usage: python benchmarks/bench_pdf_optimizer.py [rounds]
+"""
+
+import os
+import sys
+import time
+
+# Add Backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.latex_engines import LaTeXEngineRegistry
+from templates.latex_template_processor import LaTeXTemplateProcessor
+from templates.sample_data import get_sample_resume
+from templates.template_manager import TemplateManager
+from utils.pdf_optimizer import SAVE_OPTIONS, fitz, fontTools, optimize_pdf
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if fitz is None:
+        print("PyMuPDF is not installed, optimize_pdf returns its input unchanged")
+        return
+    resume_data = get_sample_resume('full')
+
+    print(f"📊 {rounds} rounds per template; object streams: {'yes' if 'use_objstms' in SAVE_OPTIONS else 'no'}, "
+          f"font subsetting: {'yes' if fontTools is not None else 'no (fontTools missing)'}\n")
+    print(f"{'template':<18}{'renderer':>10}{'render ms':>11}{'KiB':>8}{'optimized':>11}{'saved':>8}{'opt ms':>8}")
+    for name in TemplateManager.TEMPLATES:
+        engine = LaTeXTemplateProcessor.get_engine(name)
+        renderer = engine if LaTeXEngineRegistry.is_available(engine) else 'reportlab'
+
+        start = time.perf_counter()
+        pdf_bytes = TemplateManager.render_resume(resume_data, name).getvalue()
+        render_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for _ in range(rounds):
+            optimized = optimize_pdf(pdf_bytes)
+        optimize_ms = (time.perf_counter() - start) / rounds * 1000
+
+        saved = 1 - len(optimized) / len(pdf_bytes)
+        print(f"{name:<18}{renderer:>10}{render_ms:>11.1f}{len(pdf_bytes) / 1024:>8.1f}"
+              f"{len(optimized) / 1024:>11.1f}{saved:>8.1%}{optimize_ms:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark: ReportLab renders with and without the shared StyleRegistry
+
+"cold" clears the registry before every render, which is what each render
+used to pay; "warm" reuses the stylesheet built by the first render.
+
+Usage: python benchmarks/bench_styles.py [renders]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+# Add Backend directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.style_registry import StyleRegistry
+from templates.sample_data import get_sample_resume
+from templates.auto_cv import AutoCVTemplate
+from templates.anti_cv import AntiCVTemplate
+from templates.ethan_template import EthanTemplate
+from templates.rendercv_classic import RenderCVClassicTemplate
+from templates.yuan_template import YuanTemplate
+from utils.pdf_generator import PDFGenerator
+
+
+RENDERERS = {
+    'auto_cv': lambda: AutoCVTemplate(theme_color='#3B82F6'),
+    'anti_cv': lambda: AntiCVTemplate(theme_color='#3B82F6'),
+    'ethan': lambda: EthanTemplate(theme_color='#3B82F6'),
+    'rendercv_classic': lambda: RenderCVClassicTemplate(theme_color='#3B82F6'),
+    'yuan': lambda: YuanTemplate(theme_color='#3B82F6'),
+    'pdf_generator': lambda: PDFGenerator('modern', '#3B82F6'),
+}
+
+
+def measure(make_renderer, resume_data, renders: int, cold: bool):
+    """Mean milliseconds and peak KiB traced per render; timed without tracemalloc running"""
+    elapsed = 0.0
+    for _ in range(renders):
+        if cold:
+            StyleRegistry.clear()
+        renderer = make_renderer()
+        start = time.perf_counter()
+        renderer.generate(resume_data)
+        elapsed += time.perf_counter() - start
+
+    allocated = 0
+    for _ in range(renders):
+        if cold:
+            StyleRegistry.clear()
+        renderer = make_renderer()
+        tracemalloc.start()
+        renderer.generate(resume_data)
+        allocated += tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return elapsed / renders * 1000, allocated / renders / 1024
+
+
+def measure_styles(make_renderer, renders: int, cold: bool):
+    """Mean microseconds to obtain the stylesheet alone"""
+    renderer = make_renderer()
+    build = getattr(renderer, 'get_styles', None) or (
+        lambda: StyleRegistry.get('PDFGenerator.modern', renderer.theme_color, renderer._modern_styles)
+    )
+    start = time.perf_counter()
+    for _ in range(renders):
+        if cold:
+            StyleRegistry.clear()
+        build()
+    return (time.perf_counter() - start) / renders * 1e6
+
+
+def main():
+    renders = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    resume_data = get_sample_resume('full')
+
+    print(f"📊 {renders} renders per template (peak traced KiB per render)\n")
+    print(f"{'template':<18}{'cold ms':>9}{'warm ms':>9}{'cold KiB':>10}{'warm KiB':>10}{'styles cold µs':>16}{'warm µs':>9}")
+    for name, make_renderer in RENDERERS.items():
+        # One untimed render so fonts and modules are loaded for both runs
+        make_renderer().generate(resume_data)
+        cold_ms, cold_kib = measure(make_renderer, resume_data, renders, cold=True)
+        warm_ms, warm_kib = measure(make_renderer, resume_data, renders, cold=False)
+        styles_cold = measure_styles(make_renderer, renders * 10, cold=True)
+        styles_warm = measure_styles(make_renderer, renders * 10, cold=False)
+        print(f"{name:<18}{cold_ms:>9.2f}{warm_ms:>9.2f}{cold_kib:>10.1f}{warm_kib:>10.1f}"
+              f"{styles_cold:>16.1f}{styles_warm:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+"""
+Build precompiled LaTeX formats for the template preambles
+Run again after changing a template in Templates/ or upgrading TeX Live
+"""
+
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from templates.latex_template_processor import LaTeXTemplateProcessor
+
+
+def build_formats():
+    """Dump a .fmt file for every LaTeX template preamble"""
+
+    print("🔧 Building LaTeX preamble formats...\n")
+    print(f"📁 Output directory: {LaTeXTemplateProcessor.FORMATS_DIR}\n")
+
+    built = LaTeXTemplateProcessor.build_formats()
+    for template_id, format_name in built.items():
+        if format_name:
+            print(f"   ✅ {template_id}: {format_name}.fmt")
+        else:
+            print(f"   ❌ {template_id}: format could not be built, compiles will load the full preamble")
+
+    return all(built.values())
+
+
+if __name__ == "__main__":
+    sys.exit(0 if build_formats() else 1)
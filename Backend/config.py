@@ -1,6 +1,6 @@
 from pydantic_settings import BaseSettings
 from pydantic import field_validator
-from typing import Optional, List, Union
+from typing import Dict, Optional, List, Union
 
 
 class Settings(BaseSettings):
@@ -36,6 +36,61 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: Optional[str] = None
     GOOGLE_CLIENT_SECRET: Optional[str] = None
     
+    # LaTeX rendering
+    LATEX_POOL_SIZE: int = 2  # Warm pdflatex workers per process, 0 disables the pool
+    LATEX_POOL_MAX_JOBS: int = 50  # Recycle a worker after this many compiles
+    LATEX_USE_FORMATS: bool = True  # Compile against preamble formats from build_latex_formats.py
+    LATEX_FORMAT_DIR: Optional[str] = None  # Defaults to Backend/.latex_formats
+    LATEX_PREFLIGHT: bool = True  # Check generated LaTeX before spawning the engine
+    LATEX_WORKSPACE_DIR: Optional[str] = None  # Where compiles run, defaults to /dev/shm (tmpfs) when available
+    LATEX_WORKSPACES: int = 4  # Idle compile directories kept for reuse per process, 0 creates one per compile
+    LATEX_CPU_SECONDS: int = 20  # CPU time per engine pass before it is killed, 0 for no limit
+    LATEX_MEMORY_MB: int = 1024  # Address space per engine process
+    LATEX_OUTPUT_MB: int = 32  # Largest file an engine process may write
+    LATEX_OPEN_FILES: int = 256  # Open file descriptors per engine process
+    LATEX_TEMPLATE_LIMITS: Dict[str, Dict[str, int]] = {}  # Per-template overrides, e.g. {"anti_cv": {"memory_mb": 2048}}
+    
+    # LaTeX circuit breaker, per template
+    LATEX_BREAKER_WINDOW: int = 20  # Recent LaTeX renders the rates are computed over
+    LATEX_BREAKER_MIN_CALLS: int = 5  # Renders needed in the window before the breaker can open
+    LATEX_BREAKER_FAILURE_RATE: float = 0.5  # Open when this share of renders fail
+    LATEX_BREAKER_SLOW_SECONDS: float = 20.0  # Renders slower than this count as slow
+    LATEX_BREAKER_SLOW_RATE: float = 0.8  # Open when this share of renders are slow
+    LATEX_BREAKER_OPEN_SECONDS: float = 30.0  # Time spent on the ReportLab fallback before probing LaTeX again
+    
+    # Render executor
+    RENDER_WORKERS: Optional[int] = None  # Defaults to the number of CPU cores
+    RENDER_QUEUE_SIZE: int = 32  # Renders allowed to wait for a free worker
+    RENDER_TIMEOUT: float = 90.0  # Seconds a render may run before it is abandoned
+    RENDER_QUEUE_TIMEOUT: float = 300.0  # Seconds a render may wait for a free worker
+    
+    # Export jobs
+    EXPORT_JOB_WORKERS: Optional[int] = None  # Jobs rendered at once, defaults to RENDER_WORKERS
+    EXPORT_JOB_MAX_PENDING: int = 500  # Queued jobs before new ones are refused
+    EXPORT_JOB_TTL: int = 900  # Seconds a finished job and its file are kept
+    EXPORT_JOB_MAX_RESULT_BYTES: int = 256 * 1024 * 1024  # Finished files held at once; the oldest expire early beyond it
+    EXPORT_BATCH_MAX_ITEMS: int = 200  # Resume x template renders allowed in one batch export
+    EXPORT_BATCH_CONCURRENCY: Optional[int] = None  # Renders in flight per batch, defaults to RENDER_WORKERS
+    
+    # Rendered document cache
+    RENDER_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # Memory tier size
+    RENDER_CACHE_DIR: Optional[str] = None  # Enables the disk tier
+    STYLE_CACHE_SIZE: int = 256  # ReportLab stylesheets kept, one per template and theme colour
+    DOCX_BASE_CACHE_SIZE: int = 16  # Template and theme colour pairs with a styled DOCX base and deflated package parts kept, 0 builds both per export
+    THUMBNAIL_CACHE_MAX_BYTES: int = 32 * 1024 * 1024  # Preview page images, disk tier under RENDER_CACHE_DIR/thumbnails
+    THUMBNAIL_WEBP_QUALITY: int = 80  # Lossy quality of WebP previews
+    THUMBNAIL_MAX_PAGES: int = 10  # Pages a pages=all preview may stack, more is rejected with 400
+    THUMBNAIL_MAX_PIXELS: int = 12_000_000  # Pixel area of one preview image, larger requests are rendered at a lower dpi
+    DETERMINISTIC_PDF: bool = True  # Byte-identical PDFs for identical input: fixed dates and document IDs
+    PDF_SOURCE_DATE_EPOCH: int = 946684800  # Creation date written in deterministic mode (2000-01-01, as ReportLab's)
+    PDF_OPTIMIZE_EXPORTS: bool = True  # Shrink exported PDFs with PyMuPDF (see benchmarks/bench_pdf_optimizer.py)
+    PDF_OPTIMIZE_PREVIEWS: bool = True  # Same for template previews, which are re-downloaded on every edit
+    
+    # Resume uploads
+    PDF_TEXT_ENGINES: List[str] = ["pymupdf", "pypdf"]  # Text extraction engines for uploaded PDFs, tried in order
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024  # Larger resume uploads are rejected with 413
+    UPLOAD_SPOOL_BYTES: int = 1024 * 1024  # Larger uploads reach the parse worker as a temporary file instead of in memory
+    
     # CORS
     ALLOWED_ORIGINS: Union[str, List[str]] = "http://localhost:5173,http://localhost:3000"
     
@@ -90,7 +90,18 @@ def convert_pdf_to_image(pdf_path, output_dir, template_id):
     """
     png_path = output_dir / f"{template_id}.png"
     
-    # Method 1: Try pdf2image (requires poppler)
+    # Method 1: PyMuPDF, the rasteriser live previews use
+    try:
+        from utils.pdf_thumbnails import rasterize_pdf
+        png_path.write_bytes(rasterize_pdf(pdf_path.read_bytes(), 'png', width=600))
+        print(f"   ✅ Saved PNG: {png_path.name}")
+        return
+    except ImportError:
+        pass
+    except Exception as e:
+        print(f"   ⚠️  PyMuPDF failed: {e}")
+    
+    # Method 2: Try pdf2image (requires poppler)
     try:
         from pdf2image import convert_from_path
         from PIL import Image
@@ -107,32 +118,6 @@ def convert_pdf_to_image(pdf_path, output_dir, template_id):
     except Exception as e:
         print(f"   ⚠️  pdf2image failed: {e}")
     
-    # Method 2: Try PyMuPDF (fitz)
-    try:
-        import fitz  # PyMuPDF
-        doc = fitz.open(pdf_path)
-        page = doc[0]
-        
-        # Render at 2x resolution then scale down
-        mat = fitz.Matrix(2, 2)
-        pix = page.get_pixmap(matrix=mat)
-        
-        # Convert to PIL Image
-        from PIL import Image
-        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-        
-        # Resize to target size
-        img.thumbnail((600, 800), Image.LANCZOS)
-        img.save(png_path, 'PNG')
-        doc.close()
-        
-        print(f"   ✅ Saved PNG: {png_path.name}")
-        return
-    except ImportError:
-        pass
-    except Exception as e:
-        print(f"   ⚠️  PyMuPDF failed: {e}")
-    
     # Method 3: Try Pillow with ReportLab (if available)
     try:
         from PIL import Image
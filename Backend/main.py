@@ -5,7 +5,7 @@ import os
 parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, parent_dir)
 
-from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File
+from fastapi import FastAPI, Depends, HTTPException, status, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
 from contextlib import asynccontextmanager
@@ -14,11 +14,17 @@ import io
 
 from config import settings
 from database.connection import Database
-from routes import auth, resume, ai_enhance, chat, job_recommend, templates
-from utils.pdf_generator import generate_pdf_resume
-from utils.docx_generator import generate_docx_resume
-from utils.resume_parser import parse_pdf_resume, parse_docx_resume
+from routes import auth, resume, ai_enhance, chat, job_recommend, templates, export_jobs
+from utils.export_jobs import ExportJobManager, render_docx, render_export, stream_batch_zip
+from utils.resume_parser import parse_resume_upload
+from utils.uploads import UploadTooLarge, spooled_upload
+from utils.pdf_thumbnails import ThumbnailCache
+from utils.render_executor import RenderExecutor, RenderError
 from templates.template_manager import TemplateManager
+from templates.latex_engines import LaTeXEngineRegistry
+from templates.latex_worker_pool import LaTeXWorkerPool
+from templates.render_cache import RenderCache
+from models.resume_model import BatchExportRequest
 
 
 @asynccontextmanager
@@ -26,8 +32,14 @@ async def lifespan(app: FastAPI):
     """Lifespan events for startup and shutdown"""
     # Startup
     await Database.connect_db()
+    LaTeXEngineRegistry.probe()
+    RenderExecutor.start()
+    ExportJobManager.start()
     yield
     # Shutdown
+    await ExportJobManager.shutdown()
+    RenderExecutor.shutdown()
+    LaTeXWorkerPool.shutdown_pool()
     await Database.close_db()
 
 
@@ -57,6 +69,7 @@ app.include_router(chat.router)
 app.include_router(ai_enhance.router)
 app.include_router(job_recommend.router)
 app.include_router(templates.router)
+app.include_router(export_jobs.router)
 
 
 @app.get("/")
@@ -72,11 +85,20 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
+    return {
+        "status": "healthy",
+        "latex_engines": LaTeXEngineRegistry.status(),
+        "latex_breakers": TemplateManager.breaker_stats(),
+        "render_cache": RenderCache.get_cache().stats(),
+        "thumbnail_cache": ThumbnailCache.get_cache().stats(),
+        "render_executor": RenderExecutor.stats(),
+        "export_jobs": ExportJobManager.stats()
+    }
 
 
 @app.post("/resume/export/pdf")
 async def export_pdf(
+    request: Request,
     resume_id: str,
     template: str = None,  # Optional override, uses resume's stored template by default
     current_user: dict = Depends(auth.get_current_user)
@@ -98,23 +120,12 @@ async def export_pdf(
             detail="Resume not found"
         )
     
-    # Use resume's stored template, or override if specified
-    selected_template = template or resume.get("template", "auto_cv")
-    
-    # Use new template system
+    # Use resume's stored template, or override if specified.
+    # The new template system falls back to the old one if the template fails.
     try:
-        pdf_buffer = TemplateManager.generate_resume(
-            resume_data=resume["data"],
-            template_name=selected_template,
-            theme_color=resume.get("theme_color", "#3B82F6")
-        )
-    except Exception as e:
-        # Fallback to old system if template fails
-        pdf_buffer = generate_pdf_resume(
-            resume["data"],
-            template=resume.get("template", "modern"),
-            theme_color=resume.get("theme_color", "#3B82F6")
-        )
+        pdf_buffer = await render_export(resume, "pdf", template, request=request)
+    except RenderError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     
     # Return as streaming response
     return StreamingResponse(
@@ -128,6 +139,7 @@ async def export_pdf(
 
 @app.post("/resume/export/docx")
 async def export_docx(
+    request: Request,
     resume_id: str,
     current_user: dict = Depends(auth.get_current_user)
 ):
@@ -148,16 +160,14 @@ async def export_docx(
             detail="Resume not found"
         )
     
-    # Generate DOCX
-    docx_buffer = generate_docx_resume(
-        resume["data"],
-        template=resume.get("template", "modern"),
-        theme_color=resume.get("theme_color", "#3B82F6")
-    )
+    # Render the document body; the package is written into the response as it streams
+    try:
+        docx_chunks = await render_docx(resume, request=request)
+    except RenderError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     
-    # Return as streaming response
     return StreamingResponse(
-        docx_buffer,
+        docx_chunks,
         media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
         headers={
             "Content-Disposition": f"attachment; filename={resume.get('title', 'resume')}.docx"
@@ -165,39 +175,87 @@ async def export_docx(
     )
 
 
+@app.post("/resume/export/batch")
+async def export_batch(
+    batch: BatchExportRequest,
+    current_user: dict = Depends(auth.get_current_user)
+):
+    """Export several resumes in several templates as one streamed ZIP archive"""
+    db = Database.get_db()
+    
+    resume_ids = list(dict.fromkeys(batch.resume_ids))
+    invalid = [resume_id for resume_id in resume_ids if not ObjectId.is_valid(resume_id)]
+    if not resume_ids or invalid:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid resume ID: {', '.join(invalid)}" if invalid else "No resumes requested"
+        )
+    
+    unknown = [template for template in batch.templates if template not in TemplateManager.TEMPLATES]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Template not found: {', '.join(unknown)}"
+        )
+    
+    templates = list(dict.fromkeys(batch.templates)) or [None]
+    if len(resume_ids) * len(templates) > settings.EXPORT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"A batch may contain at most {settings.EXPORT_BATCH_MAX_ITEMS} exports"
+        )
+    
+    # One round trip for every resume in the batch
+    resumes = await db.resumes.find({
+        "_id": {"$in": [ObjectId(resume_id) for resume_id in resume_ids]},
+        "user_id": str(current_user["_id"])
+    }).to_list(length=None)
+    
+    if len(resumes) != len(resume_ids):
+        found = {str(resume["_id"]) for resume in resumes}
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Resume not found: {', '.join(r for r in resume_ids if r not in found)}"
+        )
+    
+    return StreamingResponse(
+        stream_batch_zip(resumes, templates, batch.format),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": f"attachment; filename=resumes_{batch.format}.zip"
+        }
+    )
+
+
 @app.post("/resume/upload")
 async def upload_resume(
+    request: Request,
     file: UploadFile = File(...),
     current_user: dict = Depends(auth.get_current_user)
 ):
     """Upload and parse existing resume"""
     
     # Check file type
-    if not file.filename.endswith(('.pdf', '.docx')):
+    filename = file.filename or ""
+    if not filename.endswith(('.pdf', '.docx')):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Only PDF and DOCX files are supported"
         )
+    file_type = 'pdf' if filename.endswith('.pdf') else 'docx'
     
-    # Save file temporarily
-    content = await file.read()
-    temp_path = f"/tmp/{file.filename}"
-    
-    with open(temp_path, "wb") as f:
-        f.write(content)
-    
-    # Parse based on file type
+    # Parse from memory (or a private temporary file for large uploads) on the render executor
     try:
-        if file.filename.endswith('.pdf'):
-            parsed_data = parse_pdf_resume(temp_path)
-        else:
-            parsed_data = parse_docx_resume(temp_path)
+        async with spooled_upload(file, suffix=f".{file_type}") as source:
+            parsed_data = await RenderExecutor.run(parse_resume_upload, source, file_type, request=request)
         
         return {
             "message": "Resume parsed successfully",
             "data": parsed_data,
-            "filename": file.filename
+            "filename": filename
         }
+    except (UploadTooLarge, RenderError) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 from datetime import datetime
 from bson import ObjectId
 
@@ -126,3 +126,15 @@ class ResumeResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class ExportJobCreate(BaseModel):
+    resume_id: str
+    format: Literal["pdf", "docx"] = "pdf"
+    template: Optional[str] = None  # Defaults to the resume's stored template
+
+
+class BatchExportRequest(BaseModel):
+    resume_ids: List[str]
+    templates: List[str] = []  # Each resume's stored template when empty
+    format: Literal["pdf", "docx"] = "pdf"
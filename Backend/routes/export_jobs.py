@@ -0,0 +1,98 @@
+"""Export Job Routes - Queue exports and poll for the result"""
+
+from io import BytesIO
+
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+
+from database.connection import get_database
+from models.resume_model import ExportJobCreate
+from routes.auth import get_current_user
+from templates.template_manager import TemplateManager
+from utils.export_jobs import ExportJob, ExportJobManager
+from utils.render_executor import RenderError
+
+router = APIRouter(prefix="/resume/export/jobs", tags=["Export Jobs"])
+
+
+def _job_response(job: ExportJob) -> dict:
+    response = job.to_dict()
+    response["status_url"] = f"{router.prefix}/{job.id}"
+    response["download_url"] = f"{router.prefix}/{job.id}/download"
+    return response
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(job_request: ExportJobCreate, current_user: dict = Depends(get_current_user)):
+    """Queue a PDF or DOCX export and return its job ID straight away"""
+    db = get_database()
+    
+    if not ObjectId.is_valid(job_request.resume_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid resume ID"
+        )
+    
+    if job_request.template and job_request.template not in TemplateManager.TEMPLATES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Template not found: {job_request.template}"
+        )
+    
+    resume = await db.resumes.find_one({"_id": ObjectId(job_request.resume_id)})
+    
+    if not resume or resume["user_id"] != str(current_user["_id"]):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Resume not found"
+        )
+    
+    try:
+        job = ExportJobManager.submit(str(current_user["_id"]), resume, job_request.format, job_request.template)
+    except RenderError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    
+    return _job_response(job)
+
+
+@router.get("/{job_id}")
+async def get_export_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Status of an export job"""
+    job = ExportJobManager.get(job_id, str(current_user["_id"]))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found or expired"
+        )
+    return _job_response(job)
+
+
+@router.get("/{job_id}/download")
+async def download_export_job(job_id: str, current_user: dict = Depends(get_current_user)):
+    """Download the file produced by a finished export job"""
+    job = ExportJobManager.get(job_id, str(current_user["_id"]))
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export job not found or expired"
+        )
+    
+    if job.status == ExportJob.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export failed: {job.error}"
+        )
+    if job.status != ExportJob.DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export is still {job.status}"
+        )
+    
+    return StreamingResponse(
+        BytesIO(job.result),
+        media_type=job.media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={job.filename}"
+        }
+    )
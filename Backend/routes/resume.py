@@ -113,11 +113,11 @@ async def update_resume(
     # Update resume
     update_dict = resume_update.model_dump(exclude_unset=True)
     update_dict["updated_at"] = datetime.utcnow()
-    update_dict["version"] = resume.get("version", 1) + 1
     
+    # Incremented in the same write, so concurrent updates never share a version (exports cache by it)
     await db.resumes.update_one(
         {"_id": ObjectId(resume_id)},
-        {"$set": update_dict}
+        {"$set": update_dict, "$inc": {"version": 1}}
     )
     
     updated_resume = await db.resumes.find_one({"_id": ObjectId(resume_id)})
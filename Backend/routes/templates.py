@@ -1,10 +1,13 @@
 """Template Routes - Template listing and information"""
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from typing import List, Dict
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Dict, Optional
+from config import settings
 from routes.auth import get_current_user
 from templates.template_manager import TemplateManager
+from utils.pdf_thumbnails import IMAGE_MEDIA_TYPES, ThumbnailTooLarge, render_thumbnail
+from utils.render_executor import RenderError
 from io import BytesIO
 
 router = APIRouter(prefix="/templates", tags=["Templates"])
@@ -30,12 +33,20 @@ async def get_template_info(template_id: str):
 
 @router.post("/{template_id}/preview")
 async def preview_template(
+    request: Request,
     template_id: str,
     resume_data: dict,
     theme_color: str = "#3B82F6",
+    output: str = Query("pdf", alias="format", pattern="^(pdf|png|webp)$"),
+    width: Optional[int] = Query(None, ge=16, le=2000),
+    dpi: Optional[int] = Query(None, ge=18, le=300),
+    pages: str = Query("first", pattern="^(first|all)$"),
     current_user: dict = Depends(get_current_user)
 ):
-    """Preview a resume with a specific template"""
+    """
+    Preview a resume with a specific template, as the PDF or, with format=png|webp,
+    as an image of page 1 (pages=all stacks every page) at the given width or dpi
+    """
     try:
         import logging
         logger = logging.getLogger(__name__)
@@ -43,12 +54,26 @@ async def preview_template(
         logger.info(f"Resume data keys: {resume_data.keys() if resume_data else 'None'}")
         logger.info(f"Theme color: {theme_color}")
         
-        pdf_buffer = TemplateManager.generate_resume(
+        pdf_buffer = await TemplateManager.generate_resume_async(
             resume_data=resume_data,
             template_name=template_id,
-            theme_color=theme_color
+            theme_color=theme_color,
+            request=request,
+            optimize=settings.PDF_OPTIMIZE_PREVIEWS
         )
         
+        if output in IMAGE_MEDIA_TYPES:
+            image = await render_thumbnail(
+                pdf_buffer.getvalue(), output, width, dpi, pages == "all", request=request
+            )
+            return Response(
+                content=image,
+                media_type=IMAGE_MEDIA_TYPES[output],
+                headers={
+                    "Content-Disposition": f"inline; filename=preview_{template_id}.{output}"
+                }
+            )
+        
         return StreamingResponse(
             pdf_buffer,
             media_type="application/pdf",
@@ -56,6 +81,8 @@ async def preview_template(
                 "Content-Disposition": f"inline; filename=preview_{template_id}.pdf"
             }
         )
+    except (RenderError, ThumbnailTooLarge) as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
     except Exception as e:
         import logging
         import traceback
@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class AntiCVTemplate(BaseTemplate):
@@ -24,34 +25,35 @@ class AntiCVTemplate(BaseTemplate):
         """Wider margins for creative look"""
         return (1.0, 1.0, 0.8, 0.8)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header - Creative approach
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(f"Hi, I'm {personal_info['name']}", styles['name']))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(f"Hi, I'm {personal_info.name}", styles['name']))
         
         # Contact in casual format
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(f"📧 {personal_info['email']}")
-        if personal_info.get('phone'):
-            contact_parts.append(f"📱 {personal_info['phone']}")
-        if personal_info.get('location'):
-            contact_parts.append(f"📍 {personal_info['location']}")
+        if personal_info.email:
+            contact_parts.append(f"📧 {personal_info.email}")
+        if personal_info.phone:
+            contact_parts.append(f"📱 {personal_info.phone}")
+        if personal_info.location:
+            contact_parts.append(f"📍 {personal_info.location}")
         
         if contact_parts:
             elements.append(Paragraph(' | '.join(contact_parts), styles['contact']))
         
         # Social links as icons
         links = []
-        if personal_info.get('linkedin'):
-            links.append(f"🔗 {personal_info['linkedin'].replace('https://', '')}")
-        if personal_info.get('github'):
-            links.append(f"💻 {personal_info['github'].replace('https://', '')}")
+        if personal_info.linkedin:
+            links.append(f"🔗 {personal_info.linkedin.replace('https://', '')}")
+        if personal_info.github:
+            links.append(f"💻 {personal_info.github.replace('https://', '')}")
         
         if links:
             elements.append(Paragraph(' | '.join(links), styles['contact']))
@@ -59,127 +61,110 @@ class AntiCVTemplate(BaseTemplate):
         elements.append(Spacer(1, 0.15*inch))
         
         # About Me - Personal narrative
-        if resume_data.get('summary') or resume_data.get('objective'):
+        if resume.profile:
             elements.append(Paragraph('About Me', styles['section']))
-            summary = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary, styles['narrative']))
+            elements.append(Paragraph(resume.profile, styles['narrative']))
             elements.append(Spacer(1, 0.15*inch))
         
         # What I Do - Skills in context
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('What I Do', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        # Creative skill presentation
-                        skill_box = Table([[Paragraph(f"<b>{category}</b>", styles['skill_header'])]], 
-                                        colWidths=[5*inch])
-                        skill_box.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F0F4F8')),
-                            ('LEFTPADDING', (0, 0), (-1, -1), 10),
-                            ('RIGHTPADDING', (0, 0), (-1, -1), 10),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ]))
-                        elements.append(skill_box)
-                        elements.append(Paragraph(', '.join(items), styles['skill_items']))
-                        elements.append(Spacer(1, 0.08*inch))
-            else:
-                elements.append(Paragraph(', '.join(skills), styles['narrative']))
+            for group in resume.skills:
+                if not group.category:
+                    elements.append(Paragraph(group.text, styles['narrative']))
+                    continue
+                # Creative skill presentation
+                skill_box = Table([[Paragraph(f"<b>{group.category}</b>", styles['skill_header'])]], 
+                                colWidths=[5*inch])
+                skill_box.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F0F4F8')),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 10),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 10),
+                    ('TOPPADDING', (0, 0), (-1, -1), 6),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ]))
+                elements.append(skill_box)
+                elements.append(Paragraph(group.text, styles['skill_items']))
+                elements.append(Spacer(1, 0.08*inch))
             
             elements.append(Spacer(1, 0.1*inch))
         
         # My Journey - Experience as a story
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('My Journey', styles['section']))
             
-            for idx, exp in enumerate(resume_data['experience']):
+            for idx, exp in enumerate(resume.experience):
                 # Story-style presentation
-                date_range = f"{exp.get('start_date', '')} - {exp.get('end_date', 'Now') if not exp.get('current') else 'Now'}"
+                date_range = exp.period(present='Now')
                 
                 # Chapter-like format
-                chapter = f"<b>Chapter {len(resume_data['experience']) - idx}:</b> {exp.get('position', 'Position')} @ {exp.get('company', 'Company')}"
+                chapter = f"<b>Chapter {len(resume.experience) - idx}:</b> {exp.position or 'Position'} @ {exp.company or 'Company'}"
                 elements.append(Paragraph(chapter, styles['journey_title']))
                 elements.append(Paragraph(f"<i>{date_range}</i>", styles['journey_date']))
                 
                 # The story
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        # Combine into narrative
-                        story = ' • '.join([item for item in description if item])
-                        elements.append(Paragraph(story, styles['narrative']))
-                    else:
-                        elements.append(Paragraph(description, styles['narrative']))
+                if exp.highlights:
+                    # Combine into narrative
+                    elements.append(Paragraph(' • '.join(exp.highlights), styles['narrative']))
+                elif exp.description:
+                    elements.append(Paragraph(exp.description, styles['narrative']))
                 
-                if exp.get('achievements'):
+                if exp.achievements:
                     elements.append(Paragraph('<b>Highlights:</b>', styles['highlight_header']))
-                    for achievement in exp['achievements']:
+                    for achievement in exp.achievements:
                         elements.append(Paragraph(f"✓ {achievement}", styles['highlight']))
                 
                 # Visual separator
-                if idx < len(resume_data['experience']) - 1:
+                if idx < len(resume.experience) - 1:
                     elements.append(HRFlowable(width="30%", thickness=0.5, color=colors.grey, 
                                              spaceAfter=10, spaceBefore=10, hAlign='CENTER'))
         
         # Projects - "Things I've Built"
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Spacer(1, 0.15*inch))
             elements.append(Paragraph('Things I\'ve Built', styles['section']))
             
-            for proj in resume_data['projects']:
-                proj_name = proj.get('name', 'Project')
-                elements.append(Paragraph(f"🚀 <b>{proj_name}</b>", styles['project_title']))
+            for proj in resume.projects:
+                elements.append(Paragraph(f"🚀 <b>{proj.name or 'Project'}</b>", styles['project_title']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], styles['narrative']))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, styles['narrative']))
                 
-                if proj.get('technologies'):
-                    tech_text = f"Built with: {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"Built with: {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, styles['tech_stack']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Education - "Where I Learned"
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Spacer(1, 0.15*inch))
             elements.append(Paragraph('Where I Learned', styles['section']))
             
-            for edu in resume_data['education']:
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree = edu.get('degree', 'Degree')
-                institution = edu.get('institution', 'Institution')
-                
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+            for edu in resume.education:
+                degree = edu.degree or 'Degree'
+                institution = edu.institution or 'Institution'
                 
-                edu_text = f"<b>{degree}</b> in {field}" if field else f"<b>{degree}</b>"
+                edu_text = f"<b>{degree}</b> in {edu.field}" if edu.field else f"<b>{degree}</b>"
                 elements.append(Paragraph(edu_text, styles['edu_title']))
-                elements.append(Paragraph(f"{institution} | {date_text}", styles['edu_subtitle']))
+                elements.append(Paragraph(f"{institution} | {edu.dates()}", styles['edu_subtitle']))
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['narrative']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['narrative']))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Certifications - "Badges I've Earned"
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Spacer(1, 0.15*inch))
             elements.append(Paragraph('Badges I\'ve Earned', styles['section']))
             
-            for cert in resume_data['certifications']:
-                cert_text = f"🏆 <b>{cert.get('name', 'Certification')}</b> from {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"🏆 <b>{cert.name or 'Certification'}</b> from {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 elements.append(Paragraph(cert_text, styles['narrative']))
             
             elements.append(Spacer(1, 0.05*inch))
@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class AutoCVTemplate(BaseTemplate):
@@ -19,26 +20,27 @@ class AutoCVTemplate(BaseTemplate):
     - Skills-first approach
     """
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'].upper(), styles['name']))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name.upper(), styles['name']))
         
         # Contact - One line
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
-        if personal_info.get('linkedin'):
-            contact_parts.append(personal_info['linkedin'].replace('https://', ''))
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
+        if personal_info.linkedin:
+            contact_parts.append(personal_info.linkedin.replace('https://', ''))
         
         if contact_parts:
             elements.append(Paragraph(' • '.join(contact_parts), styles['contact']))
@@ -46,37 +48,32 @@ class AutoCVTemplate(BaseTemplate):
         elements.append(Spacer(1, 0.15*inch))
         
         # Professional Summary
-        if resume_data.get('summary') or resume_data.get('objective'):
+        if resume.profile:
             elements.append(Paragraph('PROFESSIONAL SUMMARY', styles['section']))
-            summary = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary, styles['body']))
+            elements.append(Paragraph(resume.profile, styles['body']))
             elements.append(Spacer(1, 0.1*inch))
         
         # Skills - Prominently displayed
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('CORE COMPETENCIES', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_text = f"<b>{category}:</b> {', '.join(items)}"
-                        elements.append(Paragraph(skill_text, styles['body']))
-            else:
-                elements.append(Paragraph(', '.join(skills), styles['body']))
+            for group in resume.skills:
+                if group.category:
+                    skill_text = f"<b>{group.category}:</b> {group.text}"
+                    elements.append(Paragraph(skill_text, styles['body']))
+                else:
+                    elements.append(Paragraph(group.text, styles['body']))
             
             elements.append(Spacer(1, 0.1*inch))
         
         # Professional Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('PROFESSIONAL EXPERIENCE', styles['section']))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Position and Company
-                title = f"<b>{exp.get('position', 'Position')}</b> | {exp.get('company', 'Company')}"
-                date_range = f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                title = f"<b>{exp.position or 'Position'}</b> | {exp.company or 'Company'}"
+                date_range = exp.period()
                 
                 title_cell = Paragraph(title, styles['item_title'])
                 date_cell = Paragraph(date_range, styles['date'])
@@ -91,40 +88,26 @@ class AutoCVTemplate(BaseTemplate):
                 elements.append(exp_table)
                 
                 # Achievements
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", styles['bullet']))
-                    else:
-                        elements.append(Paragraph(f"• {description}", styles['bullet']))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", styles['bullet']))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", styles['bullet']))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", styles['bullet']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', styles['section']))
             
-            for edu in resume_data['education']:
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = f"<b>{edu.get('degree', 'Degree')}</b>"
-                if field:
-                    degree_text += f" in {field}"
-                degree_text += f" | {edu.get('institution', 'Institution')}"
+            for edu in resume.education:
+                degree_text = f"<b>{edu.degree or 'Degree'}</b>"
+                if edu.field:
+                    degree_text += f" in {edu.field}"
+                degree_text += f" | {edu.institution or 'Institution'}"
                 
                 degree_cell = Paragraph(degree_text, styles['item_title'])
                 
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
-                
+                date_text = edu.dates()
                 if date_text:
                     date_cell = Paragraph(date_text, styles['date'])
                     edu_table = Table([[degree_cell, date_cell]], colWidths=[5*inch, 1.5*inch])
@@ -138,37 +121,36 @@ class AutoCVTemplate(BaseTemplate):
                 else:
                     elements.append(degree_cell)
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['body']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['body']))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', styles['section']))
             
-            for proj in resume_data['projects']:
-                proj_title = f"<b>{proj.get('name', 'Project')}</b>"
+            for proj in resume.projects:
+                proj_title = f"<b>{proj.name or 'Project'}</b>"
                 elements.append(Paragraph(proj_title, styles['item_title']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(f"• {proj['description']}", styles['bullet']))
+                if proj.description:
+                    elements.append(Paragraph(f"• {proj.description}", styles['bullet']))
                 
-                if proj.get('technologies'):
-                    tech_text = f"<i>Technologies:</i> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"<i>Technologies:</i> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, styles['body']))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', styles['section']))
             
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b> - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b> - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 elements.append(Paragraph(cert_text, styles['body']))
             
             elements.append(Spacer(1, 0.05*inch))
@@ -8,7 +8,10 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, Mapping
+
+from config import settings
+from .style_registry import StyleRegistry
 
 
 class BaseTemplate(ABC):
@@ -23,6 +26,10 @@ class BaseTemplate(ABC):
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16)/255 for i in (0, 2, 4))
     
+    def get_styles(self) -> Mapping[str, ParagraphStyle]:
+        """This template's styles for the theme colour, built once and shared between renders"""
+        return StyleRegistry.get(type(self).__name__, self.theme_color, self._create_styles)
+    
     @abstractmethod
     def generate(self, resume_data: Dict[str, Any]) -> BytesIO:
         """Generate the resume PDF - must be implemented by subclasses"""
@@ -45,5 +52,7 @@ class BaseTemplate(ABC):
             rightMargin=margins[0]*inch,
             leftMargin=margins[1]*inch,
             topMargin=margins[2]*inch,
-            bottomMargin=margins[3]*inch
+            bottomMargin=margins[3]*inch,
+            # Fixed creation date and document ID, so identical input gives identical bytes
+            invariant=settings.DETERMINISTIC_PDF
         )
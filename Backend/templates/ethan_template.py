@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, KeepTogether
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class EthanTemplate(BaseTemplate):
@@ -23,34 +24,35 @@ class EthanTemplate(BaseTemplate):
         """Narrow margins for two-column layout"""
         return (0.5, 0.5, 0.6, 0.6)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header Section
-        personal_info = resume_data.get('personal_info', {})
+        personal_info = resume.personal_info
         
         # Name - Prominent
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], styles['name']))
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, styles['name']))
         
         # Contact info in columns
         contact_data = []
         left_contact = []
         right_contact = []
         
-        if personal_info.get('phone'):
-            left_contact.append(f"☎ {personal_info['phone']}")
-        if personal_info.get('email'):
-            left_contact.append(f"✉ {personal_info['email']}")
+        if personal_info.phone:
+            left_contact.append(f"☎ {personal_info.phone}")
+        if personal_info.email:
+            left_contact.append(f"✉ {personal_info.email}")
         
-        if personal_info.get('linkedin'):
-            right_contact.append(f"in/ {personal_info['linkedin'].split('/')[-1]}")
-        if personal_info.get('github'):
-            right_contact.append(f"github/ {personal_info['github'].split('/')[-1]}")
-        if personal_info.get('location'):
-            right_contact.append(f"📍 {personal_info['location']}")
+        if personal_info.linkedin:
+            right_contact.append(f"in/ {personal_info.linkedin.split('/')[-1]}")
+        if personal_info.github:
+            right_contact.append(f"github/ {personal_info.github.split('/')[-1]}")
+        if personal_info.location:
+            right_contact.append(f"📍 {personal_info.location}")
         
         if left_contact or right_contact:
             left_str = '<br/>'.join(left_contact) if left_contact else ''
@@ -70,21 +72,20 @@ class EthanTemplate(BaseTemplate):
         elements.append(Spacer(1, 0.15*inch))
         
         # Summary
-        if resume_data.get('summary') or resume_data.get('objective'):
+        if resume.profile:
             elements.append(Paragraph('SUMMARY', styles['section']))
-            summary = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary, styles['body']))
+            elements.append(Paragraph(resume.profile, styles['body']))
             elements.append(Spacer(1, 0.12*inch))
         
         # Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('EXPERIENCE', styles['section']))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Company and dates
-                company = exp.get('company', 'Company')
-                position = exp.get('position', 'Position')
-                date_range = f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                company = exp.company or 'Company'
+                position = exp.position or 'Position'
+                date_range = exp.period()
                 
                 # Create table for alignment
                 exp_header = Table([
@@ -103,40 +104,26 @@ class EthanTemplate(BaseTemplate):
                 elements.append(Paragraph(f"<i>{position}</i>", styles['position']))
                 
                 # Responsibilities
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", styles['bullet']))
-                    else:
-                        elements.append(Paragraph(f"• {description}", styles['bullet']))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", styles['bullet']))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", styles['bullet']))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", styles['bullet']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', styles['section']))
             
-            for edu in resume_data['education']:
-                institution = edu.get('institution', 'Institution')
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree = edu.get('degree', 'Degree')
-                
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+            for edu in resume.education:
+                institution = edu.institution or 'Institution'
+                field = edu.field
+                degree = edu.degree or 'Degree'
                 
                 # Institution and date
                 edu_header = Table([
                     [Paragraph(f"<b>{institution}</b>", styles['company']),
-                     Paragraph(date_text, styles['date'])]
+                     Paragraph(edu.dates(), styles['date'])]
                 ], colWidths=[5*inch, 2*inch])
                 edu_header.setStyle(TableStyle([
                     ('VALIGN', (0, 0), (-1, -1), 'TOP'),
@@ -153,66 +140,58 @@ class EthanTemplate(BaseTemplate):
                 degree_text += "</i>"
                 elements.append(Paragraph(degree_text, styles['position']))
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['body']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['body']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Skills
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('SKILLS', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
-                skill_table_data = []
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_table_data.append([
-                            Paragraph(f"<b>{category}:</b>", styles['skill_cat']),
-                            Paragraph(', '.join(items), styles['body'])
-                        ])
-                
-                if skill_table_data:
-                    skill_table = Table(skill_table_data, colWidths=[1.5*inch, 5.5*inch])
-                    skill_table.setStyle(TableStyle([
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                    ]))
-                    elements.append(skill_table)
+            if resume.skills[0].category:
+                skill_table_data = [
+                    [Paragraph(f"<b>{group.category}:</b>", styles['skill_cat']),
+                     Paragraph(group.text, styles['body'])]
+                    for group in resume.skills
+                ]
+                skill_table = Table(skill_table_data, colWidths=[1.5*inch, 5.5*inch])
+                skill_table.setStyle(TableStyle([
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+                ]))
+                elements.append(skill_table)
             else:
-                elements.append(Paragraph(', '.join(skills), styles['body']))
+                elements.append(Paragraph(resume.skills[0].text, styles['body']))
             
             elements.append(Spacer(1, 0.08*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', styles['section']))
             
-            for proj in resume_data['projects']:
-                proj_name = proj.get('name', 'Project')
+            for proj in resume.projects:
+                proj_name = proj.name or 'Project'
                 elements.append(Paragraph(f"<b>{proj_name}</b>", styles['company']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], styles['body']))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, styles['body']))
                 
-                if proj.get('technologies'):
-                    tech_text = f"<i>Tech Stack:</i> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"<i>Tech Stack:</i> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, styles['tech']))
                 
                 elements.append(Spacer(1, 0.06*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', styles['section']))
             
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b> - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" | {cert['date']}"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b> - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" | {cert.date}"
                 elements.append(Paragraph(cert_text, styles['body']))
             
             elements.append(Spacer(1, 0.05*inch))
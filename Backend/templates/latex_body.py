@@ -0,0 +1,170 @@
+"""LaTeX Body Templates - Compiles template body files into render functions"""
+
+import re
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from .latex_escape import escape_latex
+from .resume_document import ResumeDocument, strip_url
+
+
+class TemplateSyntaxError(ValueError):
+    """A body template that cannot be compiled"""
+
+
+class LaTeXBodyTemplate:
+    """
+    A resume body template, compiled once into a Python function.
+
+    Template files are plain LaTeX with three tags, chosen so they never
+    clash with TeX's own braces, % comments or $ math:
+
+        \\VAR{expr}     value of a Python expression, LaTeX-escaped
+        \\RAW{expr}     value of a Python expression, inserted as is
+        \\BLOCK{...}    if/elif/else/endif, for/endfor, and
+                       collect name/endcollect, which gathers the lines
+                       rendered inside it into the list `name` instead
+                       of the output (for separator-joined header rows;
+                       collect blocks do not nest)
+
+    Lines holding nothing but BLOCK tags produce no output and lines
+    starting with %# are template comments. if and for blocks may also
+    open and close within a single line. Expressions see `resume`, `info`
+    (resume.personal_info) and `strip_url`; templates are trusted code
+    from the Templates folder. Leading %! lines hold metadata such as
+    "%! preamble: autocv.tex".
+    """
+
+    TAG = re.compile(r'\\(VAR|RAW|BLOCK)\{((?:[^{}]|\{[^{}]*\})*)\}')
+    METADATA = re.compile(r'%!\s*(\w+)\s*:\s*(.*?)\s*$')
+
+    # Blocks that indent the generated code, and the tags closing them
+    BLOCK_ENDS = {'if': 'endif', 'for': 'endfor', 'collect': 'endcollect'}
+
+    GLOBALS = {'strip_url': strip_url}
+
+    def __init__(self, name: str, text: str):
+        self.name = name
+        self.metadata: Dict[str, str] = {}
+        lines = text.splitlines()
+        while lines and self.METADATA.match(lines[0]):
+            key, value = self.METADATA.match(lines.pop(0)).groups()
+            self.metadata[key] = value
+
+        self.source = self._compile(lines)
+        namespace = dict(self.GLOBALS)
+        exec(compile(self.source, f"<body template {name}>", 'exec'), namespace)
+        self._render = namespace['render']
+
+    @classmethod
+    def load_directory(cls, directory: Path) -> Dict[str, "LaTeXBodyTemplate"]:
+        """Compile every <template name>.tex file in a directory"""
+        return {
+            path.stem: cls(path.stem, path.read_text(encoding='utf-8'))
+            for path in sorted(directory.glob('*.tex'))
+        }
+
+    def render(self, resume: ResumeDocument, escape: Callable[[Any], str] = escape_latex) -> str:
+        """LaTeX body for a resume, built in a single pass; \\VAR values go through escape"""
+        return self._render(resume, resume.personal_info, escape)
+
+    def _compile(self, lines: List[str]) -> str:
+        """Python source of a render(resume, info, _e) function for the template lines"""
+        self._code = ["def render(resume, info, _e):", "    _out = []", "    _append = _out.append"]
+        self._stack: List[Tuple[str, int]] = []
+
+        for number, line in enumerate(lines, 1):
+            if line.startswith('%#'):
+                continue
+            pieces = self._split(line, number)
+            kinds = {kind for kind, _ in pieces}
+
+            if 'BLOCK' not in kinds:
+                self._emit(f"_append({self._concat(pieces, number)})")
+            elif kinds <= {'BLOCK', 'TEXT'} and all(value.isspace() for kind, value in pieces if kind == 'TEXT'):
+                for kind, statement in pieces:
+                    if kind == 'BLOCK':
+                        self._block(statement, number, inline=False)
+            else:
+                # Blocks inside a line build it piece by piece
+                depth = len(self._stack)
+                self._emit("_line = []")
+                for kind, value in pieces:
+                    if kind == 'BLOCK':
+                        self._block(value, number, inline=True)
+                    else:
+                        self._emit(f"_line.append({self._piece(kind, value, number)})")
+                if len(self._stack) != depth:
+                    raise TemplateSyntaxError(f"{self.name}:{number}: a block opened inside a line must close on it")
+                self._emit("_append(''.join(_line))")
+
+        if self._stack:
+            kind, number = self._stack[-1]
+            raise TemplateSyntaxError(f"{self.name}:{number}: '{kind}' block is never closed")
+        self._emit("return '\\n'.join(_out)")
+        return "\n".join(self._code) + "\n"
+
+    def _split(self, line: str, number: int) -> List[Tuple[str, str]]:
+        """Line as (TEXT|VAR|RAW|BLOCK, value) pieces"""
+        pieces = []
+        position = 0
+        for match in self.TAG.finditer(line):
+            if match.start() > position:
+                pieces.append(('TEXT', line[position:match.start()]))
+            pieces.append((match.group(1), match.group(2).strip()))
+            position = match.end()
+        if position < len(line) or not pieces:
+            pieces.append(('TEXT', line[position:]))
+        for kind, value in pieces:
+            if kind == 'TEXT' and re.search(r'\\(VAR|RAW|BLOCK)\{', value):
+                raise TemplateSyntaxError(f"{self.name}:{number}: unbalanced braces in tag")
+        return pieces
+
+    def _emit(self, statement: str, dedent: int = 0):
+        indent = sum(1 for kind, _ in self._stack if kind != 'collect') + 1 - dedent
+        self._code.append("    " * indent + statement)
+
+    def _block(self, statement: str, number: int, inline: bool):
+        keyword, _, rest = statement.partition(' ')
+        rest = rest.strip()
+        top = self._stack[-1][0] if self._stack else None
+
+        if keyword in ('if', 'for'):
+            self._check(rest if keyword == 'if' else rest.partition(' in ')[2], number)
+            self._emit(f"{keyword} {rest}:")
+            self._stack.append((keyword, number))
+            self._emit("pass")
+        elif keyword in ('elif', 'else') and top == 'if':
+            if keyword == 'elif':
+                self._check(rest, number)
+            self._emit(f"{keyword} {rest}:" if rest else f"{keyword}:", dedent=1)
+            self._emit("pass")
+        elif keyword == 'collect' and not inline and rest.isidentifier() and not self._collecting():
+            self._emit(f"{rest} = []")
+            self._emit(f"_append = {rest}.append")
+            self._stack.append(('collect', number))
+        elif keyword in self.BLOCK_ENDS.values() and self.BLOCK_ENDS.get(top) == keyword:
+            self._stack.pop()
+            if keyword == 'endcollect':
+                self._emit("_append = _out.append")
+        else:
+            raise TemplateSyntaxError(f"{self.name}:{number}: unexpected block '{statement}'")
+
+    def _collecting(self) -> bool:
+        return any(kind == 'collect' for kind, _ in self._stack)
+
+    def _check(self, expression: str, number: int):
+        try:
+            compile(expression, self.name, 'eval')
+        except SyntaxError as e:
+            raise TemplateSyntaxError(f"{self.name}:{number}: {e.msg} in '{expression}'")
+
+    def _piece(self, kind: str, value: str, number: int) -> str:
+        if kind == 'TEXT':
+            return repr(value)
+        self._check(value, number)
+        return f"_e({value})" if kind == 'VAR' else f"str({value})"
+
+    def _concat(self, pieces: List[Tuple[str, str]], number: int) -> str:
+        parts = [self._piece(kind, value, number) for kind, value in pieces]
+        return parts[0] if len(parts) == 1 else f"''.join(({', '.join(parts)},))"
@@ -0,0 +1,72 @@
+"""LaTeX Engine Registry - Probes the installed TeX engines once per process"""
+
+import logging
+import shutil
+import subprocess
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LaTeXEngineRegistry:
+    """Availability and version of each LaTeX engine, probed at startup"""
+
+    ENGINES = ('pdflatex', 'xelatex', 'lualatex')
+
+    engines: Optional[Dict[str, Dict[str, Optional[str]]]] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def probe(cls) -> Dict[str, Dict[str, Optional[str]]]:
+        """Run `<engine> --version` for every engine and remember the result"""
+        engines = {}
+        for engine in cls.ENGINES:
+            path = shutil.which(engine)
+            version = None
+            if path:
+                try:
+                    result = subprocess.run(
+                        [path, '--version'],
+                        stdout=subprocess.PIPE,
+                        stderr=subprocess.PIPE,
+                        timeout=10
+                    )
+                    if result.returncode == 0:
+                        version = result.stdout.decode('utf-8', errors='ignore').splitlines()[0].strip()
+                except (OSError, subprocess.TimeoutExpired, IndexError) as e:
+                    logger.warning(f"Could not probe {engine}: {e}")
+            engines[engine] = {
+                'available': version is not None,
+                'version': version,
+                'path': path,
+            }
+            logger.info(f"LaTeX engine {engine}: {version or 'not available'}")
+
+        with cls._lock:
+            cls.engines = engines
+        return engines
+
+    @classmethod
+    def load(cls, engines: Dict[str, Dict[str, Optional[str]]]):
+        """Adopt a probe result from another process instead of probing again"""
+        with cls._lock:
+            cls.engines = engines
+
+    @classmethod
+    def status(cls) -> Dict[str, Dict[str, Optional[str]]]:
+        """Probe result, probing on first use"""
+        if cls.engines is None:
+            cls.probe()
+        return cls.engines
+
+    @classmethod
+    def is_available(cls, engine: str) -> bool:
+        return cls.status().get(engine, {}).get('available', False)
+
+    @classmethod
+    def fingerprint(cls) -> str:
+        """Short description of the installed engines, for cache keys"""
+        return ";".join(
+            f"{engine}={info['version'] or '-'}" for engine, info in sorted(cls.status().items())
+        )
@@ -0,0 +1,128 @@
+"""LaTeX Escaping - Table-driven escaping of resume text for LaTeX sources"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict
+
+# Characters with a special meaning in LaTeX, and the ones OT1 fonts print as
+# something else (< > | come out as ¡ ¿ —)
+SPECIAL_CHARACTERS = {
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+    '<': r'\textless{}',
+    '>': r'\textgreater{}',
+    '|': r'\textbar{}',
+}
+
+# Typographic characters pasted from word processors, spelled the TeX way
+TYPOGRAPHIC_CHARACTERS = {
+    '‘': '`', '’': "'", '‚': ',', '‛': '`',
+    '“': '``', '”': "''", '„': '``', '‟': '``',
+    '«': '``', '»': "''", '‹': '`', '›': "'",
+    '\u2010': '-', '\u2011': '-', '\u2012': '--', '–': '--', '—': '---', '\u2015': '---',
+    '\u2212': '-', '…': r'\ldots{}',
+    '\u00a0': '~', '\u2009': r'\,', '\u202f': r'\,',
+    '\u200b': '', '\u200c': '', '\u200d': '', '\u2060': '', '\ufeff': '', '\u00ad': '',
+    '•': r'\textbullet{}', '·': r'\textperiodcentered{}',
+    '©': r'\textcopyright{}', '®': r'\textregistered{}', '™': r'\texttrademark{}',
+    '°': r'\textdegree{}', '€': r'\texteuro{}', '£': r'\pounds{}',
+    '§': r'\S{}', '¶': r'\P{}', '†': r'\dag{}', '‡': r'\ddag{}',
+    '¡': r'\textexclamdown{}', '¿': r'\textquestiondown{}',
+    '×': r'$\times$', '÷': r'$\div$', '±': r'$\pm$', 'µ': r'$\mu$',
+    '→': r'$\rightarrow$', '←': r'$\leftarrow$', '↔': r'$\leftrightarrow$',
+    '≤': r'$\leq$', '≥': r'$\geq$', '≈': r'$\approx$', '≠': r'$\neq$',
+    '½': '1/2', '¼': '1/4', '¾': '3/4',
+    # Letters without an accent decomposition
+    'ß': r'\ss{}', 'æ': r'\ae{}', 'Æ': r'\AE{}', 'œ': r'\oe{}', 'Œ': r'\OE{}',
+    'ø': r'\o{}', 'Ø': r'\O{}', 'ł': r'\l{}', 'Ł': r'\L{}', 'ı': r'\i{}',
+    'đ': 'd', 'Đ': 'D', 'ð': 'd', 'Ð': 'D', 'þ': 'th', 'Þ': 'Th',
+}
+
+# Combining marks with an accent command in every font encoding
+ACCENTS = {
+    '\u0300': '`', '\u0301': "'", '\u0302': '^', '\u0303': '~', '\u0304': '=', '\u0306': 'u',
+    '\u0307': '.', '\u0308': '"', '\u030a': 'r', '\u030b': 'H', '\u030c': 'v', '\u0327': 'c',
+}
+
+
+def _accented(character: str) -> str:
+    """A precomposed Latin letter as accent commands, e.g. é -> \\'{e}"""
+    base, *marks = unicodedata.normalize('NFD', character)
+    if not base.isascii():
+        return character
+    # Marks without a command (ogonek, hook...) are left off
+    marks = [mark for mark in marks if mark in ACCENTS]
+    if not marks:
+        return base
+    # Accents sit on the dotless i and j
+    spelled = {'i': r'\i', 'j': r'\j'}.get(base, base)
+    for mark in marks:
+        spelled = f"\\{ACCENTS[mark]}{{{spelled}}}"
+    return spelled
+
+
+def _table(*mappings: Dict[str, str]) -> Dict[int, str]:
+    table = {}
+    for mapping in mappings:
+        table.update({ord(character): spelled for character, spelled in mapping.items()})
+    return table
+
+
+# Latin-1 Supplement to Latin Extended-B, covering accented names in European languages
+LATIN_LETTERS = {
+    chr(code): _accented(chr(code))
+    for code in range(0xC0, 0x250)
+    if unicodedata.category(chr(code)).startswith('L') and unicodedata.decomposition(chr(code))
+}
+
+SPECIALS_TABLE = _table(SPECIAL_CHARACTERS)
+PDFLATEX_TABLE = _table(LATIN_LETTERS, TYPOGRAPHIC_CHARACTERS, SPECIAL_CHARACTERS)
+
+_SPECIAL = re.compile('[' + re.escape(''.join(SPECIAL_CHARACTERS)) + ']')
+_SPECIAL_OR_NON_ASCII = re.compile('[' + re.escape(''.join(SPECIAL_CHARACTERS)) + '\u0080-\U0010ffff]')
+
+
+@lru_cache(maxsize=1024)
+def _ascii_fallback(character: str) -> str:
+    """Closest ASCII spelling of a character outside the table; dropped if there is none"""
+    decomposed = unicodedata.normalize('NFKD', character).encode('ascii', 'ignore').decode('ascii')
+    return decomposed.translate(SPECIALS_TABLE)
+
+
+def escape_latex(text: Any) -> str:
+    """
+    Escape text for pdfLaTeX: LaTeX specials are escaped and non-ASCII
+    characters become the commands or ASCII spellings pdfLaTeX can typeset
+    with any font encoding. Characters it cannot typeset at all (emoji, CJK)
+    are dropped rather than failing the compile. Clean text is returned as is.
+    """
+    if not text:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    if _SPECIAL_OR_NON_ASCII.search(text) is None:
+        return text
+    text = text.translate(PDFLATEX_TABLE)
+    if text.isascii():
+        return text
+    return "".join(character if character.isascii() else _ascii_fallback(character) for character in text)
+
+
+def escape_latex_unicode(text: Any) -> str:
+    """Escape LaTeX specials only, for engines that typeset Unicode (XeLaTeX, LuaLaTeX)"""
+    if not text:
+        return ""
+    if not isinstance(text, str):
+        text = str(text)
+    if _SPECIAL.search(text) is None:
+        return text
+    return text.translate(SPECIALS_TABLE)
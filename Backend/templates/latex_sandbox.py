@@ -0,0 +1,183 @@
+"""LaTeX Sandbox - Runs engine processes under per-job resource limits"""
+
+import logging
+import os
+import re
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from config import settings
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits, jobs only get the wall-clock timeout
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+class CompileLimits(NamedTuple):
+    """Limits applied to every engine process; 0 leaves one unlimited"""
+    cpu_seconds: int
+    memory_mb: int  # Address space
+    output_mb: int  # Largest file the engine may write
+    open_files: int
+
+    @classmethod
+    def from_settings(cls, **overrides: int) -> "CompileLimits":
+        """Limits from the LATEX_* settings, with per-template overrides"""
+        limits = cls(
+            settings.LATEX_CPU_SECONDS, settings.LATEX_MEMORY_MB,
+            settings.LATEX_OUTPUT_MB, settings.LATEX_OPEN_FILES,
+        )
+        return limits._replace(**overrides)
+
+    def apply(self):
+        """Set the limits on the current process; runs in the child between fork and exec"""
+        if resource is None:
+            return
+        if self.cpu_seconds:
+            # SIGXCPU at the soft limit, SIGKILL a second later if it is ignored
+            resource.setrlimit(resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds + 1))
+        if self.memory_mb:
+            memory = self.memory_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (memory, memory))
+        if self.output_mb:
+            output = self.output_mb * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_FSIZE, (output, output))
+        if self.open_files:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (self.open_files, self.open_files))
+
+
+class CompileUsage(NamedTuple):
+    """Resources one engine process used"""
+    cpu_seconds: float
+    max_rss_mb: float
+    wall_seconds: float
+
+    def __str__(self):
+        return f"{self.cpu_seconds:.2f}s CPU, {self.max_rss_mb:.0f} MB peak, {self.wall_seconds:.2f}s wall"
+
+
+class LaTeXResourceLimitError(Exception):
+    """An engine process was stopped for exceeding one of its CompileLimits"""
+
+    def __init__(self, limit: str, usage: CompileUsage):
+        super().__init__(limit, usage)
+        self.limit = limit
+        self.usage = usage
+
+    def __str__(self):
+        return f"LaTeX compile exceeded its {self.limit} limit ({self.usage})"
+
+
+class LaTeXSandbox:
+    """Spawn, wait for and account engine processes run under CompileLimits"""
+
+    # Output the engine's stdout and stderr are written to, in its work directory
+    OUTPUT_FILE = "engine.out"
+
+    # Signals the kernel sends when a limit is hit; SIGKILL follows an ignored SIGXCPU
+    LIMIT_SIGNALS = {'SIGXCPU': 'cpu', 'SIGXFSZ': 'output size'}
+
+    # Failed allocations, descriptors and writes (when SIGXFSZ is ignored) surface as engine errors rather than signals
+    MEMORY_PATTERN = re.compile(rb'out of memory|Cannot allocate memory|memory exhausted|bad_alloc|MemoryError')
+    OPEN_FILES_PATTERN = re.compile(rb'Too many open files')
+    OUTPUT_PATTERN = re.compile(rb'File too large')
+
+    # How often a running process is polled for exit
+    POLL_INTERVAL = 0.005
+
+    @classmethod
+    def spawn(cls, command: List[str], cwd: Path, env: Optional[Dict[str, str]],
+              limits: CompileLimits) -> subprocess.Popen:
+        """Start an engine process with its output going to OUTPUT_FILE"""
+        output = open(cwd / cls.OUTPUT_FILE, 'wb')
+        try:
+            return subprocess.Popen(
+                command,
+                cwd=cwd,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+                preexec_fn=limits.apply if resource is not None else None,
+            )
+        finally:
+            output.close()
+
+    @classmethod
+    def run(cls, command: List[str], cwd: Path, env: Optional[Dict[str, str]], timeout: float,
+            limits: CompileLimits) -> subprocess.CompletedProcess:
+        """Like subprocess.run, but limited; raises LaTeXResourceLimitError when a limit is hit"""
+        started = time.monotonic()
+        process = cls.spawn(command, cwd, env, limits)
+        return cls.wait(process, cwd, limits, started + timeout, started)
+
+    @classmethod
+    def wait(cls, process: subprocess.Popen, cwd: Path, limits: CompileLimits, deadline: float,
+             started: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Wait for a spawned process, record what it used and check it against its limits"""
+        started = time.monotonic() if started is None else started
+        try:
+            returncode, rusage = cls._wait(process, deadline)
+        except BaseException:
+            # Timed out, or the render was cancelled; never leave the engine running
+            process.kill()
+            process.wait()
+            raise
+
+        usage = cls._usage(rusage, time.monotonic() - started)
+        output = (cwd / cls.OUTPUT_FILE).read_bytes()
+        logger.info(f"{Path(str(process.args[0])).name} exited {returncode}: {usage}")
+
+        limit = cls._limit_hit(returncode, output, usage, limits)
+        if limit is not None:
+            logger.warning(f"LaTeX compile stopped by its {limit} limit: {usage}")
+            raise LaTeXResourceLimitError(limit, usage)
+        return subprocess.CompletedProcess(process.args, returncode, output, b'')
+
+    @classmethod
+    def _wait(cls, process: subprocess.Popen, deadline: float) -> Tuple[int, Optional[object]]:
+        """Exit code and rusage of the process, raising TimeoutExpired after the deadline"""
+        if not hasattr(os, 'wait4'):
+            returncode = process.wait(timeout=max(deadline - time.monotonic(), 0))
+            return returncode, None
+        while True:
+            pid, status, rusage = os.wait4(process.pid, os.WNOHANG)
+            if pid:
+                # Reaped here, so Popen must not wait for it again
+                process.returncode = os.waitstatus_to_exitcode(status)
+                return process.returncode, rusage
+            if time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(process.args, 0)
+            time.sleep(cls.POLL_INTERVAL)
+
+    @classmethod
+    def _usage(cls, rusage: Optional[object], wall_seconds: float) -> CompileUsage:
+        if rusage is None:
+            return CompileUsage(0.0, 0.0, wall_seconds)
+        # ru_maxrss is in kilobytes on Linux
+        return CompileUsage(rusage.ru_utime + rusage.ru_stime, rusage.ru_maxrss / 1024, wall_seconds)
+
+    @classmethod
+    def _limit_hit(cls, returncode: int, output: bytes, usage: CompileUsage,
+                   limits: CompileLimits) -> Optional[str]:
+        """Which limit stopped the process, if any"""
+        if returncode < 0:
+            name = signal.Signals(-returncode).name
+            if name in cls.LIMIT_SIGNALS:
+                return cls.LIMIT_SIGNALS[name]
+            if name == 'SIGKILL' and limits.cpu_seconds and usage.cpu_seconds >= limits.cpu_seconds:
+                return 'cpu'
+        elif returncode != 0:
+            if cls.MEMORY_PATTERN.search(output):
+                return 'memory'
+            if cls.OPEN_FILES_PATTERN.search(output):
+                return 'open files'
+            if cls.OUTPUT_PATTERN.search(output):
+                return 'output size'
+        return None
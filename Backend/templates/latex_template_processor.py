@@ -1,12 +1,33 @@
 """LaTeX Template Processor - Uses actual .tex files from Templates folder"""
 
+import hashlib
 import os
 import re
 import subprocess
-import tempfile
+from contextlib import contextmanager
 from io import BytesIO
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from config import settings
+from .latex_body import LaTeXBodyTemplate
+from .latex_engines import LaTeXEngineRegistry
+from .latex_escape import escape_latex, escape_latex_unicode
+from .latex_sandbox import CompileLimits, LaTeXResourceLimitError, LaTeXSandbox
+from .latex_validator import LaTeXValidator
+from .latex_worker_pool import LaTeXWorkerPool
+from .latex_workspaces import LaTeXWorkspace, LaTeXWorkspacePool, workspace_root
+from .resume_document import ResumeDocument
+
+
+class TemplateSource(NamedTuple):
+    """A template file split once into the pieces every render reuses"""
+    content: str  # Whole file, for templates rendered by the legacy injector
+    frozen: str  # Preamble without the theme colour line
+    color_line: str  # Theme colour definition, re-emitted per request
+    has_body: bool  # Whether the file has a \begin{document} to split on
+    support_files: Tuple[str, ...]  # Local .sty/.cls files the preamble loads
+    format_name: Optional[str]  # Format the frozen preamble dumps to (see build_formats)
 
 
 class LaTeXTemplateProcessor:
@@ -15,17 +36,67 @@ class LaTeXTemplateProcessor:
     # Path to templates folder (one level up from Backend)
     TEMPLATES_DIR = Path(__file__).parent.parent.parent / "Templates"
     
-    TEMPLATE_FILES = {
-        'auto_cv': 'autocv.tex',
-        'anti_cv': 'anticv.tex',
-        'ethan': 'ethan.tex',
-        'rendercv_classic': 'rendercv_classic.tex',
-        # Yuan template requires custom style file - skip for now
-        # 'yuan': 'yuanresume.tex',
+    # Body templates, one <template name>.tex per template (see LaTeXBodyTemplate)
+    BODIES_DIR = TEMPLATES_DIR / "bodies"
+    
+    # Compiled body templates, loaded once at import by load_bodies()
+    BODY_TEMPLATES: Dict[str, LaTeXBodyTemplate] = {}
+    
+    # Preamble file of each template, from the "%! preamble:" line of its body template.
+    # Yuan template requires custom style file - no body template for now
+    TEMPLATE_FILES: Dict[str, str] = {}
+    
+    # Engine each template is compiled with, or set by an "%! engine:" line in its body
+    # template; anything not listed uses pdfLaTeX
+    TEMPLATE_ENGINES = {
+        'auto_cv': 'pdflatex',
+        'anti_cv': 'pdflatex',
+        'ethan': 'pdflatex',
+        'rendercv_classic': 'pdflatex',
     }
     
-    # Templates that require XeLaTeX instead of pdfLaTeX
-    XELATEX_TEMPLATES = ['yuan']
+    # Resource limits that differ from the LATEX_* defaults; LATEX_TEMPLATE_LIMITS overrides these.
+    # A XeLaTeX template would need more memory_mb, as XeLaTeX maps OpenType fonts into memory.
+    TEMPLATE_LIMITS: Dict[str, Dict[str, int]] = {}
+    
+    # Command-line switch for a pass that only writes .aux files
+    DRAFT_OPTIONS = {
+        'pdflatex': '-draftmode',
+        'lualatex': '--draftmode',
+        'xelatex': '-no-pdf',
+    }
+    
+    # Templates whose body uses cross-references or page totals and always needs
+    # two pdflatex passes. Everything else gets a second pass only when asked for.
+    TWO_PASS_TEMPLATES: List[str] = []
+    MAX_PASSES = 3
+    
+    # Log messages asking for another run (LaTeX kernel, rerunfilecheck, lastpage...)
+    RERUN_PATTERN = re.compile(rb'Rerun to get|Please rerun LaTeX|Rerun LaTeX|\(rerunfilecheck\)|may have changed\. Rerun')
+    
+    # Packages and classes a preamble loads; the ones found in TEMPLATES_DIR are
+    # copied next to resume.tex before compiling
+    PACKAGE_PATTERN = re.compile(r'\\(?:usepackage|RequirePackage|documentclass)\s*(?:\[[^\]]*\])?\s*\{([^}]+)\}')
+    
+    # Parsed templates and support file contents, reloaded when the file's mtime changes
+    _sources: Dict[Path, Tuple[int, TemplateSource]] = {}
+    _support_data: Dict[str, Tuple[int, bytes]] = {}
+    
+    # Precompiled preamble formats (see build_formats)
+    FORMATS_DIR = Path(settings.LATEX_FORMAT_DIR) if settings.LATEX_FORMAT_DIR else Path(__file__).parent.parent / ".latex_formats"
+    
+    # Theme colour line, kept out of the frozen preamble so it can change per request
+    PRIMARY_COLOR_LINE = re.compile(r'\\definecolor\{primaryColor\}\{RGB\}\{\d+,\s*\d+,\s*\d+\}[^\n]*\n?')
+    
+    @classmethod
+    def load_bodies(cls):
+        """Compile the body templates and register the preamble and engine each one names"""
+        cls.BODY_TEMPLATES = LaTeXBodyTemplate.load_directory(cls.BODIES_DIR)
+        for template_name, body in cls.BODY_TEMPLATES.items():
+            if 'preamble' in body.metadata:
+                cls.TEMPLATE_FILES[template_name] = body.metadata['preamble']
+            if 'engine' in body.metadata:
+                cls.TEMPLATE_ENGINES[template_name] = body.metadata['engine']
     
     @classmethod
     def get_template_path(cls, template_name: str) -> Path:
@@ -34,918 +105,175 @@ class LaTeXTemplateProcessor:
         return cls.TEMPLATES_DIR / filename
     
     @classmethod
-    def _escape_latex(cls, text: str) -> str:
-        """Escape special LaTeX characters"""
-        if not text:
-            return ""
-        
-        chars = {
-            '&': r'\&',
-            '%': r'\%',
-            '$': r'\$',
-            '#': r'\#',
-            '_': r'\_',
-            '{': r'\{',
-            '}': r'\}',
-            '~': r'\textasciitilde{}',
-            '^': r'\textasciicircum{}',
-            '\\': r'\textbackslash{}',
-        }
+    def load_template(cls, template_name: str) -> TemplateSource:
+        """Parsed template, read from disk again only when the file has changed"""
+        if template_name not in cls.TEMPLATE_FILES:
+            template_name = 'auto_cv'
+        template_path = cls.get_template_path(template_name)
+        try:
+            mtime = template_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Template file not found: {template_path}")
         
-        return "".join(chars.get(c, c) for c in str(text))
-
+        cached = cls._sources.get(template_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        source = cls.parse_template(template_path.read_text(encoding='utf-8'), template_name)
+        cls._sources[template_path] = (mtime, source)
+        return source
+    
     @classmethod
-    def _generate_rendercv_classic_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for RenderCV Classic template - Academic/Traditional style"""
-        content = []
-        info = resume_data.get('personal_info', {})
-        
-        # Header
-        content.append(r"\begin{header}")
-        content.append(rf"    \fontsize{{25 pt}}{{25 pt}}\selectfont {cls._escape_latex(info.get('name', 'Your Name'))}")
-        content.append(r"    \vspace{5 pt}")
-        content.append(r"    \normalsize")
+    def parse_template(cls, latex_content: str, template_name: str = "auto_cv") -> TemplateSource:
+        """Split template text into frozen preamble, colour line and support files"""
+        preamble, begin, _ = latex_content.partition(r'\begin{document}')
+        if not begin:
+            return TemplateSource(latex_content, latex_content, "", False, (), None)
         
-        header_items = []
-        if info.get('location'):
-            header_items.append(rf"\mbox{{{cls._escape_latex(info['location'])}}}")
-        if info.get('email'):
-            email = cls._escape_latex(info['email'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{mailto:{email}}}{{{email}}}}}")
-        if info.get('phone'):
-            phone = cls._escape_latex(info['phone'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{tel:{phone}}}{{{phone}}}}}")
-        if info.get('website'):
-            website = cls._escape_latex(info['website'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://{website}}}{{{website}}}}}")
-        if info.get('linkedin'):
-            linkedin = cls._escape_latex(info['linkedin'])
-            username = linkedin.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://linkedin.com/in/{username}}}{{linkedin.com/in/{username}}}}}")
-        if info.get('github'):
-            github = cls._escape_latex(info['github'])
-            username = github.replace('github.com/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://github.com/{username}}}{{github.com/{username}}}}}")
-            
-        content.append(r"    " + r"%    \kern 5.0 pt%    \AND%    \kern 5.0 pt%".join(header_items))
-        content.append(r"\end{header}")
-        content.append(r"\vspace{5 pt - 0.3 cm}")
-
-        # Summary
-        if resume_data.get('summary'):
-            content.append(r"\section{Summary}")
-            content.append(r"\begin{onecolentry}")
-            content.append(cls._escape_latex(resume_data['summary']))
-            content.append(r"\end{onecolentry}")
-            content.append(r"\vspace{0.2 cm}")
-
-        # Experience
-        if resume_data.get('experience'):
-            content.append(r"\section{Experience}")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} -- {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                location = cls._escape_latex(exp.get('location', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{position}}}, {company} -- {location}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.10 cm}")
-                
-                if exp.get('description'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    for item in exp['description']:
-                        content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.2 cm}")
-
-        # Education
-        if resume_data.get('education'):
-            content.append(r"\section{Education}")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} -- {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                full_degree = f"{degree} in {field}" if field else degree
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{institution}}}, {full_degree}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.10 cm}")
-                
-                if edu.get('gpa') or edu.get('coursework'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    if edu.get('gpa'):
-                        content.append(rf"        \item GPA: {cls._escape_latex(edu['gpa'])}")
-                    if edu.get('coursework'):
-                        content.append(rf"        \item \textbf{{Coursework:}} {cls._escape_latex(edu['coursework'])}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.2 cm}")
-
-        # Projects
-        if resume_data.get('projects'):
-            content.append(r"\section{Projects}")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                url = cls._escape_latex(proj.get('url', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                if url:
-                    content.append(rf"    \href{{{url}}}{{{url}}}")
-                else:
-                    content.append(r"    ")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{name}}}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.10 cm}")
-                
-                content.append(r"\begin{onecolentry}")
-                content.append(r"    \begin{highlights}")
-                if proj.get('description'):
-                    content.append(rf"        \item {cls._escape_latex(proj['description'])}")
-                if proj.get('technologies'):
-                    techs = ", ".join(proj['technologies'])
-                    content.append(rf"        \item Tools Used: {cls._escape_latex(techs)}")
-                if proj.get('highlights'):
-                    # Assuming highlights is a string in the JSON structure based on frontend code
-                    # But frontend code shows highlights as a string in the example: "• Handles 10K+..."
-                    # Let's handle both string and list
-                    highlights = proj.get('highlights')
-                    if isinstance(highlights, list):
-                        for h in highlights:
-                            content.append(rf"        \item {cls._escape_latex(h)}")
-                    elif isinstance(highlights, str):
-                         # Split by bullet point if present
-                         items = [h.strip() for h in highlights.split('•') if h.strip()]
-                         for item in items:
-                             content.append(rf"        \item {cls._escape_latex(item)}")
-                content.append(r"    \end{highlights}")
-                content.append(r"\end{onecolentry}")
-                content.append(r"\vspace{0.2 cm}")
-
-        # Skills
-        if resume_data.get('skills'):
-            content.append(r"\section{Technologies}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(r"\begin{onecolentry}")
-                    content.append(rf"    \textbf{{{category}:}} {cls._escape_latex(items)}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.2 cm}")
-                elif isinstance(skill, str):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(cls._escape_latex(skill))
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.2 cm}")
-
-        return "\n".join(content)
-
+        frozen, color_line = cls._split_preamble(preamble)
+        packages = {
+            name.strip()
+            for names in cls.PACKAGE_PATTERN.findall(preamble)
+            for name in names.split(',')
+        }
+        support_files = tuple(sorted(
+            f"{name}{ext}" for name in packages for ext in ('.sty', '.cls')
+            if name and (cls.TEMPLATES_DIR / f"{name}{ext}").is_file()
+        ))
+        format_name = cls._format_name(template_name, frozen) if template_name in cls.TEMPLATE_FILES else None
+        return TemplateSource(latex_content, frozen, color_line, True, support_files, format_name)
+    
     @classmethod
-    def _generate_rendercv_engineering_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for RenderCV Engineering template - Skills-first, technical focus"""
-        content = []
-        info = resume_data.get('personal_info', {})
-        
-        # Header (same style as classic but engineering focused)
-        content.append(r"\begin{header}")
-        content.append(rf"    \fontsize{{25 pt}}{{25 pt}}\selectfont {cls._escape_latex(info.get('name', 'Your Name'))}")
-        content.append(r"    \vspace{5 pt}")
-        content.append(r"    \normalsize")
-        
-        header_items = []
-        if info.get('location'):
-            header_items.append(rf"\mbox{{{cls._escape_latex(info['location'])}}}")
-        if info.get('email'):
-            email = cls._escape_latex(info['email'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{mailto:{email}}}{{{email}}}}}")
-        if info.get('phone'):
-            phone = cls._escape_latex(info['phone'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{tel:{phone}}}{{{phone}}}}}")
-        if info.get('github'):
-            github = cls._escape_latex(info['github'])
-            username = github.replace('github.com/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://github.com/{username}}}{{GitHub: {username}}}}}")
-        if info.get('linkedin'):
-            linkedin = cls._escape_latex(info['linkedin'])
-            username = linkedin.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://linkedin.com/in/{username}}}{{LinkedIn: {username}}}}}")
-            
-        content.append(r"    " + r"%    \kern 5.0 pt%    \AND%    \kern 5.0 pt%".join(header_items))
-        content.append(r"\end{header}")
-        content.append(r"\vspace{5 pt - 0.3 cm}")
-
-        # Summary (optional but recommended for engineering roles)
-        if resume_data.get('summary'):
-            content.append(r"\section{Summary}")
-            content.append(r"\begin{onecolentry}")
-            content.append(cls._escape_latex(resume_data['summary']))
-            content.append(r"\end{onecolentry}")
-            content.append(r"\vspace{0.2 cm}")
-
-        # ENGINEERING: Skills FIRST (key differentiator)
-        if resume_data.get('skills'):
-            content.append(r"\section{Technical Skills}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(r"\begin{onecolentry}")
-                    content.append(rf"    \textbf{{{category}:}} {cls._escape_latex(items)}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.15 cm}")
-                elif isinstance(skill, str):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(cls._escape_latex(skill))
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.15 cm}")
-            content.append(r"\vspace{0.1 cm}")
-
-        # Experience (with engineering emphasis - metrics highlighted)
-        if resume_data.get('experience'):
-            content.append(r"\section{Professional Experience}")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} -- {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                location = cls._escape_latex(exp.get('location', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{company}}} \textbar{{}} {position}")
-                if location:
-                    content.append(rf"    \\ {location}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.10 cm}")
-                
-                if exp.get('description'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    for item in exp['description']:
-                        content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.2 cm}")
-
-        # Education
-        if resume_data.get('education'):
-            content.append(r"\section{Education}")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} -- {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                if field:
-                    content.append(rf"    \textbf{{{degree} in {field}}}")
-                else:
-                    content.append(rf"    \textbf{{{degree}}}")
-                content.append(rf"    \\ {institution}")
-                if edu.get('gpa'):
-                    content.append(rf"    \\ GPA: {cls._escape_latex(edu['gpa'])}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.2 cm}")
-
-        # Projects (engineering emphasis)
-        if resume_data.get('projects'):
-            content.append(r"\section{Projects}")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                
-                content.append(r"\begin{onecolentry}")
-                content.append(rf"    \textbf{{{name}}}")
-                if proj.get('technologies'):
-                    techs = ", ".join(proj['technologies'])
-                    content.append(rf"    \\ \textit{{Technologies:}} {cls._escape_latex(techs)}")
-                content.append(r"\end{onecolentry}")
-                content.append(r"\vspace{0.10 cm}")
-                
-                if proj.get('description') or proj.get('highlights'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    if proj.get('description'):
-                        content.append(rf"        \item {cls._escape_latex(proj['description'])}")
-                    if proj.get('highlights'):
-                        highlights = proj.get('highlights')
-                        if isinstance(highlights, list):
-                            for h in highlights:
-                                content.append(rf"        \item {cls._escape_latex(h)}")
-                        elif isinstance(highlights, str):
-                            items = [h.strip() for h in highlights.split('•') if h.strip()]
-                            for item in items:
-                                content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.15 cm}")
-
-        return "\n".join(content)
-
+    def _support_file_data(cls, names: Sequence[str]) -> Dict[str, bytes]:
+        """Contents of support files, read from disk again only when they have changed"""
+        data = {}
+        for name in names:
+            path = cls.TEMPLATES_DIR / name
+            try:
+                mtime = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                continue
+            cached = cls._support_data.get(name)
+            if cached is None or cached[0] != mtime:
+                cached = (mtime, path.read_bytes())
+                cls._support_data[name] = cached
+            data[name] = cached[1]
+        return data
+    
     @classmethod
-    def _generate_rendercv_sb2nov_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for RenderCV sb2nov template - Compact, GitHub-style"""
-        content = []
-        info = resume_data.get('personal_info', {})
-        
-        # Header - Compact style
-        content.append(r"\begin{header}")
-        content.append(rf"    \fontsize{{25 pt}}{{25 pt}}\selectfont {cls._escape_latex(info.get('name', 'Your Name'))}")
-        content.append(r"    \vspace{5 pt}")
-        content.append(r"    \normalsize")
-        
-        header_items = []
-        if info.get('email'):
-            email = cls._escape_latex(info['email'])
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{mailto:{email}}}{{{email}}}}}")
-        if info.get('phone'):
-            phone = cls._escape_latex(info['phone'])
-            header_items.append(rf"\mbox{{{phone}}}")
-        if info.get('github'):
-            github = cls._escape_latex(info['github'])
-            username = github.replace('github.com/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://github.com/{username}}}{{{username}}}}}")
-        if info.get('linkedin'):
-            linkedin = cls._escape_latex(info['linkedin'])
-            username = linkedin.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-            header_items.append(rf"\mbox{{\hrefWithoutArrow{{https://linkedin.com/in/{username}}}{{LinkedIn}}}}")
-        if info.get('location'):
-            header_items.append(rf"\mbox{{{cls._escape_latex(info['location'])}}}")
-            
-        content.append(r"    " + r"%    \kern 5.0 pt%    \AND%    \kern 5.0 pt%".join(header_items))
-        content.append(r"\end{header}")
-        content.append(r"\vspace{5 pt - 0.3 cm}")
-
-        # Summary (compact for sb2nov style)
-        if resume_data.get('summary'):
-            content.append(r"\section{Summary}")
-            content.append(r"\begin{onecolentry}")
-            content.append(cls._escape_latex(resume_data['summary']))
-            content.append(r"\end{onecolentry}")
-            content.append(r"\vspace{0.15 cm}")
-
-        # SB2NOV: Education FIRST (GitHub resume style)
-        if resume_data.get('education'):
-            content.append(r"\section{Education}")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} -- {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{institution}}}")
-                if field:
-                    degree_line = rf"    \\ {degree} in {field}"
-                else:
-                    degree_line = rf"    \\ {degree}"
-                if edu.get('gpa'):
-                    degree_line += rf" \textbar{{}} GPA: {cls._escape_latex(edu['gpa'])}"
-                content.append(degree_line)
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.15 cm}")
-
-        # Experience - Compact format
-        if resume_data.get('experience'):
-            content.append(r"\section{Experience}")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} -- {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                location = cls._escape_latex(exp.get('location', ''))
-                
-                content.append(r"\begin{twocolentry}{")
-                content.append(f"    {dates}")
-                content.append(r"}")
-                content.append(rf"    \textbf{{{position}}} \textbar{{}} {company}")
-                if location:
-                    content.append(rf"    \\ \textit{{{location}}}")
-                content.append(r"\end{twocolentry}")
-                content.append(r"\vspace{0.05 cm}")
-                
-                if exp.get('description'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    for item in exp['description']:
-                        content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.15 cm}")
-
-        # Projects - Compact
-        if resume_data.get('projects'):
-            content.append(r"\section{Projects}")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                url = proj.get('url', '')
-                
-                project_title = rf"\textbf{{{name}}}"
-                if url:
-                    project_title = rf"\href{{{cls._escape_latex(url)}}}{{\textbf{{{name}}}}}"
-                
-                content.append(r"\begin{onecolentry}")
-                content.append(f"    {project_title}")
-                if proj.get('technologies'):
-                    techs = ", ".join(proj['technologies'])
-                    content.append(rf"    \textbar{{}} \textit{{{cls._escape_latex(techs)}}}")
-                content.append(r"\end{onecolentry}")
-                content.append(r"\vspace{0.05 cm}")
-                
-                if proj.get('description') or proj.get('highlights'):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(r"    \begin{highlights}")
-                    if proj.get('description'):
-                        content.append(rf"        \item {cls._escape_latex(proj['description'])}")
-                    if proj.get('highlights'):
-                        highlights = proj.get('highlights')
-                        if isinstance(highlights, list):
-                            for h in highlights:
-                                content.append(rf"        \item {cls._escape_latex(h)}")
-                        elif isinstance(highlights, str):
-                            items = [h.strip() for h in highlights.split('•') if h.strip()]
-                            for item in items:
-                                content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{highlights}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.1 cm}")
-
-        # Skills - Last in sb2nov
-        if resume_data.get('skills'):
-            content.append(r"\section{Technical Skills}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(r"\begin{onecolentry}")
-                    content.append(rf"    \textbf{{{category}:}} {cls._escape_latex(items)}")
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.1 cm}")
-                elif isinstance(skill, str):
-                    content.append(r"\begin{onecolentry}")
-                    content.append(cls._escape_latex(skill))
-                    content.append(r"\end{onecolentry}")
-                    content.append(r"\vspace{0.1 cm}")
-
-        return "\n".join(content)
-
+    def has_source(cls, template_name: str) -> bool:
+        """Whether a template has LaTeX of its own; load_template gives the others auto_cv's"""
+        return template_name in cls.TEMPLATE_FILES
+    
     @classmethod
-    def _generate_ethan_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for Ethan template"""
-        content = []
-        info = resume_data.get('personal_info', {})
-        
-        # Header
-        content.append(r"\begin{center}")
-        content.append(rf"  \textbf{{\LARGE\scshape {cls._escape_latex(info.get('name', 'Your Name'))}}} \\")
-        content.append(r"  \vspace{1pt}\small")
-        
-        contact_items = []
-        if info.get('location'):
-            contact_items.append(cls._escape_latex(info['location']))
-        if info.get('email'):
-            email = cls._escape_latex(info['email'])
-            contact_items.append(rf"\href{{mailto:{email}}}{{{email}}}")
-        if info.get('phone'):
-            contact_items.append(cls._escape_latex(info['phone']))
-        if info.get('website'):
-            website = cls._escape_latex(info['website'])
-            contact_items.append(rf"\href{{https://{website}}}{{{website}}}")
-        if info.get('github'):
-            github = cls._escape_latex(info['github'])
-            username = github.replace('github.com/', '').replace('https://', '').replace('www.', '')
-            contact_items.append(rf"\href{{https://github.com/{username}}}{{GitHub}}")
-        if info.get('linkedin'):
-            linkedin = cls._escape_latex(info['linkedin'])
-            username = linkedin.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-            contact_items.append(rf"\href{{https://linkedin.com/in/{username}}}{{LinkedIn}}")
-            
-        content.append(r"  $\ \diamond\ $ ".join(contact_items))
-        content.append(r"\end{center}")
-
-        # Summary (Ethan template doesn't have a standard summary section, but we can add one)
-        if resume_data.get('summary'):
-            content.append(r"\section{Summary}")
-            content.append(cls._escape_latex(resume_data['summary']))
-
-        # Experience
-        if resume_data.get('experience'):
-            content.append(r"\section{Professional Experience}")
-            content.append(r"\cvheadingstart")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} - {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                location = cls._escape_latex(exp.get('location', ''))
-                
-                content.append(r"  \cvheading")
-                content.append(rf"    {{{company}}}{{{location}}}")
-                content.append(rf"    {{{position}}}{{{dates}}}")
-                
-                if exp.get('description'):
-                    content.append(r"  \cvitemstart")
-                    for item in exp['description']:
-                        content.append(rf"    \cvitem{{{cls._escape_latex(item)}}}")
-                    content.append(r"  \cvitemend")
-            content.append(r"\cvheadingend")
-
-        # Education
-        if resume_data.get('education'):
-            content.append(r"\section{Education}")
-            content.append(r"\cvheadingstart")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} - {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                full_degree = f"{degree} in {field}" if field else degree
-                location = cls._escape_latex(edu.get('location', ''))
-                
-                content.append(r"  \cvheading")
-                content.append(rf"    {{{institution}}}{{{location}}}")
-                content.append(rf"    {{{full_degree}}}{{{dates}}}")
-            content.append(r"\cvheadingend")
-
-        # Skills
-        if resume_data.get('skills'):
-            content.append(r"\section{Technical Skills}")
-            content.append(r"\begin{itemize}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(rf"\item \textbf{{{category}:}} {cls._escape_latex(items)}")
-                elif isinstance(skill, str):
-                    content.append(rf"\item {cls._escape_latex(skill)}")
-            content.append(r"\end{itemize}")
-
-        # Projects
-        if resume_data.get('projects'):
-            content.append(r"\section{Projects}")
-            content.append(r"\cvheadingstart")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                
-                content.append(r"  \item")
-                content.append(rf"    \textbf{{{name}}}")
-                
-                if proj.get('description') or proj.get('highlights'):
-                    content.append(r"  \cvitemstart")
-                    if proj.get('description'):
-                        content.append(rf"    \cvitem{{{cls._escape_latex(proj['description'])}}}")
-                    
-                    highlights = proj.get('highlights')
-                    if isinstance(highlights, list):
-                        for h in highlights:
-                            content.append(rf"    \cvitem{{{cls._escape_latex(h)}}}")
-                    elif isinstance(highlights, str):
-                         items = [h.strip() for h in highlights.split('•') if h.strip()]
-                         for item in items:
-                             content.append(rf"    \cvitem{{{cls._escape_latex(item)}}}")
-                    content.append(r"  \cvitemend")
-            content.append(r"\cvheadingend")
+    def get_engine(cls, template_name: str) -> str:
+        """LaTeX engine a template is compiled with"""
+        return cls.TEMPLATE_ENGINES.get(template_name, 'pdflatex')
+    
+    @classmethod
+    def get_limits(cls, template_name: str) -> CompileLimits:
+        """Resource limits every engine process of a template runs under"""
+        overrides = {**cls.TEMPLATE_LIMITS.get(template_name, {}), **settings.LATEX_TEMPLATE_LIMITS.get(template_name, {})}
+        return CompileLimits.from_settings(**overrides)
+    
+    @classmethod
+    def get_escape(cls, template_name: str) -> Callable[[Any], str]:
+        """Escaping for a template's engine; only pdfLaTeX needs non-ASCII text spelled out"""
+        return escape_latex if cls.get_engine(template_name) == 'pdflatex' else escape_latex_unicode
 
-        return "\n".join(content)
+    @classmethod
+    def inject_resume_data(cls, latex_content: str, resume_data: Union[ResumeDocument, Dict[str, Any]], theme_color: str = "#3B82F6", template_name: str = "auto_cv", format_name: Optional[str] = None) -> str:
+        """Inject resume data into LaTeX template, against a precompiled preamble format if one is given"""
+        source = cls.parse_template(latex_content, template_name)
+        return cls.render_template(source, resume_data, theme_color, template_name, format_name)
 
     @classmethod
-    def _generate_autocv_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for AutoCV template"""
-        content = []
-        info = resume_data.get('personal_info', {})
+    def render_template(cls, source: TemplateSource, resume_data: Union[ResumeDocument, Dict[str, Any]], theme_color: str = "#3B82F6",
+                        template_name: str = "auto_cv", format_name: Optional[str] = None) -> str:
+        """Assemble the LaTeX document for a parsed template"""
+        resume = ResumeDocument.of(resume_data)
+        if not source.has_body:
+            # Fallback to old method if structure is unexpected
+            return cls._old_inject_resume_data(source.content, resume, theme_color)
         
-        # Header
-        content.append(r"\begin{tabularx}{\linewidth}{@{} C @{}}")
-        content.append(rf"\Huge{{{cls._escape_latex(info.get('name', 'Your Name'))}}} \\[7.5pt]")
+        body_template = cls.BODY_TEMPLATES.get(template_name)
+        if body_template is None:
+            # Templates without a body file keep the legacy injector
+            return cls._old_inject_resume_data(source.content, resume, theme_color)
+        body = body_template.render(resume, cls.get_escape(template_name))
         
-        contact_items = []
-        if info.get('location'):
-            location = cls._escape_latex(info['location'])
-            contact_items.append(rf"{location}")
-        if info.get('github'):
-            github = cls._escape_latex(info['github'])
-            username = github.replace('github.com/', '').replace('https://', '').replace('www.', '')
-            contact_items.append(rf"\href{{https://github.com/{username}}}{{\raisebox{{-0.05\height}}\faGithub\ {username}}}")
-        if info.get('linkedin'):
-            linkedin = cls._escape_latex(info['linkedin'])
-            username = linkedin.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-            contact_items.append(rf"\href{{https://linkedin.com/in/{username}}}{{\raisebox{{-0.05\height}}\faLinkedin\ {username}}}")
-        if info.get('website'):
-            website = cls._escape_latex(info['website'])
-            contact_items.append(rf"\href{{https://{website}}}{{\raisebox{{-0.05\height}}\faGlobe \ {website}}}")
-        if info.get('email'):
-            email = cls._escape_latex(info['email'])
-            contact_items.append(rf"\href{{mailto:{email}}}{{\raisebox{{-0.05\height}}\faEnvelope \ {email}}}")
-        if info.get('phone'):
-            phone = cls._escape_latex(info['phone'])
-            contact_items.append(rf"\href{{tel:{phone}}}{{\raisebox{{-0.05\height}}\faMobile \ {phone}}}")
-            
-        content.append(r" \ $|$ \ ".join(contact_items) + r" \\")
-        content.append(r"\end{tabularx}")
-
-        # Summary
-        if resume_data.get('summary'):
-            content.append(r"\section{Summary}")
-            content.append(cls._escape_latex(resume_data['summary']))
-
-        # Experience
-        if resume_data.get('experience'):
-            content.append(r"\section{Work Experience}")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} - {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                
-                if exp.get('description'):
-                    content.append(rf"\begin{{joblong}}{{{position} at {company}}}{{{dates}}}")
-                    for item in exp['description']:
-                        content.append(rf"\item {cls._escape_latex(item)}")
-                    content.append(r"\end{joblong}")
-                else:
-                    content.append(rf"\begin{{jobshort}}{{{position} at {company}}}{{{dates}}}")
-                    content.append(r"\end{jobshort}")
-
-        # Projects
-        if resume_data.get('projects'):
-            content.append(r"\section{Projects}")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                url = cls._escape_latex(proj.get('url', ''))
-                desc = cls._escape_latex(proj.get('description', ''))
-                
-                content.append(r"\begin{tabularx}{\linewidth}{ @{}l r@{} }")
-                if url:
-                    content.append(rf"\textbf{{{name}}} & \hfill \href{{{url}}}{{Link}} \\[3.75pt]")
-                else:
-                    content.append(rf"\textbf{{{name}}} & \hfill \\[3.75pt]")
-                content.append(rf"\multicolumn{{2}}{{@{{}}X@{{}}}}{{{desc}}}  \\")
-                content.append(r"\end{tabularx}")
-
-        # Education
-        if resume_data.get('education'):
-            content.append(r"\section{Education}")
-            content.append(r"\begin{tabularx}{\linewidth}{@{}l X@{}}")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} - {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                full_degree = f"{degree} in {field}" if field else degree
-                gpa = f"(GPA: {cls._escape_latex(edu['gpa'])})" if edu.get('gpa') else ""
-                
-                content.append(rf"{dates} & {full_degree} at \textbf{{{institution}}} \hfill \normalsize {gpa} \\")
-            content.append(r"\end{tabularx}")
-
-        # Skills
-        if resume_data.get('skills'):
-            content.append(r"\section{Skills}")
-            content.append(r"\begin{tabularx}{\linewidth}{@{}l X@{}}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(rf"{category} & \normalsize{{{cls._escape_latex(items)}}}\\\\")
-                elif isinstance(skill, str):
-                    content.append(rf"Skill & \normalsize{{{cls._escape_latex(skill)}}}\\\\")
-            content.append(r"\end{tabularx}")
-
-        content.append(r"\vfill")
-        content.append(r"\center{\footnotesize Last updated: \today}")
+        color_line = cls._apply_theme_color(source.color_line, theme_color)
         
-        return "\n".join(content)
+        # With a precompiled format the frozen preamble is already loaded
+        head = "\\endofdump\n" if format_name else source.frozen
+        return f"{head}{color_line}\\begin{{document}}\n{body}\n\\end{{document}}"
 
     @classmethod
-    def _generate_anticv_body(cls, resume_data: Dict[str, Any]) -> str:
-        """Generate body content for Anti-CV template"""
-        content = []
-        info = resume_data.get('personal_info', {})
-        
-        # Header
-        name = cls._escape_latex(info.get('name', 'Your Name'))
-        phone = cls._escape_latex(info.get('phone', ''))
-        email = cls._escape_latex(info.get('email', ''))
-        location = cls._escape_latex(info.get('location', ''))
-        
-        website_url = info.get('website', '')
-        website_display = website_url.replace('https://', '').replace('www.', '')
-        website_tex = rf"\href{{{website_url}}}{{{cls._escape_latex(website_display)}}}" if website_url else ""
-        
-        github_url = info.get('github', '')
-        github_display = github_url.replace('https://', '').replace('www.', '')
-        github_tex = rf"\href{{{github_url}}}{{{cls._escape_latex(github_display)}}}" if github_url else ""
+    def _split_preamble(cls, preamble: str) -> Tuple[str, str]:
+        """Split a preamble into the part that can be frozen into a format and the theme colour line"""
+        match = cls.PRIMARY_COLOR_LINE.search(preamble)
+        if not match:
+            return preamble, ""
+        color_line = match.group(0)
+        if not color_line.endswith("\n"):
+            color_line += "\n"
+        return preamble[:match.start()] + preamble[match.end():], color_line
 
-        linkedin_url = info.get('linkedin', '')
-        linkedin_display = linkedin_url.replace('linkedin.com/in/', '').replace('https://', '').replace('www.', '')
-        linkedin_tex = rf"\href{{{linkedin_url}}}{{{cls._escape_latex(linkedin_display)}}}" if linkedin_url else ""
-        
-        # Manually construct header to include all fields and replace "Anti Curriculum Vitae" text
-        content.append(r"{\Huge \usefont{OT1}{phv}{m}{n} \textbf{" + name + r"}}")
-        content.append(r"{\large \usefont{OT1}{phv}{m}{n} \hfill " + phone + r"\hspace{25pt}" + email + r"}")
+    @classmethod
+    def _apply_theme_color(cls, color_line: str, theme_color: str) -> str:
+        """Replace the RGB value of the primaryColor definition with the theme colour"""
+        if not color_line or not theme_color or theme_color == "#3B82F6":
+            return color_line
+        hex_color = theme_color.lstrip('#')
+        r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return f"\\definecolor{{primaryColor}}{{RGB}}{{{r}, {g}, {b}}}\n"
+
+    @classmethod
+    def _old_inject_resume_data(cls, latex_content: str, resume: ResumeDocument, theme_color: str = "#3B82F6") -> str:
+        """Legacy injection method for non-rendercv templates"""
         
-        content.append(r"\par \vspace{5pt}")
+        # Personal Info
+        info = resume.personal_info
         
-        second_line_items = []
-        if location:
-            second_line_items.append(rf"\textit{{{location}}}")
-        else:
-            second_line_items.append(r"\textit{Curriculum Vitae}")
-            
-        links = []
-        if website_tex: links.append(rf"\textit{{website }} {website_tex}")
-        if github_tex: links.append(rf"\textit{{github }} {github_tex}")
-        if linkedin_tex: links.append(rf"\textit{{linkedin }} {linkedin_tex}")
+        # Replace name
+        if info.name:
+            latex_content = re.sub(
+                r'(\\name\{|\\textbf\{\\LARGE\\scshape |\\Huge\{|Your Name|Xiao Yuan|Jane Doe|John Doe)',
+                lambda m: m.group(1) + info.name if '\\' in m.group(1) else info.name,
+                latex_content,
+                count=1
+            )
         
-        if links:
-            content.append(second_line_items[0] + r"\hfill " + r"\hspace{25pt}".join(links))
-        else:
-            content.append(second_line_items[0])
-            
-        content.append(r"\par \normalsize \normalfont")
-        content.append(r"\sepspace")
-
-        # Summary
-        if resume_data.get('summary'):
-            content.append(r"\NewPart{Summary}{}")
-            content.append(r"\begin{itemize}")
-            content.append(rf"    \item {cls._escape_latex(resume_data['summary'])}")
-            content.append(r"\end{itemize}")
-            content.append(r"\sepspace")
-
-        # Experience
-        if resume_data.get('experience'):
-            content.append(r"\NewPart{Work Experience}{}")
-            content.append(r"\begin{itemize}")
-            for exp in resume_data['experience']:
-                dates = f"{cls._escape_latex(exp.get('start_date', ''))} -- {cls._escape_latex(exp.get('end_date', 'Present'))}"
-                company = cls._escape_latex(exp.get('company', ''))
-                position = cls._escape_latex(exp.get('position', ''))
-                location = cls._escape_latex(exp.get('location', ''))
-                
-                content.append(rf"    \item \textbf{{{position}}} at \textbf{{{company}}}, {location} ({dates})")
-                
-                if exp.get('description'):
-                    content.append(r"    \begin{itemize}")
-                    for item in exp['description']:
-                        content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{itemize}")
-            content.append(r"\end{itemize}")
-            content.append(r"\sepspace")
-
-        # Education
-        if resume_data.get('education'):
-            content.append(r"\NewPart{Education}{}")
-            content.append(r"\begin{itemize}")
-            for edu in resume_data['education']:
-                dates = f"{cls._escape_latex(edu.get('start_date', ''))} -- {cls._escape_latex(edu.get('end_date', 'Present'))}"
-                institution = cls._escape_latex(edu.get('institution', ''))
-                degree = cls._escape_latex(edu.get('degree', ''))
-                field = cls._escape_latex(edu.get('field_of_study', ''))
-                full_degree = f"{degree} in {field}" if field else degree
-                
-                content.append(rf"    \item \textbf{{{institution}}}, {full_degree} ({dates})")
-                if edu.get('gpa'):
-                    content.append(rf"    \item GPA: {cls._escape_latex(edu['gpa'])}")
-            content.append(r"\end{itemize}")
-            content.append(r"\sepspace")
-
-        # Projects
-        if resume_data.get('projects'):
-            content.append(r"\NewPart{Projects}{}")
-            content.append(r"\begin{itemize}")
-            for proj in resume_data['projects']:
-                name = cls._escape_latex(proj.get('name', ''))
-                content.append(rf"    \item \textbf{{{name}}}")
-                
-                if proj.get('description'):
-                    content.append(rf"    -- {cls._escape_latex(proj['description'])}")
-                
-                if proj.get('highlights'):
-                    content.append(r"    \begin{itemize}")
-                    highlights = proj.get('highlights')
-                    if isinstance(highlights, list):
-                        for h in highlights:
-                            content.append(rf"        \item {cls._escape_latex(h)}")
-                    elif isinstance(highlights, str):
-                         items = [h.strip() for h in highlights.split('•') if h.strip()]
-                         for item in items:
-                             content.append(rf"        \item {cls._escape_latex(item)}")
-                    content.append(r"    \end{itemize}")
-            content.append(r"\end{itemize}")
-            content.append(r"\sepspace")
-
-        # Skills
-        if resume_data.get('skills'):
-            content.append(r"\NewPart{Skills}{}")
-            for skill in resume_data['skills']:
-                if isinstance(skill, dict) and 'category' in skill:
-                    category = cls._escape_latex(skill['category'])
-                    items = ", ".join(skill['items'])
-                    content.append(rf"\SkillsEntry{{{category}}}{{{cls._escape_latex(items)}}}")
-                elif isinstance(skill, str):
-                    content.append(rf"\SkillsEntry{{Skill}}{{{cls._escape_latex(skill)}}}")
-            content.append(r"\sepspace")
-
-        return "\n".join(content)
-
-    @classmethod
-    def inject_resume_data(cls, latex_content: str, resume_data: Dict[str, Any], theme_color: str = "#3B82F6", template_name: str = "auto_cv") -> str:
-        """Inject resume data into LaTeX template"""
+        # Replace email
+        if info.email:
+            latex_content = re.sub(
+                r'(\\email\{|\\href\{mailto:)[^}]+',
+                lambda m: m.group(1) + info.email,
+                latex_content
+            )
         
-        # Extract preamble
-        preamble_match = re.search(r'([\s\S]*?)\\begin\{document\}', latex_content)
-        if not preamble_match:
-            # Fallback to old method if structure is unexpected
-            return cls._old_inject_resume_data(latex_content, resume_data, theme_color)
-            
-        preamble = preamble_match.group(1)
+        # Replace phone
+        if info.phone:
+            latex_content = re.sub(
+                r'(\\phone\{|\+\d{1,3}[- ]?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4})',
+                lambda m: m.group(1) if '\\' in m.group(1) else info.phone,
+                latex_content
+            )
         
-        # Generate body based on template type
-        if template_name == 'rendercv_classic':
-            body = cls._generate_rendercv_classic_body(resume_data)
-        elif template_name == 'ethan':
-            body = cls._generate_ethan_body(resume_data)
-        elif template_name == 'auto_cv':
-            body = cls._generate_autocv_body(resume_data)
-        elif template_name == 'anti_cv':
-            body = cls._generate_anticv_body(resume_data)
-        else:
-            # For other templates, fallback to old method for now
-            # Ideally implement generators for them too
-            return cls._old_inject_resume_data(latex_content, resume_data, theme_color)
-            
-        # Replace theme color in preamble
-        if theme_color and theme_color != "#3B82F6":
-            hex_color = theme_color.lstrip('#')
-            r, g, b = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            preamble = re.sub(
-                r'\\definecolor\{primaryColor\}\{RGB\}\{\d+,\s*\d+,\s*\d+\}',
-                rf'\\definecolor{{primaryColor}}{{RGB}}{{{r}, {g}, {b}}}',
-                preamble
+        # Replace GitHub
+        if info.github:
+            latex_content = re.sub(
+                r'(\\href\{https://github\.com/)[^}]+',
+                lambda m: m.group(1) + info.github.replace('github.com/', ''),
+                latex_content
             )
-            
-        return f"{preamble}\\begin{{document}}\n{body}\n\\end{{document}}"
-
-    @classmethod
-    def _old_inject_resume_data(cls, latex_content: str, resume_data: Dict[str, Any], theme_color: str = "#3B82F6") -> str:
-        """Legacy injection method for non-rendercv templates"""
         
-        # Personal Info
-        if resume_data.get('personal_info'):
-            info = resume_data['personal_info']
-            
-            # Replace name
-            if info.get('name'):
-                latex_content = re.sub(
-                    r'(\\name\{|\\textbf\{\\LARGE\\scshape |\\Huge\{|Your Name|Xiao Yuan|Jane Doe|John Doe)',
-                    lambda m: m.group(1) + info['name'] if '\\' in m.group(1) else info['name'],
-                    latex_content,
-                    count=1
-                )
-            
-            # Replace email
-            if info.get('email'):
-                latex_content = re.sub(
-                    r'(\\email\{|\\href\{mailto:)[^}]+',
-                    lambda m: m.group(1) + info['email'],
-                    latex_content
-                )
-            
-            # Replace phone
-            if info.get('phone'):
-                latex_content = re.sub(
-                    r'(\\phone\{|\+\d{1,3}[- ]?\(?\d{3}\)?[- ]?\d{3}[- ]?\d{4})',
-                    lambda m: m.group(1) if '\\' in m.group(1) else info['phone'],
-                    latex_content
-                )
-            
-            # Replace GitHub
-            if info.get('github'):
-                latex_content = re.sub(
-                    r'(\\href\{https://github\.com/)[^}]+',
-                    lambda m: m.group(1) + info['github'].replace('github.com/', ''),
-                    latex_content
-                )
-            
-            # Replace LinkedIn
-            if info.get('linkedin'):
-                latex_content = re.sub(
-                    r'(\\href\{https://linkedin\.com/in/)[^}]+',
-                    lambda m: m.group(1) + info['linkedin'].replace('linkedin.com/in/', ''),
-                    latex_content
-                )
+        # Replace LinkedIn
+        if info.linkedin:
+            latex_content = re.sub(
+                r'(\\href\{https://linkedin\.com/in/)[^}]+',
+                lambda m: m.group(1) + info.linkedin.replace('linkedin.com/in/', ''),
+                latex_content
+            )
         
         # Replace theme color if template supports it
         if theme_color and theme_color != "#3B82F6":
@@ -961,74 +289,248 @@ class LaTeXTemplateProcessor:
         return latex_content
     
     @classmethod
-    def compile_latex(cls, latex_content: str) -> BytesIO:
-        """Compile LaTeX content to PDF"""
+    def _latex_command(cls, engine: str = 'pdflatex', format_name: Optional[str] = None) -> List[str]:
+        """Engine invocation, without the input file"""
+        command = [engine, '-interaction=nonstopmode', '-halt-on-error']
+        if format_name:
+            command.append(f'-fmt={format_name}')
+        return command
+
+    @classmethod
+    def _latex_env(cls, format_name: Optional[str] = None) -> Optional[Dict[str, str]]:
+        """
+        Environment that lets the engine find our formats ahead of the system
+        ones and, in deterministic mode, pins the PDF dates and trailer ID
+        """
+        if not format_name and not settings.DETERMINISTIC_PDF:
+            return None
+        env = os.environ.copy()
+        if format_name:
+            env['TEXFORMATS'] = f"{cls.FORMATS_DIR}{os.pathsep}{env.get('TEXFORMATS', '')}"
+        if settings.DETERMINISTIC_PDF:
+            # pdfTeX, XeTeX and LuaTeX take CreationDate, ModDate and the /ID from this; the
+            # ID also hashes the job name, which is always "resume". \today is left alone.
+            env['SOURCE_DATE_EPOCH'] = str(settings.PDF_SOURCE_DATE_EPOCH)
+            env.pop('FORCE_SOURCE_DATE', None)
+        return env
+
+    @classmethod
+    def _format_name(cls, template_name: str, frozen_preamble: str) -> str:
+        """
+        Format file name, tied to the exact preamble it was dumped from and to
+        the engine build that dumped it; a format is only loadable by the same
+        engine version, so an upgraded TeX looks for (and needs) a new one
+        """
+        engine = cls.get_engine(template_name)
+        version = LaTeXEngineRegistry.status().get(engine, {}).get('version') or ''
+        digest = hashlib.sha1(f"{engine}\n{version}\n{frozen_preamble}".encode('utf-8')).hexdigest()[:12]
+        return f"{Path(cls.TEMPLATE_FILES[template_name]).stem}-{digest}"
+
+    @classmethod
+    def find_format(cls, template_name: str, source: TemplateSource) -> Optional[str]:
+        """Name of the precompiled format for this template, if one has been built"""
+        if not settings.LATEX_USE_FORMATS or template_name not in cls.TEMPLATE_FILES or source.format_name is None:
+            return None
+        if (cls.FORMATS_DIR / f"{source.format_name}.fmt").exists():
+            return source.format_name
+        return None
+
+    @classmethod
+    def build_formats(cls) -> Dict[str, Optional[str]]:
+        """Dump the frozen preamble of every LaTeX template into a format file"""
         import logging
         logger = logging.getLogger(__name__)
         
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tmpdir_path = Path(tmpdir)
+        cls.FORMATS_DIR.mkdir(parents=True, exist_ok=True)
+        
+        built = {}
+        for template_name in cls.TEMPLATE_FILES:
+            built[template_name] = None
+            engine = cls.get_engine(template_name)
+            if not LaTeXEngineRegistry.is_available(engine):
+                logger.warning(f"{engine} is not available, skipping format for {template_name}")
+                continue
+            try:
+                source = cls.load_template(template_name)
+            except FileNotFoundError as e:
+                logger.warning(str(e))
+                continue
+            format_name = source.format_name
+            if format_name in built.values():
+                # Templates sharing a preamble share its format
+                built[template_name] = format_name
+                continue
+            for name, data in cls._support_file_data(source.support_files).items():
+                (cls.FORMATS_DIR / name).write_bytes(data)
             
-            # Write LaTeX file
-            tex_file = tmpdir_path / "resume.tex"
-            with open(tex_file, 'w', encoding='utf-8') as f:
-                f.write(latex_content)
+            # mylatexformat dumps everything up to \endofdump
+            source_file = cls.FORMATS_DIR / f"{format_name}.tex"
+            source_file.write_text(f"{source.frozen}\\endofdump\n\\begin{{document}}\n\\end{{document}}\n", encoding='utf-8')
+            result = subprocess.run(
+                [engine, '-ini', '-interaction=nonstopmode', '-halt-on-error',
+                 f'-jobname={format_name}', f'&{engine}', 'mylatexformat.ltx', source_file.name],
+                cwd=cls.FORMATS_DIR,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                timeout=120
+            )
+            if result.returncode != 0 or not (cls.FORMATS_DIR / f"{format_name}.fmt").exists():
+                logger.error(f"Format dump failed for {template_name}: {result.stdout.decode('utf-8', errors='ignore')[-500:]}")
+                continue
             
-            logger.info(f"LaTeX file written to: {tex_file}")
+            logger.info(f"Built format {format_name}.fmt for {template_name}")
+            built[template_name] = format_name
+        return built
+
+    @classmethod
+    def start_worker_pool(cls):
+        """Pre-start warm LaTeX workers for the LaTeX templates"""
+        pool = LaTeXWorkerPool.get_pool()
+        if pool is None:
+            return
+        prewarmed = set()
+        for template_name in cls.TEMPLATE_FILES:
+            engine = cls.get_engine(template_name)
+            template_path = cls.get_template_path(template_name)
+            if not LaTeXEngineRegistry.is_available(engine) or not template_path.exists() or template_path in prewarmed:
+                continue
+            prewarmed.add(template_path)
+            source = cls.load_template(template_name)
+            format_name = cls.find_format(template_name, source)
+            head = "\\endofdump\n" if format_name else source.frozen
+            pool.prewarm(
+                head + source.color_line, cls._latex_command(engine, format_name), cls._latex_env(format_name),
+                cls._support_file_data(source.support_files), cls.get_limits(template_name)
+            )
+
+    @classmethod
+    @contextmanager
+    def _workspace(cls, latex_content: str, engine: str = 'pdflatex', format_name: Optional[str] = None,
+                   support_files: Sequence[str] = (), limits: Optional[CompileLimits] = None):
+        """Yield a work directory and a pass runner, backed by a warm worker when one is free"""
+        command = cls._latex_command(engine, format_name)
+        env = cls._latex_env(format_name)
+        limits = limits or CompileLimits.from_settings()
+        preamble, begin, rest = latex_content.partition(r'\begin{document}')
+        pool = LaTeXWorkerPool.get_pool() if begin else None
+        worker = pool.checkout(preamble, command, env, cls._support_file_data(support_files), limits) if pool else None
+
+        if worker is not None:
+            body = begin + rest
             
-            # Copy any required style files (like myresume.sty for yuan template)
-            style_files = ['myresume.sty']
-            for style_file in style_files:
-                source = cls.TEMPLATES_DIR / style_file
-                if source.exists():
-                    dest = tmpdir_path / style_file
-                    dest.write_text(source.read_text(encoding='utf-8'), encoding='utf-8')
-                    logger.info(f"Copied style file: {style_file}")
+            def run_pass(timeout: float, draft: bool = False) -> subprocess.CompletedProcess:
+                # Warm processes are already running, so draft mode is switched on from the body
+                draft = draft and engine == 'pdflatex'
+                return worker.run(r"\pdfdraftmode=1\relax" + body if draft else body, timeout)
             
             try:
-                # Check if pdflatex is available
-                pdflatex_check = subprocess.run(
-                    ['pdflatex', '--version'],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    timeout=5
+                yield worker.workdir, run_pass
+            finally:
+                pool.release(worker)
+            return
+
+        pool = LaTeXWorkspacePool.get_pool()
+        workspace = pool.checkout() if pool else LaTeXWorkspace(workspace_root())
+        try:
+            # Style files (like myresume.sty for yuan template) are linked from the Templates folder
+            workspace.prepare(latex_content, {name: cls.TEMPLATES_DIR / name for name in support_files})
+
+            def run_pass(timeout: float, draft: bool = False) -> subprocess.CompletedProcess:
+                return LaTeXSandbox.run(
+                    command + ([cls.DRAFT_OPTIONS[engine]] if draft else []) + [workspace.SOURCE_FILE],
+                    workspace.workdir, env, timeout, limits
                 )
-                logger.info(f"pdflatex version check: {pdflatex_check.returncode}")
-                
-                # Compile LaTeX (run twice for proper references)
-                for i in range(2):
-                    logger.info(f"Running pdflatex compilation pass {i+1}...")
-                    result = subprocess.run(
-                        ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', 'resume.tex'],
-                        cwd=tmpdir_path,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        timeout=60
-                    )
-                    logger.info(f"pdflatex pass {i+1} returncode: {result.returncode}")
+
+            yield workspace.workdir, run_pass
+        finally:
+            if pool:
+                pool.release(workspace)
+            else:
+                workspace.close()
+
+    @classmethod
+    def _pin_trailer_id(cls, latex_content: str) -> str:
+        """
+        Set pdfTeX's trailer /ID from the document itself; by default it also
+        hashes the output path, which differs between work directories
+        """
+        digest = hashlib.sha1(latex_content.encode('utf-8')).hexdigest()
+        return latex_content.replace(
+            r'\begin{document}', f"\\begin{{document}}\\ifdefined\\pdftrailerid\\pdftrailerid{{{digest}}}\\fi", 1
+        )
+
+    @classmethod
+    def _needs_rerun(cls, workdir: Path) -> bool:
+        """Whether the last pass left unresolved references behind"""
+        try:
+            aux = (workdir / "resume.aux").read_bytes()
+        except FileNotFoundError:
+            return False
+        # Nothing was written for a later pass to pick up
+        if aux.strip() in (b"", b"\\relax"):
+            return False
+        try:
+            log = (workdir / "resume.log").read_bytes()
+        except FileNotFoundError:
+            return False
+        return cls.RERUN_PATTERN.search(log) is not None
+
+    @classmethod
+    def compile_latex(cls, latex_content: str, format_name: Optional[str] = None,
+                      two_pass: bool = False, engine: str = 'pdflatex',
+                      support_files: Sequence[str] = (), limits: Optional[CompileLimits] = None) -> BytesIO:
+        """
+        Compile LaTeX content to PDF, optionally against a precompiled preamble format.
+        
+        With two_pass the first pass runs in draft mode (no PDF output) to produce
+        the .aux file; otherwise another pass runs only if pdflatex asks for one.
+        Every pass runs under limits (LATEX_* settings by default) and raises
+        LaTeXResourceLimitError when it exceeds one.
+        """
+        import logging
+        logger = logging.getLogger(__name__)
+        
+        if not LaTeXEngineRegistry.is_available(engine):
+            raise Exception(f"{engine} is not installed or not in PATH. Please install TeX Live or MiKTeX.")
+        
+        if settings.DETERMINISTIC_PDF:
+            latex_content = cls._pin_trailer_id(latex_content)
+        
+        with cls._workspace(latex_content, engine, format_name, support_files, limits) as (tmpdir_path, run_pass):
+            logger.info(f"Compiling LaTeX in: {tmpdir_path}")
+            
+            try:
+                for i in range(cls.MAX_PASSES):
+                    draft = two_pass and i == 0
+                    logger.info(f"Running {engine} compilation pass {i+1}{' (draft)' if draft else ''}...")
+                    result = run_pass(timeout=60, draft=draft)
+                    logger.info(f"{engine} pass {i+1} returncode: {result.returncode}")
                     if result.returncode != 0:
-                        logger.error(f"pdflatex stdout: {result.stdout.decode('utf-8', errors='ignore')[:500]}")
-                        logger.error(f"pdflatex stderr: {result.stderr.decode('utf-8', errors='ignore')[:500]}")
+                        logger.error(f"{engine} stdout: {result.stdout.decode('utf-8', errors='ignore')[:500]}")
+                        logger.error(f"{engine} stderr: {result.stderr.decode('utf-8', errors='ignore')[:500]}")
+                        break
+                    if not draft and not cls._needs_rerun(tmpdir_path):
+                        break
                 
                 # Read the generated PDF
                 pdf_file = tmpdir_path / "resume.pdf"
                 if pdf_file.exists():
                     logger.info(f"PDF file generated successfully: {pdf_file}")
-                    pdf_buffer = BytesIO(pdf_file.read_bytes())
-                    pdf_buffer.seek(0)
-                    return pdf_buffer
+                    # Read once before the workspace is reused; BytesIO shares the bytes rather than copying
+                    return BytesIO(pdf_file.read_bytes())
                 else:
                     logger.error(f"PDF file not found at: {pdf_file}")
                     logger.error(f"Files in temp dir: {list(tmpdir_path.iterdir())}")
-                    raise Exception("PDF file was not generated - pdflatex may not be installed or compilation failed")
+                    raise Exception(f"PDF file was not generated - {engine} may not be installed or compilation failed")
                     
+            except LaTeXResourceLimitError:
+                raise
             except subprocess.TimeoutExpired:
                 logger.error("LaTeX compilation timed out")
                 raise Exception("LaTeX compilation timed out")
             except FileNotFoundError as e:
-                logger.error(f"pdflatex not found: {str(e)}")
-                raise Exception("pdflatex is not installed or not in PATH. Please install TeX Live or MiKTeX.")
+                logger.error(f"{engine} not found: {str(e)}")
+                raise Exception(f"{engine} is not installed or not in PATH. Please install TeX Live or MiKTeX.")
             except Exception as e:
                 logger.error(f"Compilation error: {str(e)}")
                 # Try to read log file for error details
@@ -1043,21 +545,27 @@ class LaTeXTemplateProcessor:
                 raise Exception(f"LaTeX compilation failed: {str(e)}")
     
     @classmethod
-    def generate(cls, resume_data: Dict[str, Any], template_name: str = "auto_cv", 
+    def generate(cls, resume_data: Union[ResumeDocument, Dict[str, Any]], template_name: str = "auto_cv", 
                 theme_color: str = "#3B82F6") -> BytesIO:
         """Generate PDF from template and resume data"""
         
-        # Get template path
-        template_path = cls.get_template_path(template_name)
-        
-        if not template_path.exists():
-            raise FileNotFoundError(f"Template file not found: {template_path}")
-        
-        # Read template content
-        latex_content = template_path.read_text(encoding='utf-8')
+        # Parsed template, cached until the file changes
+        source = cls.load_template(template_name)
+        format_name = cls.find_format(template_name, source)
         
         # Inject resume data
-        latex_content = cls.inject_resume_data(latex_content, resume_data, theme_color, template_name)
+        resume = ResumeDocument.of(resume_data)
+        latex_content = cls.render_template(source, resume, theme_color, template_name, format_name)
+        
+        # Reject input the engine would halt on in milliseconds, instead of after spawning it
+        if settings.LATEX_PREFLIGHT:
+            LaTeXValidator.validate(latex_content, resume, cls.get_engine(template_name) != 'pdflatex', source.frozen)
         
         # Compile to PDF
-        return cls.compile_latex(latex_content)
+        return cls.compile_latex(
+            latex_content, format_name, template_name in cls.TWO_PASS_TEMPLATES, cls.get_engine(template_name),
+            source.support_files, cls.get_limits(template_name)
+        )
+
+
+LaTeXTemplateProcessor.load_bodies()
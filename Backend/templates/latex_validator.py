@@ -0,0 +1,231 @@
+"""LaTeX Validator - Pre-flight checks on generated LaTeX before an engine is spawned"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from .latex_escape import escape_latex, escape_latex_unicode
+from .resume_document import ResumeDocument
+
+
+class LaTeXIssue(NamedTuple):
+    """A problem that would make the engine fail, and the resume field it came from"""
+    kind: str  # brace, environment, math, special, unicode
+    message: str
+    line: int
+    column: int
+    field: Optional[str] = None  # e.g. "experience[0].description"
+
+    def __str__(self):
+        source = f" in {self.field}" if self.field else ""
+        return f"line {self.line}, column {self.column}{source}: {self.message}"
+
+
+class LaTeXValidationError(ValueError):
+    """Generated LaTeX that would not compile"""
+
+    def __init__(self, issues: List[LaTeXIssue]):
+        super().__init__(issues)
+        self.issues = issues
+
+    def __str__(self):
+        more = f" (and {len(self.issues) - 1} more)" if len(self.issues) > 1 else ""
+        return f"Invalid LaTeX at {self.issues[0]}{more}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'detail': str(self), 'issues': [issue._asdict() for issue in self.issues]}
+
+
+class LaTeXValidator:
+    """
+    Single linear scan of a document body for what makes pdflatex halt:
+    unbalanced braces, environments and math, specials outside the places
+    they are allowed and characters the engine cannot read. The preamble
+    comes from our own template files and is not checked, only read for
+    templates that redefine the URL commands.
+    """
+
+    # Environments where & separates columns
+    ALIGNMENT_ENVIRONMENTS = {
+        'tabular', 'tabular*', 'tabularx', 'tabulary', 'longtable', 'array',
+        'align', 'align*', 'alignat', 'alignat*', 'eqnarray', 'eqnarray*',
+        'matrix', 'pmatrix', 'bmatrix', 'vmatrix', 'cases', 'split',
+    }
+
+    # Stop collecting after this many, one bad field tends to cause a cascade
+    MAX_ISSUES = 10
+
+    _ASCII_TOKENS = r'\\(?:[A-Za-z@]+\*?|.)|%[^\n]*|[{}$#&_^]|[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]'
+    TOKENS = re.compile(_ASCII_TOKENS + r'|[^\x00-\x7f]', re.DOTALL)
+    UNICODE_TOKENS = re.compile(_ASCII_TOKENS, re.DOTALL)
+    ENVIRONMENT_NAME = re.compile(r'\s*\{([^{}]*)\}')
+
+    # Commands whose first argument is a URL, and that argument with one level of nested braces
+    URL_COMMANDS = frozenset({'\\href', '\\url'})
+    URL_ARGUMENT = re.compile(r'\s*\{(?:[^{}]|\{[^{}]*\})*\}')
+    # \newcommand{\href}, \renewcommand*\href, \def\href ... in a preamble, and the comments to skip
+    COMMAND_DEFINITION = re.compile(r'\\(?:(?:re|provide)?newcommand\*?|def|let)\s*\{?\s*(\\[A-Za-z@]+)')
+    COMMENT = re.compile(r'(?<!\\)%[^\n]*')
+
+    @classmethod
+    def check(cls, latex: str, unicode_engine: bool = False, preamble: Optional[str] = None) -> List[LaTeXIssue]:
+        """
+        Issues in the document body, empty when it looks compilable. preamble
+        is the template's own, for latex rendered against a format without it.
+        """
+        start = latex.find(r'\begin{document}')
+        if start < 0:
+            return [cls._issue(latex, len(latex), 'environment', r"missing \begin{document}")]
+        verbatim_commands = cls.verbatim_url_commands(latex[:start] if preamble is None else preamble)
+
+        issues: List[Tuple[int, str, str]] = []
+        braces: List[int] = []
+        environments: List[Tuple[str, int]] = []
+        math_start: Optional[int] = None
+
+        tokens = cls.UNICODE_TOKENS if unicode_engine else cls.TOKENS
+        match = tokens.search(latex, start)
+        while match is not None:
+            token = match.group()
+            position = match.start()
+            first = token[0]
+            resume_at = match.end()
+
+            if first == '\\':
+                if token in verbatim_commands:
+                    # hyperref reads the URL argument verbatim, % and # included
+                    url = cls.URL_ARGUMENT.match(latex, resume_at)
+                    if url is not None:
+                        resume_at = url.end()
+                elif token in ('\\begin', '\\end'):
+                    name = cls.ENVIRONMENT_NAME.match(latex, match.end())
+                    if name is None:
+                        issues.append((position, 'environment', f"{token} without an environment name"))
+                    elif token == '\\begin':
+                        environments.append((name.group(1), position))
+                    elif not environments or environments[-1][0] != name.group(1):
+                        expected = f", expected \\end{{{environments[-1][0]}}}" if environments else ""
+                        issues.append((position, 'environment', f"unexpected \\end{{{name.group(1)}}}{expected}"))
+                    else:
+                        environments.pop()
+                        if name.group(1) == 'document':
+                            break
+                elif token in ('\\(', '\\['):
+                    math_start = position
+                elif token in ('\\)', '\\]'):
+                    math_start = None
+            elif first == '%':
+                pass
+            elif first == '{':
+                braces.append(position)
+            elif first == '}':
+                if braces:
+                    braces.pop()
+                else:
+                    issues.append((position, 'brace', "unmatched }"))
+            elif first == '$':
+                math_start = position if math_start is None else None
+            elif first == '#':
+                issues.append((position, 'special', "unescaped #"))
+            elif first == '&':
+                if not any(env in cls.ALIGNMENT_ENVIRONMENTS for env, _ in environments):
+                    issues.append((position, 'special', "unescaped & outside a table"))
+            elif first in '_^':
+                if math_start is None:
+                    issues.append((position, 'special', f"unescaped {first} outside math"))
+            else:
+                issues.append((position, 'unicode', f"character U+{ord(first):04X} cannot be typeset"))
+
+            if len(issues) >= cls.MAX_ISSUES:
+                break
+            match = tokens.search(latex, resume_at)
+        else:
+            issues.append((len(latex), 'environment', r"missing \end{document}"))
+
+        if len(issues) < cls.MAX_ISSUES:
+            issues.extend((position, 'brace', "unclosed {") for position in braces)
+            if math_start is not None:
+                issues.append((math_start, 'math', "math mode is never closed"))
+            issues.extend(
+                (position, 'environment', f"\\begin{{{name}}} is never closed")
+                for name, position in environments if name != 'document'
+            )
+        return [cls._issue(latex, position, kind, message) for position, kind, message in issues[:cls.MAX_ISSUES]]
+
+    @classmethod
+    def validate(cls, latex: str, resume: Optional[ResumeDocument] = None, unicode_engine: bool = False,
+                 preamble: Optional[str] = None):
+        """Raise LaTeXValidationError, naming the resume fields at fault, if the body would not compile"""
+        issues = cls.check(latex, unicode_engine, preamble)
+        if not issues:
+            return
+        if resume is not None:
+            issues = cls.locate_fields(issues, latex, resume, unicode_engine)
+        raise LaTeXValidationError(issues)
+
+    @classmethod
+    @lru_cache(maxsize=64)
+    def verbatim_url_commands(cls, preamble: str) -> frozenset:
+        """
+        URL commands whose argument is read verbatim, per template preamble. A
+        template that defines its own (e.g. \\newcommand{\\href}[2]{#2} in place
+        of hyperref) takes the URL as an ordinary macro argument, where braces,
+        % and # are checked like the rest of the body.
+        """
+        return cls.URL_COMMANDS - set(cls.COMMAND_DEFINITION.findall(cls.COMMENT.sub('', preamble)))
+
+    @classmethod
+    def locate_fields(cls, issues: List[LaTeXIssue], latex: str, resume: ResumeDocument,
+                      unicode_engine: bool = False) -> List[LaTeXIssue]:
+        """Attach the resume field whose text covers (or ends at) each issue, found by searching its line"""
+        escape = escape_latex_unicode if unicode_engine else escape_latex
+        values = [
+            (path, rendered)
+            for path, value in _fields(resume.to_dict())
+            for rendered in {value, escape(value)}
+        ]
+        lines = latex.split('\n')
+
+        located = []
+        for issue in issues:
+            text = lines[issue.line - 1] if issue.line <= len(lines) else ""
+            column = issue.column - 1
+            best = None
+            for path, rendered in values:
+                found = text.find(rendered)
+                while found >= 0:
+                    # Unbalanced input usually surfaces on the character just after it
+                    if found <= column <= found + len(rendered) and (best is None or len(rendered) > best[1]):
+                        best = (path, len(rendered))
+                    found = text.find(rendered, found + 1)
+            if best is None and issue.kind == 'brace':
+                # The brace may be matched inside the value and left open around it
+                best = next(((path, 0) for path, rendered in values if rendered in text and _unbalanced(rendered)), None)
+            located.append(issue._replace(field=best[0]) if best else issue)
+        return located
+
+    @staticmethod
+    def _issue(latex: str, position: int, kind: str, message: str) -> LaTeXIssue:
+        line = latex.count('\n', 0, position) + 1
+        column = position - (latex.rfind('\n', 0, position) + 1) + 1
+        return LaTeXIssue(kind, message, line, column)
+
+
+def _fields(value: Any, path: str = "") -> Iterator[Tuple[str, str]]:
+    """(path, text) for every non-empty string in a plain resume document"""
+    if isinstance(value, str):
+        if value:
+            yield path, value
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            yield from _fields(item, f"{path}.{key}" if path else key)
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _fields(item, f"{path}[{index}]")
+
+
+def _unbalanced(text: str) -> bool:
+    """Whether text has more unescaped { than } or the other way round"""
+    opened = text.count('{') - text.count('\\{')
+    closed = text.count('}') - text.count('\\}')
+    return opened != closed
@@ -0,0 +1,247 @@
+"""LaTeX Worker Pool - Keeps pre-started pdflatex processes warm for compile_latex"""
+
+import atexit
+import errno
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import settings
+from .latex_sandbox import CompileLimits, LaTeXSandbox
+from .latex_workspaces import workspace_root
+
+logger = logging.getLogger(__name__)
+
+
+class LaTeXWorker:
+    """
+    A work directory with a pdflatex process that has already read the preamble.
+
+    The driver file ``resume.tex`` holds the template preamble followed by a
+    primitive ``\\input`` of ``body.tex``, which is a named pipe. A warm process
+    loads the format and every package, then blocks on the pipe until a job
+    writes the document body into it. Each pdflatex process still compiles a
+    single document; the worker respawns the next one after every job.
+    """
+
+    DRIVER_FILE = "resume.tex"
+    BODY_FILE = "body.tex"
+    JOB_OUTPUTS = ("resume.pdf", "resume.aux", "resume.log", "resume.out", LaTeXSandbox.OUTPUT_FILE)
+
+    def __init__(self, preamble: str, command: List[str], env: Optional[Dict[str, str]],
+                 support_files: Dict[str, bytes], limits: CompileLimits):
+        self.preamble = preamble
+        self.command = command
+        self.env = env
+        self.limits = limits
+        self.jobs = 0
+        self.workdir = Path(tempfile.mkdtemp(prefix="resuai-latex-", dir=workspace_root()))
+        self.process: Optional[subprocess.Popen] = None
+
+        for name, data in support_files.items():
+            (self.workdir / name).write_bytes(data)
+
+        driver = f"{preamble}\n\\csname @@input\\endcsname {self.BODY_FILE}\n"
+        (self.workdir / self.DRIVER_FILE).write_text(driver, encoding='utf-8')
+        os.mkfifo(self.workdir / self.BODY_FILE)
+
+    def spawn(self):
+        """Start a pdflatex process that reads the preamble and waits for the body"""
+        self.process = LaTeXSandbox.spawn(self.command + [self.DRIVER_FILE], self.workdir, self.env, self.limits)
+
+    def run(self, body: str, timeout: float) -> subprocess.CompletedProcess:
+        """Feed the document body to the warm process and wait for it to finish"""
+        if self.process is None:
+            self.spawn()
+
+        process, self.process = self.process, None
+        deadline = time.monotonic() + timeout
+        try:
+            try:
+                self._write_body(process, body.encode('utf-8'), deadline)
+            except BaseException:
+                # e.g. the render was cancelled; never leave pdflatex running
+                process.kill()
+                process.wait()
+                raise
+            # The warm process counts its preamble against the job's limits too
+            return LaTeXSandbox.wait(process, self.workdir, self.limits, deadline)
+        except subprocess.TimeoutExpired:
+            raise subprocess.TimeoutExpired(process.args, timeout)
+
+    def _write_body(self, process: subprocess.Popen, data: bytes, deadline: float):
+        """Write the body into the pipe once pdflatex has opened it for reading"""
+        path = self.workdir / self.BODY_FILE
+        while True:
+            try:
+                fd = os.open(path, os.O_WRONLY | os.O_NONBLOCK)
+                break
+            except OSError as e:
+                if e.errno != errno.ENXIO:
+                    raise
+            # No reader yet: pdflatex is still loading the preamble, or it died on it
+            if process.poll() is not None:
+                return
+            if time.monotonic() > deadline:
+                raise subprocess.TimeoutExpired(process.args, 0)
+            time.sleep(0.005)
+
+        os.set_blocking(fd, True)
+        try:
+            with os.fdopen(fd, 'wb') as pipe:
+                pipe.write(data)
+                if not data.endswith(b'\n'):
+                    pipe.write(b'\n')
+        except BrokenPipeError:
+            # pdflatex stopped reading, e.g. it halted on an error in the body
+            pass
+
+    def reset(self):
+        """Remove the previous job's outputs and start the next warm process"""
+        for name in self.JOB_OUTPUTS:
+            try:
+                (self.workdir / name).unlink()
+            except FileNotFoundError:
+                pass
+        self.spawn()
+
+    def close(self):
+        """Stop the warm process and delete the work directory"""
+        if self.process is not None:
+            self.process.kill()
+            self.process.wait()
+            self.process = None
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class LaTeXWorkerPool:
+    """
+    Bounded pool of warm LaTeX workers keyed by preamble and engine command.
+
+    ``size`` caps the number of workers (busy and idle) in this process and a
+    worker is recycled after ``max_jobs`` compiles. When every worker is busy,
+    ``checkout`` returns None and the caller compiles cold instead of queueing.
+    """
+
+    _instance: Optional["LaTeXWorkerPool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, size: int, max_jobs: int):
+        self.size = size
+        self.max_jobs = max_jobs
+        self._idle: "OrderedDict[int, LaTeXWorker]" = OrderedDict()
+        self._busy: Dict[int, LaTeXWorker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls) -> Optional["LaTeXWorkerPool"]:
+        """Return the process-wide pool, or None when it is disabled"""
+        if settings.LATEX_POOL_SIZE <= 0 or not hasattr(os, 'mkfifo'):
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(settings.LATEX_POOL_SIZE, settings.LATEX_POOL_MAX_JOBS)
+                atexit.register(cls.shutdown_pool)
+            return cls._instance
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Stop all warm workers"""
+        with cls._instance_lock:
+            pool, cls._instance = cls._instance, None
+        if pool is not None:
+            pool.close()
+
+    def checkout(self, preamble: str, command: List[str], env: Optional[Dict[str, str]] = None,
+                 support_files: Optional[Dict[str, bytes]] = None,
+                 limits: Optional[CompileLimits] = None) -> Optional[LaTeXWorker]:
+        """Take a worker for this preamble, creating or evicting one if needed"""
+        limits = limits or CompileLimits.from_settings()
+        evicted = None
+        with self._lock:
+            worker = self._take_idle(preamble, command, limits)
+            if worker is None:
+                if len(self._idle) + len(self._busy) >= self.size:
+                    if not self._idle:
+                        return None
+                    # Rebind the least recently used idle worker's slot
+                    _, evicted = self._idle.popitem(last=False)
+                worker = self._create(preamble, command, env, support_files, limits)
+            if worker is not None:
+                self._busy[id(worker)] = worker
+
+        if evicted is not None:
+            evicted.close()
+        return worker
+
+    def release(self, worker: LaTeXWorker):
+        """Return a worker after a job, recycling it once it has served max_jobs"""
+        worker.jobs += 1
+        if worker.jobs >= self.max_jobs:
+            logger.info(f"Recycling LaTeX worker after {worker.jobs} jobs")
+            self._drop(worker)
+            return
+
+        try:
+            worker.reset()
+        except OSError as e:
+            logger.warning(f"Could not restart LaTeX worker: {e}")
+            self._drop(worker)
+            return
+
+        with self._lock:
+            self._busy.pop(id(worker), None)
+            self._idle[id(worker)] = worker
+
+    def prewarm(self, preamble: str, command: List[str], env: Optional[Dict[str, str]] = None,
+                support_files: Optional[Dict[str, bytes]] = None, limits: Optional[CompileLimits] = None):
+        """Start an idle worker for a preamble if the pool has room"""
+        with self._lock:
+            if len(self._idle) + len(self._busy) >= self.size:
+                return
+            worker = self._create(preamble, command, env, support_files, limits or CompileLimits.from_settings())
+            if worker is None:
+                return
+            try:
+                worker.spawn()
+            except OSError as e:
+                logger.warning(f"Could not start LaTeX worker: {e}")
+                worker.close()
+                return
+            self._idle[id(worker)] = worker
+
+    def close(self):
+        """Stop every worker"""
+        with self._lock:
+            workers = list(self._idle.values()) + list(self._busy.values())
+            self._idle.clear()
+            self._busy.clear()
+        for worker in workers:
+            worker.close()
+
+    def _drop(self, worker: LaTeXWorker):
+        with self._lock:
+            self._busy.pop(id(worker), None)
+        worker.close()
+
+    def _take_idle(self, preamble: str, command: List[str], limits: CompileLimits) -> Optional[LaTeXWorker]:
+        for key, worker in self._idle.items():
+            if worker.preamble == preamble and worker.command == command and worker.limits == limits:
+                del self._idle[key]
+                return worker
+        return None
+
+    def _create(self, preamble: str, command: List[str], env: Optional[Dict[str, str]],
+                support_files: Optional[Dict[str, bytes]], limits: CompileLimits) -> Optional[LaTeXWorker]:
+        try:
+            return LaTeXWorker(preamble, command, env, support_files or {}, limits)
+        except OSError as e:
+            logger.warning(f"Could not create LaTeX worker: {e}")
+            return None
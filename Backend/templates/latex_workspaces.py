@@ -0,0 +1,143 @@
+"""LaTeX Workspaces - Reusable compile directories on a RAM-backed filesystem"""
+
+import atexit
+import logging
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Preferred home for work directories: tmpfs on Linux, so compiles never touch the disk
+RAM_DIRECTORIES = ("/dev/shm",)
+
+
+def workspace_root() -> Path:
+    """Directory compile work directories are created in"""
+    if settings.LATEX_WORKSPACE_DIR:
+        root = Path(settings.LATEX_WORKSPACE_DIR)
+        root.mkdir(parents=True, exist_ok=True)
+        return root
+    for directory in RAM_DIRECTORIES:
+        if os.path.isdir(directory) and os.access(directory, os.W_OK):
+            return Path(directory)
+    return Path(tempfile.gettempdir())
+
+
+class LaTeXWorkspace:
+    """
+    A work directory reused across cold compiles.
+
+    Support files are symlinked in the first time a job needs them and stay
+    for later jobs; everything else is the job's own and is removed by
+    ``reset`` before the directory goes back to the pool.
+    """
+
+    SOURCE_FILE = "resume.tex"
+
+    def __init__(self, root: Path):
+        self.workdir = Path(tempfile.mkdtemp(prefix="resuai-tex-", dir=root))
+        self.links: Dict[str, Path] = {}
+
+    def prepare(self, latex_content: str, support_files: Dict[str, Path]):
+        """Write the job's source and link any support files not linked yet"""
+        for name, target in support_files.items():
+            if self.links.get(name) == target:
+                continue
+            link = self.workdir / name
+            if link.is_symlink() or link.exists():
+                link.unlink()
+            try:
+                link.symlink_to(target)
+            except OSError:
+                # No symlinks (e.g. Windows without developer mode): copy it instead
+                shutil.copyfile(target, link)
+            self.links[name] = target
+        (self.workdir / self.SOURCE_FILE).write_text(latex_content, encoding='utf-8')
+
+    def reset(self):
+        """Remove everything the last job wrote, keeping the support file links"""
+        with os.scandir(self.workdir) as entries:
+            for entry in entries:
+                if entry.name in self.links:
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                else:
+                    os.unlink(entry.path)
+
+    def close(self):
+        """Delete the work directory"""
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class LaTeXWorkspacePool:
+    """
+    Work directories for cold compiles, created on first use and reused.
+
+    Up to ``size`` idle workspaces are kept. A checkout never waits: when
+    none is idle a new one is created, and surplus ones are deleted on
+    release, so parallel compiles each get their own directory.
+    """
+
+    _instance: Optional["LaTeXWorkspacePool"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, size: int, root: Path):
+        self.size = size
+        self.root = root
+        self._idle: List[LaTeXWorkspace] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls) -> Optional["LaTeXWorkspacePool"]:
+        """Return the process-wide pool, or None when reuse is disabled"""
+        if settings.LATEX_WORKSPACES <= 0:
+            return None
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(settings.LATEX_WORKSPACES, workspace_root())
+                atexit.register(cls.shutdown_pool)
+            return cls._instance
+
+    @classmethod
+    def shutdown_pool(cls):
+        """Delete every idle workspace"""
+        with cls._instance_lock:
+            pool, cls._instance = cls._instance, None
+        if pool is not None:
+            pool.close()
+
+    def checkout(self) -> LaTeXWorkspace:
+        """An idle workspace, or a new one if all are in use"""
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return LaTeXWorkspace(self.root)
+
+    def release(self, workspace: LaTeXWorkspace):
+        """Clean a workspace after its job and keep it if the pool has room"""
+        try:
+            workspace.reset()
+        except OSError as e:
+            logger.warning(f"Could not clean LaTeX workspace {workspace.workdir}: {e}")
+            workspace.close()
+            return
+        with self._lock:
+            if len(self._idle) < self.size:
+                self._idle.append(workspace)
+                return
+        workspace.close()
+
+    def close(self):
+        """Delete every idle workspace"""
+        with self._lock:
+            workspaces, self._idle = self._idle, []
+        for workspace in workspaces:
+            workspace.close()
+
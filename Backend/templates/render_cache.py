@@ -0,0 +1,144 @@
+"""Render Cache - Content-addressed cache for rendered resume PDFs"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class RenderCache:
+    """
+    Two-tier cache of rendered documents keyed by a hash of their inputs.
+
+    The memory tier is an LRU bounded by total bytes; the optional disk tier
+    keeps entries across restarts and between uvicorn workers. Entries never
+    go stale because the key covers everything that affects the output.
+    """
+
+    _instance: Optional["RenderCache"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def get_cache(cls) -> "RenderCache":
+        """Return the process-wide cache"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(settings.RENDER_CACHE_MAX_BYTES, settings.RENDER_CACHE_DIR)
+            return cls._instance
+
+    @staticmethod
+    def make_key(kind: str, template_name: str, theme_color: str,
+                 resume_data: Dict[str, Any], renderer_version: str) -> str:
+        """Hash the render inputs; resume_data is canonicalised so key order does not matter"""
+        canonical = json.dumps(
+            [kind, template_name, (theme_color or "").lower(), resume_data, renderer_version],
+            sort_keys=True,
+            separators=(',', ':'),
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Look a key up in memory, then on disk"""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+
+        data = self._read_disk(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+        self._put_memory(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store a rendered document in both tiers"""
+        self._put_memory(key, data)
+        self._write_disk(key, data)
+
+    def clear(self):
+        """Drop the memory tier"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the health endpoint"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def _put_memory(self, key: str, data: bytes):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+
+    def _disk_path(self, key: str) -> Path:
+        return self.disk_dir / key[:2] / key
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        if self.disk_dir is None:
+            return None
+        try:
+            return self._disk_path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Render cache read failed: {e}")
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        if self.disk_dir is None:
+            return
+        path = self._disk_path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so concurrent readers never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Render cache write failed: {e}")
@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT, TA_JUSTIFY
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class RenderCVClassicTemplate(BaseTemplate):
@@ -24,40 +25,41 @@ class RenderCVClassicTemplate(BaseTemplate):
         """Classic margins"""
         return (1.0, 1.0, 1.0, 1.0)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header - Classic centered style with name and location
-        personal_info = resume_data.get('personal_info', {})
+        personal_info = resume.personal_info
         
         # Name
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], styles['name']))
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, styles['name']))
         
         # Location on separate line below name
-        if personal_info.get('location'):
-            elements.append(Paragraph(personal_info['location'], styles['location']))
+        if personal_info.location:
+            elements.append(Paragraph(personal_info.location, styles['location']))
         
         elements.append(Spacer(1, 0.1*inch))
         
         # Contact info line - email, phone, links ALL on one line
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('website'):
-            website = personal_info['website']
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.website:
+            website = personal_info.website
             display = website.replace('https://', '').replace('http://', '').replace('www.', '')
             contact_parts.append(display)
-        if personal_info.get('linkedin'):
-            linkedin = personal_info['linkedin']
+        if personal_info.linkedin:
+            linkedin = personal_info.linkedin
             display = linkedin.replace('https://', '').replace('http://', '').replace('www.', '').replace('linkedin.com/in/', '')
             contact_parts.append(f'linkedin.com/in/{display}')
-        if personal_info.get('github'):
-            github = personal_info['github']
+        if personal_info.github:
+            github = personal_info.github
             display = github.replace('https://', '').replace('http://', '').replace('www.', '').replace('github.com/', '')
             contact_parts.append(f'github.com/{display}')
         
@@ -71,31 +73,26 @@ class RenderCVClassicTemplate(BaseTemplate):
                                   spaceAfter=10, spaceBefore=6))
         
         # Objective/Summary
-        if resume_data.get('summary') or resume_data.get('objective'):
+        if resume.profile:
             elements.append(Paragraph('Summary', styles['section']))
-            summary = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary, styles['justified']))
+            elements.append(Paragraph(resume.profile, styles['justified']))
             elements.append(Spacer(1, 0.12*inch))
         
         # Education - First in academic style
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('Education', styles['section']))
             
-            for edu in resume_data['education']:
+            for edu in resume.education:
                 # Institution
-                elements.append(Paragraph(edu.get('institution', 'Institution'), styles['item_title']))
+                elements.append(Paragraph(edu.institution or 'Institution', styles['item_title']))
                 
                 # Degree and field
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = edu.get('degree', 'Degree')
+                field = edu.field
+                degree_text = edu.degree or 'Degree'
                 if field:
                     degree_text += f", {field}"
                 
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+                date_text = edu.dates()
                 
                 # Create two-column layout
                 if date_text:
@@ -113,23 +110,22 @@ class RenderCVClassicTemplate(BaseTemplate):
                 else:
                     elements.append(Paragraph(f"<i>{degree_text}</i>", styles['item_subtitle']))
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['body']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['body']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('Experience', styles['section']))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Position
-                elements.append(Paragraph(exp.get('position', 'Position'), styles['item_title']))
+                elements.append(Paragraph(exp.position or 'Position', styles['item_title']))
                 
                 # Company and dates
-                company = exp.get('company', 'Company')
-                date_range = f"{exp.get('start_date', '')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                company = exp.company or 'Company'
+                date_range = exp.period()
                 
                 exp_table = Table([
                     [Paragraph(f"<i>{company}</i>", styles['item_subtitle']),
@@ -144,75 +140,63 @@ class RenderCVClassicTemplate(BaseTemplate):
                 elements.append(exp_table)
                 
                 # Description
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", styles['body']))
-                    else:
-                        elements.append(Paragraph(description, styles['justified']))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", styles['body']))
+                if exp.description:
+                    elements.append(Paragraph(exp.description, styles['justified']))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", styles['body']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Publications (if available)
-        if resume_data.get('publications'):
+        if resume.publications:
             elements.append(Paragraph('Publications', styles['section']))
-            for pub in resume_data['publications']:
-                pub_text = f"{pub.get('authors', '')}, \"{pub.get('title', '')}\", <i>{pub.get('venue', '')}</i>, {pub.get('year', '')}"
+            for pub in resume.publications:
+                pub_text = f"{pub.authors}, \"{pub.title}\", <i>{pub.venue}</i>, {pub.year}"
                 elements.append(Paragraph(pub_text, styles['body']))
                 elements.append(Spacer(1, 0.05*inch))
         
         # Research/Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('Projects', styles['section']))
             
-            for proj in resume_data['projects']:
-                elements.append(Paragraph(proj.get('name', 'Project'), styles['item_title']))
+            for proj in resume.projects:
+                elements.append(Paragraph(proj.name or 'Project', styles['item_title']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], styles['justified']))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, styles['justified']))
                 
-                if proj.get('technologies'):
-                    tech_text = f"<i>Technologies:</i> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"<i>Technologies:</i> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, styles['tech']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Skills
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('Skills', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_text = f"<b>{category}:</b> {', '.join(items)}"
-                        elements.append(Paragraph(skill_text, styles['body']))
-            else:
-                elements.append(Paragraph(', '.join(skills), styles['body']))
+            for group in resume.skills:
+                if group.category:
+                    skill_text = f"<b>{group.category}:</b> {group.text}"
+                    elements.append(Paragraph(skill_text, styles['body']))
+                else:
+                    elements.append(Paragraph(group.text, styles['body']))
             
             elements.append(Spacer(1, 0.08*inch))
         
         # Honors & Awards
-        if resume_data.get('certifications') or resume_data.get('awards'):
+        if resume.certifications or resume.awards:
             elements.append(Paragraph('Honors & Awards', styles['section']))
             
-            if resume_data.get('awards'):
-                for award in resume_data['awards']:
+            if resume.awards:
+                for award in resume.awards:
                     elements.append(Paragraph(f"• {award}", styles['body']))
             
-            if resume_data.get('certifications'):
-                for cert in resume_data['certifications']:
-                    cert_text = f"• {cert.get('name', 'Certification')} - {cert.get('issuer', 'Issuer')}"
-                    if cert.get('date'):
-                        cert_text += f" ({cert['date']})"
+            if resume.certifications:
+                for cert in resume.certifications:
+                    cert_text = f"• {cert.name or 'Certification'} - {cert.issuer or 'Issuer'}"
+                    if cert.date:
+                        cert_text += f" ({cert.date})"
                     elements.append(Paragraph(cert_text, styles['body']))
         
         doc.build(elements)
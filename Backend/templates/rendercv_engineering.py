@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class RenderCVEngineeringTemplate(BaseTemplate):
@@ -24,28 +25,29 @@ class RenderCVEngineeringTemplate(BaseTemplate):
         """Balanced margins"""
         return (0.6, 0.6, 0.7, 0.7)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'].upper(), styles['name']))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name.upper(), styles['name']))
         
         # Contact - Single line
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
-        if personal_info.get('linkedin'):
-            contact_parts.append(personal_info['linkedin'].split('/')[-1])
-        if personal_info.get('github'):
-            contact_parts.append(f"github.com/{personal_info['github'].split('/')[-1]}")
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
+        if personal_info.linkedin:
+            contact_parts.append(personal_info.linkedin.split('/')[-1])
+        if personal_info.github:
+            contact_parts.append(f"github.com/{personal_info.github.split('/')[-1]}")
         
         if contact_parts:
             elements.append(Paragraph(' | '.join(contact_parts), styles['contact']))
@@ -54,45 +56,38 @@ class RenderCVEngineeringTemplate(BaseTemplate):
                                   spaceAfter=10, spaceBefore=6))
         
         # Technical Skills - FIRST for engineering
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('TECHNICAL SKILLS', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
+            if resume.skills[0].category:
                 # Create table for clean layout
-                skill_data = []
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_data.append([
-                            Paragraph(f"<b>{category}</b>", styles['skill_cat']),
-                            Paragraph(', '.join(items), styles['skill_items'])
-                        ])
-                
-                if skill_data:
-                    skill_table = Table(skill_data, colWidths=[1.3*inch, 5.2*inch])
-                    skill_table.setStyle(TableStyle([
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 8),
-                        ('TOPPADDING', (0, 0), (-1, -1), 2),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
-                    ]))
-                    elements.append(skill_table)
+                skill_data = [
+                    [Paragraph(f"<b>{group.category}</b>", styles['skill_cat']),
+                     Paragraph(group.text, styles['skill_items'])]
+                    for group in resume.skills
+                ]
+                skill_table = Table(skill_data, colWidths=[1.3*inch, 5.2*inch])
+                skill_table.setStyle(TableStyle([
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 8),
+                    ('TOPPADDING', (0, 0), (-1, -1), 2),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+                ]))
+                elements.append(skill_table)
             else:
-                elements.append(Paragraph(', '.join(skills), styles['body']))
+                elements.append(Paragraph(resume.skills[0].text, styles['body']))
             
             elements.append(Spacer(1, 0.1*inch))
         
         # Professional Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('PROFESSIONAL EXPERIENCE', styles['section']))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Company and Position
-                company_position = f"<b>{exp.get('company', 'Company')}</b> — {exp.get('position', 'Position')}"
-                date_range = f"{exp.get('start_date', '')} – {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                company_position = f"<b>{exp.company or 'Company'}</b> — {exp.position or 'Position'}"
+                date_range = exp.period(' – ')
                 
                 exp_header = Table([
                     [Paragraph(company_position, styles['exp_title']),
@@ -107,66 +102,54 @@ class RenderCVEngineeringTemplate(BaseTemplate):
                 elements.append(exp_header)
                 
                 # Location if available
-                if exp.get('location'):
-                    elements.append(Paragraph(f"<i>{exp['location']}</i>", styles['location']))
+                if exp.location:
+                    elements.append(Paragraph(f"<i>{exp.location}</i>", styles['location']))
                 
                 # Achievements - Engineering focus on metrics
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", styles['bullet']))
-                    else:
-                        elements.append(Paragraph(f"• {description}", styles['bullet']))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", styles['bullet']))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", styles['bullet']))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", styles['bullet']))
                 
                 elements.append(Spacer(1, 0.1*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', styles['section']))
             
-            for proj in resume_data['projects']:
-                proj_name = proj.get('name', 'Project')
+            for proj in resume.projects:
+                proj_name = proj.name or 'Project'
                 
                 # Project name with tech stack
-                if proj.get('technologies'):
-                    proj_header = f"<b>{proj_name}</b> | <i>{', '.join(proj['technologies'])}</i>"
+                if proj.technologies:
+                    proj_header = f"<b>{proj_name}</b> | <i>{', '.join(proj.technologies)}</i>"
                 else:
                     proj_header = f"<b>{proj_name}</b>"
                 
                 elements.append(Paragraph(proj_header, styles['proj_title']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(f"• {proj['description']}", styles['bullet']))
+                if proj.description:
+                    elements.append(Paragraph(f"• {proj.description}", styles['bullet']))
                 
-                if proj.get('url'):
-                    elements.append(Paragraph(f"URL: {proj['url']}", styles['url']))
+                if proj.url:
+                    elements.append(Paragraph(f"URL: {proj.url}", styles['url']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', styles['section']))
             
-            for edu in resume_data['education']:
-                institution = edu.get('institution', 'Institution')
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree = edu.get('degree', 'Degree')
+            for edu in resume.education:
+                institution = edu.institution or 'Institution'
+                field = edu.field
+                degree = edu.degree or 'Degree'
                 
                 degree_text = f"<b>{institution}</b> — {degree}"
                 if field:
                     degree_text += f", {field}"
                 
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} – {edu.get('end_date', '')}"
-                    if date_range.strip() != '–':
-                        date_text = date_range
+                date_text = edu.dates(' – ')
                 
                 if date_text:
                     edu_header = Table([
@@ -183,23 +166,22 @@ class RenderCVEngineeringTemplate(BaseTemplate):
                 else:
                     elements.append(Paragraph(degree_text, styles['exp_title']))
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['body']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['body']))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', styles['section']))
             
             cert_items = []
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b>"
-                if cert.get('issuer'):
-                    cert_text += f" — {cert['issuer']}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b>"
+                if cert.issuer:
+                    cert_text += f" — {cert.issuer}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 cert_items.append(cert_text)
             
             for cert_text in cert_items:
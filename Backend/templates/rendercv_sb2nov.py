@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class RenderCVSb2novTemplate(BaseTemplate):
@@ -24,26 +25,27 @@ class RenderCVSb2novTemplate(BaseTemplate):
         """Tight margins for max content"""
         return (0.4, 0.4, 0.5, 0.5)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header - Compact
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], styles['name']))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, styles['name']))
         
         # Contact - Very compact, single line
         contact_parts = []
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('linkedin'):
-            contact_parts.append(personal_info['linkedin'].split('/')[-1])
-        if personal_info.get('github'):
-            contact_parts.append(personal_info['github'].split('/')[-1])
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.linkedin:
+            contact_parts.append(personal_info.linkedin.split('/')[-1])
+        if personal_info.github:
+            contact_parts.append(personal_info.github.split('/')[-1])
         
         if contact_parts:
             elements.append(Paragraph(' · '.join(contact_parts), styles['contact']))
@@ -58,19 +60,15 @@ class RenderCVSb2novTemplate(BaseTemplate):
         elements.append(sep_table)
         
         # Education - Top priority in sb2nov style
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('Education', styles['section']))
             
-            for edu in resume_data['education']:
-                institution = edu.get('institution', 'Institution')
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree = edu.get('degree', 'Degree')
+            for edu in resume.education:
+                institution = edu.institution or 'Institution'
+                field = edu.field
+                degree = edu.degree or 'Degree'
                 
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')} -- {edu.get('end_date', '')}"
-                    if date_range.strip() != '--':
-                        date_text = date_range
+                date_text = edu.dates(' -- ')
                 
                 # Institution and Date
                 edu_row1 = Table([
@@ -89,22 +87,21 @@ class RenderCVSb2novTemplate(BaseTemplate):
                 degree_gpa = f"{degree}"
                 if field:
                     degree_gpa += f" in {field}"
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    degree_gpa += f"; GPA: {gpa}"
+                if edu.gpa:
+                    degree_gpa += f"; GPA: {edu.gpa}"
                 
                 elements.append(Paragraph(degree_gpa, styles['item_detail']))
                 elements.append(Spacer(1, 0.06*inch))
         
         # Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('Experience', styles['section']))
             
-            for exp in resume_data['experience']:
-                company = exp.get('company', 'Company')
-                position = exp.get('position', 'Position')
-                date_range = f"{exp.get('start_date', '')} -- {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
-                location = exp.get('location', '')
+            for exp in resume.experience:
+                company = exp.company or 'Company'
+                position = exp.position or 'Position'
+                date_range = exp.period(' -- ')
+                location = exp.location
                 
                 # Company and Location/Date
                 exp_row1 = Table([
@@ -133,39 +130,34 @@ class RenderCVSb2novTemplate(BaseTemplate):
                 elements.append(exp_row2)
                 
                 # Achievements - Very compact
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description[:4]:  # Limit to 4 bullets for space
-                            if item:
-                                elements.append(Paragraph(f"• {item}", styles['bullet']))
-                    else:
-                        elements.append(Paragraph(f"• {description}", styles['bullet']))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", styles['bullet']))
+                for item in exp.highlights[:4]:  # Limit to 4 bullets for space
+                    elements.append(Paragraph(f"• {item}", styles['bullet']))
                 
-                if exp.get('achievements'):
-                    for achievement in exp['achievements'][:3]:  # Limit
-                        elements.append(Paragraph(f"• {achievement}", styles['bullet']))
+                for achievement in exp.achievements[:3]:  # Limit
+                    elements.append(Paragraph(f"• {achievement}", styles['bullet']))
                 
                 elements.append(Spacer(1, 0.06*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('Projects', styles['section']))
             
-            for proj in resume_data['projects']:
-                proj_name = proj.get('name', 'Project')
+            for proj in resume.projects:
+                proj_name = proj.name or 'Project'
                 
                 # Project with tech stack inline
-                if proj.get('technologies'):
-                    proj_header = f"<b>{proj_name}</b> | {', '.join(proj['technologies'][:5])}"  # Limit tech stack
+                if proj.technologies:
+                    proj_header = f"<b>{proj_name}</b> | {', '.join(proj.technologies[:5])}"  # Limit tech stack
                 else:
                     proj_header = f"<b>{proj_name}</b>"
                 
                 elements.append(Paragraph(proj_header, styles['item_bold']))
                 
-                if proj.get('description'):
+                if proj.description:
                     # Keep description short
-                    desc = proj['description']
+                    desc = proj.description
                     if len(desc) > 200:
                         desc = desc[:197] + '...'
                     elements.append(Paragraph(f"• {desc}", styles['bullet']))
@@ -173,45 +165,38 @@ class RenderCVSb2novTemplate(BaseTemplate):
                 elements.append(Spacer(1, 0.05*inch))
         
         # Technical Skills - Compact table format
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('Technical Skills', styles['section']))
-            skills = resume_data['skills']
             
-            if skills and isinstance(skills[0], dict):
-                skill_rows = []
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_rows.append([
-                            Paragraph(f"<b>{category}:</b>", styles['skill_label']),
-                            Paragraph(', '.join(items), styles['skill_value'])
-                        ])
-                
-                if skill_rows:
-                    skill_table = Table(skill_rows, colWidths=[1.2*inch, 6*inch])
-                    skill_table.setStyle(TableStyle([
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 0),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 5),
-                        ('TOPPADDING', (0, 0), (-1, -1), 1),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-                    ]))
-                    elements.append(skill_table)
+            if resume.skills[0].category:
+                skill_rows = [
+                    [Paragraph(f"<b>{group.category}:</b>", styles['skill_label']),
+                     Paragraph(group.text, styles['skill_value'])]
+                    for group in resume.skills
+                ]
+                skill_table = Table(skill_rows, colWidths=[1.2*inch, 6*inch])
+                skill_table.setStyle(TableStyle([
+                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 0),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 5),
+                    ('TOPPADDING', (0, 0), (-1, -1), 1),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+                ]))
+                elements.append(skill_table)
             else:
-                elements.append(Paragraph(', '.join(skills), styles['item_detail']))
+                elements.append(Paragraph(resume.skills[0].text, styles['item_detail']))
             
             elements.append(Spacer(1, 0.05*inch))
         
         # Certifications - Very compact
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('Certifications', styles['section']))
             
             cert_list = []
-            for cert in resume_data['certifications']:
-                cert_str = cert.get('name', 'Certification')
-                if cert.get('issuer'):
-                    cert_str += f" ({cert['issuer']})"
+            for cert in resume.certifications:
+                cert_str = cert.name or 'Certification'
+                if cert.issuer:
+                    cert_str += f" ({cert.issuer})"
                 cert_list.append(cert_str)
             
             # All on one line if possible
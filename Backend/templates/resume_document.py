@@ -0,0 +1,302 @@
+"""Resume Document - Normalised, read-only resume data shared by every renderer"""
+
+import re
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Dict, Hashable, Mapping, Tuple, Union
+
+
+def _text(value: Any) -> str:
+    """Missing and null values become empty strings"""
+    if value is None:
+        return ""
+    return value if isinstance(value, str) else str(value)
+
+
+def _lines(value: Any) -> Tuple[str, ...]:
+    """A string or list of strings as a tuple of non-empty lines"""
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(_text(item) for item in value if item)
+
+
+def _bullets(value: Any) -> Tuple[str, ...]:
+    """Like _lines, but a string is split into items on its "•" bullet characters"""
+    if isinstance(value, str):
+        return tuple(item.strip() for item in value.split('•') if item.strip())
+    return _lines(value)
+
+
+def _rebuild(cls, values):
+    record = object.__new__(cls)
+    for name, value in zip(cls.__slots__, values):
+        object.__setattr__(record, name, MappingProxyType(value) if isinstance(value, dict) else value)
+    return record
+
+
+class _Record:
+    """Slotted record that cannot be changed once built"""
+
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            object.__setattr__(self, name, values[name])
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __reduce__(self):
+        # Records cross the render process pool; mapping proxies cannot be pickled
+        values = tuple(getattr(self, name) for name in self.__slots__)
+        return _rebuild, (type(self), tuple(dict(v) if isinstance(v, MappingProxyType) else v for v in values))
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain JSON-compatible form, used for cache keys"""
+        return {name: _plain(getattr(self, name)) for name in self.__slots__}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, _Record):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+
+class PersonalInfo(_Record):
+    __slots__ = ('name', 'email', 'phone', 'location', 'linkedin', 'github', 'website', 'portfolio')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "PersonalInfo":
+        return cls(**{name: _text(data.get(name)) for name in cls.__slots__})
+
+    @property
+    def linkedin_handle(self) -> str:
+        """LinkedIn profile without scheme, www. and linkedin.com/in/"""
+        return strip_url(self.linkedin, 'linkedin.com/in/')
+
+    @property
+    def github_handle(self) -> str:
+        """GitHub profile without scheme, www. and github.com/"""
+        return strip_url(self.github, 'github.com/')
+
+
+class Experience(_Record):
+    """
+    ``description`` holds a prose description; a description given as a list
+    becomes ``highlights`` instead, with empty items dropped.
+    """
+
+    __slots__ = ('position', 'company', 'location', 'start_date', 'end_date', 'current',
+                 'description', 'highlights', 'achievements')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Experience":
+        description = data.get('description')
+        return cls(
+            position=_text(data.get('position')),
+            company=_text(data.get('company')),
+            location=_text(data.get('location')),
+            start_date=_text(data.get('start_date')),
+            end_date=_text(data.get('end_date')),
+            current=bool(data.get('current')),
+            description=description if isinstance(description, str) else "",
+            highlights=_lines(description) if isinstance(description, (list, tuple)) else (),
+            achievements=_lines(data.get('achievements')),
+        )
+
+    @property
+    def points(self) -> Tuple[str, ...]:
+        """The description as bullet points: its list items, or the prose description as one item"""
+        return self.highlights or ((self.description,) if self.description else ())
+
+    @property
+    def end_text(self) -> str:
+        """End date, or "Present" for current and open-ended positions"""
+        return "Present" if self.current or not self.end_date else self.end_date
+
+    def period(self, separator: str = " - ", present: str = "Present") -> str:
+        end = present if self.current or not self.end_date else self.end_date
+        return f"{self.start_date}{separator}{end}"
+
+
+class Education(_Record):
+    __slots__ = ('institution', 'degree', 'field', 'location', 'start_date', 'end_date',
+                 'graduation_date', 'gpa', 'description', 'coursework')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Education":
+        return cls(
+            institution=_text(data.get('institution')),
+            degree=_text(data.get('degree')),
+            field=_text(data.get('field_of_study') or data.get('field')),
+            location=_text(data.get('location')),
+            start_date=_text(data.get('start_date')),
+            end_date=_text(data.get('end_date')),
+            graduation_date=_text(data.get('graduation_date')),
+            gpa=_text(data.get('gpa') or data.get('grade')),
+            description=_text(data.get('description')),
+            coursework=_text(data.get('coursework')),
+        )
+
+    def dates(self, separator: str = " - ") -> str:
+        """Graduation date, else the start/end range, else an empty string"""
+        if self.graduation_date:
+            return self.graduation_date
+        if self.start_date or self.end_date:
+            return f"{self.start_date}{separator}{self.end_date}"
+        return ""
+
+
+class Project(_Record):
+    __slots__ = ('name', 'description', 'technologies', 'url', 'start_date', 'end_date', 'highlights')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Project":
+        return cls(
+            name=_text(data.get('name')),
+            description=_text(data.get('description')),
+            technologies=_lines(data.get('technologies')),
+            url=_text(data.get('url')),
+            start_date=_text(data.get('start_date')),
+            end_date=_text(data.get('end_date')),
+            highlights=_bullets(data.get('highlights')),
+        )
+
+
+class Certification(_Record):
+    __slots__ = ('name', 'issuer', 'date', 'url', 'credential_id')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Certification":
+        return cls(**{name: _text(data.get(name)) for name in cls.__slots__})
+
+
+class Publication(_Record):
+    __slots__ = ('authors', 'title', 'venue', 'year')
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Publication":
+        return cls(**{name: _text(data.get(name)) for name in cls.__slots__})
+
+
+class SkillGroup(_Record):
+    """A labelled skill category; skills given as a plain list form one group with no category"""
+
+    __slots__ = ('category', 'items')
+
+    @property
+    def text(self) -> str:
+        return ", ".join(self.items)
+
+
+class ResumeDocument(_Record):
+    """
+    The resume as every renderer sees it.
+
+    Build one with ResumeDocument.of(data): it accepts the raw resume dict
+    (or an existing document) and resolves the alternative shapes the API
+    allows once, so renderers only deal with a single one.
+    """
+
+    __slots__ = ('personal_info', 'summary', 'objective', 'experience', 'education', 'projects',
+                 'certifications', 'skills', 'languages', 'awards', 'publications', 'custom_sections')
+
+    @classmethod
+    def of(cls, resume_data: Union["ResumeDocument", Mapping[str, Any]]) -> "ResumeDocument":
+        if isinstance(resume_data, ResumeDocument):
+            return resume_data
+        return cls.from_dict(resume_data or {})
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "ResumeDocument":
+        return cls(
+            personal_info=PersonalInfo.from_dict(data.get('personal_info') or {}),
+            summary=_text(data.get('summary')),
+            objective=_text(data.get('objective')),
+            experience=tuple(Experience.from_dict(item) for item in data.get('experience') or ()),
+            education=tuple(Education.from_dict(item) for item in data.get('education') or ()),
+            projects=tuple(Project.from_dict(item) for item in data.get('projects') or ()),
+            certifications=tuple(Certification.from_dict(item) for item in data.get('certifications') or ()),
+            skills=_skill_groups(data.get('skills') or ()),
+            languages=_lines(data.get('languages')),
+            awards=_lines(data.get('awards')),
+            publications=tuple(Publication.from_dict(item) for item in data.get('publications') or ()),
+            custom_sections=MappingProxyType(dict(data.get('custom_sections') or {})),
+        )
+
+    @property
+    def profile(self) -> str:
+        """Summary, or the objective when there is no summary"""
+        return self.summary or self.objective
+
+
+def _skill_groups(skills) -> Tuple[SkillGroup, ...]:
+    if skills and isinstance(skills[0], Mapping):
+        # Categories without a name or items have nothing to show
+        groups = (
+            SkillGroup(category=_text(group.get('category')), items=_lines(group.get('items')))
+            for group in skills
+        )
+        return tuple(group for group in groups if group.category and group.items)
+    items = _lines(skills)
+    return (SkillGroup(category="", items=items),) if items else ()
+
+
+def strip_url(url: str, *prefixes: str) -> str:
+    """Drop the scheme, a leading www. and any of the given host/path prefixes from a URL"""
+    url = re.sub(r'^https?://', '', url or '')
+    if url.startswith('www.'):
+        url = url[4:]
+    for prefix in prefixes:
+        url = url.replace(prefix, '')
+    return url
+
+
+class ResumeDocumentCache:
+    """Normalised documents keyed by (resume id, version), so repeat exports skip normalisation"""
+
+    MAX_ENTRIES = 512
+
+    _documents: "OrderedDict[Hashable, ResumeDocument]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, resume: Mapping[str, Any]) -> ResumeDocument:
+        """Document for a stored resume (a Mongo document with _id, version and data)"""
+        resume_id = resume.get('_id')
+        if resume_id is None:
+            return ResumeDocument.of(resume.get('data') or {})
+
+        # Resumes stored before versioning have none; their first update $inc's it to 1
+        key = (str(resume_id), resume.get('version', 0))
+        with cls._lock:
+            document = cls._documents.get(key)
+            if document is not None:
+                cls._documents.move_to_end(key)
+                return document
+
+        document = ResumeDocument.of(resume.get('data') or {})
+        with cls._lock:
+            cls._documents[key] = document
+            while len(cls._documents) > cls.MAX_ENTRIES:
+                cls._documents.popitem(last=False)
+        return document
@@ -0,0 +1,62 @@
+"""Style Registry - ReportLab paragraph styles built once per template and theme colour"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+from reportlab.lib.styles import ParagraphStyle
+
+from config import settings
+
+
+class StyleRegistry:
+    """
+    Process-wide LRU of stylesheets keyed by (template, theme colour).
+
+    Stylesheets are shared between renders, so callers must treat the returned
+    mapping and its ParagraphStyle objects as read-only; derive a new style
+    with ``ParagraphStyle(name, parent=...)`` instead of changing one.
+    """
+
+    _styles: "OrderedDict[Tuple[str, Optional[str]], Mapping[str, ParagraphStyle]]" = OrderedDict()
+    _lock = threading.Lock()
+    hits = 0
+    misses = 0
+
+    @classmethod
+    def get(cls, template_key: str, theme_color: Optional[str],
+            factory: Callable[[], Dict[str, ParagraphStyle]]) -> Mapping[str, ParagraphStyle]:
+        """
+        Stylesheet for a template, calling factory only on the first use of this colour.
+
+        Pass theme_color=None for stylesheets that do not depend on the theme.
+        """
+        key = (template_key, theme_color.lower() if theme_color else None)
+        with cls._lock:
+            styles = cls._styles.get(key)
+            if styles is not None:
+                cls._styles.move_to_end(key)
+                cls.hits += 1
+                return styles
+
+        # Built outside the lock; a concurrent miss just builds an identical copy
+        styles = MappingProxyType(factory())
+        with cls._lock:
+            cls.misses += 1
+            cls._styles[key] = styles
+            while len(cls._styles) > settings.STYLE_CACHE_SIZE:
+                cls._styles.popitem(last=False)
+        return styles
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._styles.clear()
+            cls.hits = 0
+            cls.misses = 0
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        with cls._lock:
+            return {'entries': len(cls._styles), 'hits': cls.hits, 'misses': cls.misses}
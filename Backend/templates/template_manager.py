@@ -1,15 +1,34 @@
 """Template Manager - Centralized template selection and generation"""
 
+import asyncio
+import threading
+import time
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple, Union
 from .latex_template_processor import LaTeXTemplateProcessor
+from .latex_engines import LaTeXEngineRegistry
+from .latex_validator import LaTeXValidationError
+from .render_cache import RenderCache
+from .resume_document import ResumeDocument
+from .auto_cv import AutoCVTemplate
+from .anti_cv import AntiCVTemplate
+from .ethan_template import EthanTemplate
 from .yuan_template import YuanTemplate  # Fallback for yuan
 from .rendercv_classic import RenderCVClassicTemplate  # Python-based fallback
+from utils.circuit_breaker import CircuitBreaker
+from utils.pdf_optimizer import optimize_pdf
 
 
 class TemplateManager:
     """Manages all resume templates"""
     
+    # Bump whenever template output changes so cached renders are not reused
+    RENDERER_VERSION = "4"
+    
+    # One breaker per LaTeX template, created on first use
+    _breakers: Dict[str, CircuitBreaker] = {}
+    _breakers_lock = threading.Lock()
+    
     TEMPLATES = {
         'auto_cv': {
             'name': 'Auto CV',
@@ -18,7 +37,8 @@ class TemplateManager:
             'icon': '🤖',
             'category': 'Modern',
             'ats_friendly': True,
-            'preview_image': '/templates/auto_cv.png'
+            'preview_image': '/templates/auto_cv.png',
+            'reportlab_class': AutoCVTemplate
         },
         'anti_cv': {
             'name': 'Anti CV',
@@ -27,7 +47,8 @@ class TemplateManager:
             'icon': '🎨',
             'category': 'Creative',
             'ats_friendly': False,
-            'preview_image': '/templates/anti_cv.png'
+            'preview_image': '/templates/anti_cv.png',
+            'reportlab_class': AntiCVTemplate
         },
         'ethan': {
             'name': 'Ethan\'s Resume',
@@ -36,7 +57,8 @@ class TemplateManager:
             'icon': '💼',
             'category': 'Professional',
             'ats_friendly': True,
-            'preview_image': '/templates/ethan.png'
+            'preview_image': '/templates/ethan.png',
+            'reportlab_class': EthanTemplate
         },
         'rendercv_classic': {
             'name': 'RenderCV Classic',
@@ -56,27 +78,165 @@ class TemplateManager:
             'category': 'Executive',
             'ats_friendly': True,
             'preview_image': '/templates/yuan.png',
+            'reportlab_class': YuanTemplate
         },
     }
     
     @classmethod
-    def generate_resume(cls, resume_data: Dict[str, Any], template_name: str = "auto_cv", 
-                       theme_color: str = "#3B82F6") -> BytesIO:
-        """Generate a resume using the specified template"""
+    def generate_resume(cls, resume_data: Union[ResumeDocument, Dict[str, Any]], template_name: str = "auto_cv", 
+                       theme_color: str = "#3B82F6", optimize: bool = False) -> BytesIO:
+        """
+        Generate a resume using the specified template, reusing a cached render of identical input.
+        With optimize the PDF goes through optimize_pdf before it is cached.
+        """
+        resume = ResumeDocument.of(resume_data)
+        cache = RenderCache.get_cache()
+        key = cls._cache_key(resume, template_name, theme_color, optimize)
+        pdf_bytes = cache.get(key)
+        if pdf_bytes is None:
+            breaker = cls._breaker(template_name)
+            use_latex = breaker.allow() if breaker else True
+            try:
+                pdf_bytes, seconds = cls._render_timed(resume, template_name, theme_color, use_latex, optimize)
+            except Exception:
+                if breaker and use_latex:
+                    breaker.record_failure()
+                raise
+            if breaker and use_latex:
+                breaker.record_success(seconds)
+            # Renders degraded by an open breaker are not cached
+            if use_latex:
+                cache.put(key, pdf_bytes)
+        return BytesIO(pdf_bytes)
+    
+    @classmethod
+    async def generate_resume_async(cls, resume_data: Union[ResumeDocument, Dict[str, Any]], template_name: str = "auto_cv",
+                                    theme_color: str = "#3B82F6", request=None, optimize: bool = False) -> BytesIO:
+        """Like generate_resume, but renders cache misses on the render executor"""
+        from utils.render_executor import RenderExecutor, RenderQueueFull, RenderCancelled, RenderTimeout
+        
+        # Normalised here, so the worker receives the document rather than re-parsing the dict
+        resume = ResumeDocument.of(resume_data)
+        cache = RenderCache.get_cache()
+        key = cls._cache_key(resume, template_name, theme_color, optimize)
+        pdf_bytes = cache.get(key)
+        if pdf_bytes is None:
+            breaker = cls._breaker(template_name)
+            use_latex = breaker.allow() if breaker else True
+            try:
+                pdf_bytes, seconds = await RenderExecutor.run(
+                    cls._render_timed, resume, template_name, theme_color, use_latex, optimize, request=request
+                )
+            except (RenderQueueFull, RenderCancelled, asyncio.CancelledError):
+                # Not the template's doing: the render was refused, cancelled or cut short by shutdown
+                if breaker and use_latex:
+                    breaker.abandon()
+                raise
+            except RenderTimeout as e:
+                # Only time spent rendering on a worker counts against the template
+                if breaker and use_latex:
+                    if e.seconds:
+                        breaker.record_failure()
+                    else:
+                        breaker.abandon()
+                raise
+            except Exception:
+                if breaker and use_latex:
+                    breaker.record_failure()
+                raise
+            if breaker and use_latex:
+                breaker.record_success(seconds)
+            if use_latex:
+                cache.put(key, pdf_bytes)
+        return BytesIO(pdf_bytes)
+    
+    @classmethod
+    def _cache_key(cls, resume: ResumeDocument, template_name: str, theme_color: str, optimize: bool = False) -> str:
+        """Render cache key; installed TeX engines count as part of the renderer"""
+        renderer_version = f"{cls.RENDERER_VERSION}/{LaTeXEngineRegistry.fingerprint()}"
+        kind = 'pdf-optimized' if optimize else 'pdf'
+        return RenderCache.make_key(kind, template_name, theme_color, resume.to_dict(), renderer_version)
+    
+    @classmethod
+    def _breaker(cls, template_name: str) -> Optional[CircuitBreaker]:
+        """Breaker guarding the LaTeX path of a template, None if it does not compile LaTeX"""
+        if template_name not in cls.TEMPLATES:
+            template_name = 'auto_cv'
+        if 'fallback_class' in cls.TEMPLATES[template_name]:
+            return None
+        if not LaTeXTemplateProcessor.has_source(template_name):
+            return None
+        if not LaTeXEngineRegistry.is_available(LaTeXTemplateProcessor.get_engine(template_name)):
+            return None
+        with cls._breakers_lock:
+            if template_name not in cls._breakers:
+                cls._breakers[template_name] = CircuitBreaker(f"latex:{template_name}")
+            return cls._breakers[template_name]
+    
+    @classmethod
+    def breaker_stats(cls) -> Dict[str, Dict[str, object]]:
+        """Circuit breaker state per LaTeX template, for the health endpoint"""
+        with cls._breakers_lock:
+            breakers = dict(cls._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+    
+    @classmethod
+    def _render_timed(cls, resume_data: Union[ResumeDocument, Dict[str, Any]], template_name: str, theme_color: str,
+                      use_latex: bool, optimize: bool = False) -> Tuple[bytes, float]:
+        """Render (and optimize) and report how long it took, measured where the render runs"""
+        start = time.monotonic()
+        pdf_bytes = cls.render_resume(resume_data, template_name, theme_color, use_latex).getvalue()
+        if optimize:
+            pdf_bytes = optimize_pdf(pdf_bytes)
+        return pdf_bytes, time.monotonic() - start
+    
+    @classmethod
+    def render_resume(cls, resume_data: Union[ResumeDocument, Dict[str, Any]], template_name: str = "auto_cv", 
+                      theme_color: str = "#3B82F6", use_latex: bool = True) -> BytesIO:
+        """Render a resume with the specified template, bypassing the cache"""
         import logging
         logger = logging.getLogger(__name__)
         
+        if template_name not in cls.TEMPLATES:
+            template_name = 'auto_cv'
+        
         # Check if template has a fallback class (for templates without .tex files)
-        template_info = cls.TEMPLATES.get(template_name, cls.TEMPLATES['auto_cv'])
+        template_info = cls.TEMPLATES[template_name]
         if 'fallback_class' in template_info:
             logger.info(f"Using Python-based fallback template for {template_name}")
             template_class = template_info['fallback_class']
             template = template_class(theme_color=theme_color)
             return template.generate(resume_data)
         
+        # Templates without LaTeX of their own (yuan) would otherwise compile auto_cv's
+        if not LaTeXTemplateProcessor.has_source(template_name) and 'reportlab_class' in template_info:
+            logger.info(f"{template_name} has no LaTeX source, using its ReportLab template")
+            template = template_info['reportlab_class'](theme_color=theme_color)
+            return template.generate(resume_data)
+        
+        # Skip straight to the ReportLab version when the template's engine is missing
+        # or its circuit breaker is open
+        engine = LaTeXTemplateProcessor.get_engine(template_name)
+        if not use_latex and 'reportlab_class' in template_info:
+            logger.warning(f"LaTeX circuit open, using ReportLab template for {template_name}")
+            template = template_info['reportlab_class'](theme_color=theme_color)
+            return template.generate(resume_data)
+        if not LaTeXEngineRegistry.is_available(engine) and 'reportlab_class' in template_info:
+            logger.warning(f"{engine} is not available, using ReportLab template for {template_name}")
+            template = template_info['reportlab_class'](theme_color=theme_color)
+            return template.generate(resume_data)
+        
         # Use LaTeX template processor for templates with .tex files
         logger.info(f"Attempting LaTeX compilation for {template_name}")
-        return LaTeXTemplateProcessor.generate(resume_data, template_name, theme_color)
+        try:
+            return LaTeXTemplateProcessor.generate(resume_data, template_name, theme_color)
+        except LaTeXValidationError as e:
+            # The resume, not the template, is at fault: no failed compile, and ReportLab copes with any text
+            if 'reportlab_class' not in template_info:
+                raise
+            logger.warning(f"{e}, using ReportLab template for {template_name}")
+            template = template_info['reportlab_class'](theme_color=theme_color)
+            return template.generate(resume_data)
     
     @classmethod
     def list_templates(cls) -> list:
@@ -6,7 +6,8 @@ from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
 from .base_template import BaseTemplate
-from typing import Dict, Any
+from .resume_document import ResumeDocument
+from typing import Dict, Any, Union
 
 
 class YuanTemplate(BaseTemplate):
@@ -24,44 +25,43 @@ class YuanTemplate(BaseTemplate):
         """Generous margins for elegance"""
         return (0.8, 0.8, 0.8, 0.8)
     
-    def generate(self, resume_data: Dict[str, Any]):
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         doc = self.create_doc()
         elements = []
-        styles = self._create_styles()
+        styles = self.get_styles()
         
         # Header - Minimalist elegance
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], styles['name']))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, styles['name']))
         
         # Tagline or title if in summary
-        if resume_data.get('summary'):
-            summary = resume_data.get('summary', '')
-            # Use first sentence as tagline if short
-            if len(summary) < 100:
-                elements.append(Paragraph(summary, styles['tagline']))
+        # Use first sentence as tagline if short
+        if resume.summary and len(resume.summary) < 100:
+            elements.append(Paragraph(resume.summary, styles['tagline']))
         
         # Contact - Elegant layout
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
         
         if contact_parts:
             elements.append(Paragraph(' • '.join(contact_parts), styles['contact']))
         
         # Links
-        if personal_info.get('linkedin') or personal_info.get('github') or personal_info.get('website'):
+        if personal_info.linkedin or personal_info.github or personal_info.website:
             links = []
-            if personal_info.get('website'):
-                links.append(personal_info['website'].replace('https://', '').replace('http://', ''))
-            if personal_info.get('linkedin'):
-                links.append(f"LinkedIn: {personal_info['linkedin'].split('/')[-1]}")
-            if personal_info.get('github'):
-                links.append(f"GitHub: {personal_info['github'].split('/')[-1]}")
+            if personal_info.website:
+                links.append(personal_info.website.replace('https://', '').replace('http://', ''))
+            if personal_info.linkedin:
+                links.append(f"LinkedIn: {personal_info.linkedin.split('/')[-1]}")
+            if personal_info.github:
+                links.append(f"GitHub: {personal_info.github.split('/')[-1]}")
             
             elements.append(Paragraph(' • '.join(links), styles['links']))
         
@@ -70,17 +70,17 @@ class YuanTemplate(BaseTemplate):
                                   spaceAfter=12, spaceBefore=8, hAlign='CENTER'))
         
         # Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('Experience', styles['section']))
             elements.append(Spacer(1, 0.05*inch))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Position - Prominent
-                elements.append(Paragraph(exp.get('position', 'Position'), styles['role']))
+                elements.append(Paragraph(exp.position or 'Position', styles['role']))
                 
                 # Company and dates - Subtle
-                company = exp.get('company', 'Company')
-                date_range = f"{exp.get('start_date', '')}–{exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                company = exp.company or 'Company'
+                date_range = exp.period('–')
                 
                 company_date = Table([
                     [Paragraph(company, styles['company']),
@@ -97,42 +97,30 @@ class YuanTemplate(BaseTemplate):
                 elements.append(Spacer(1, 0.04*inch))
                 
                 # Achievements - Clean presentation
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"— {item}", styles['achievement']))
-                    else:
-                        elements.append(Paragraph(f"— {description}", styles['achievement']))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"— {achievement}", styles['achievement']))
+                if exp.description:
+                    elements.append(Paragraph(f"— {exp.description}", styles['achievement']))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"— {item}", styles['achievement']))
                 
                 elements.append(Spacer(1, 0.12*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('Education', styles['section']))
             elements.append(Spacer(1, 0.05*inch))
             
-            for edu in resume_data['education']:
+            for edu in resume.education:
                 # Degree and Field
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = edu.get('degree', 'Degree')
+                field = edu.field
+                degree_text = edu.degree or 'Degree'
                 if field:
                     degree_text += f" in {field}"
                 
                 elements.append(Paragraph(degree_text, styles['role']))
                 
                 # Institution and date
-                institution = edu.get('institution', 'Institution')
-                date_text = edu.get('graduation_date', '')
-                if not date_text:
-                    date_range = f"{edu.get('start_date', '')}–{edu.get('end_date', '')}"
-                    if date_range.strip() != '–':
-                        date_text = date_range
+                institution = edu.institution or 'Institution'
+                date_text = edu.dates('–')
                 
                 edu_info = Table([
                     [Paragraph(institution, styles['company']),
@@ -146,79 +134,73 @@ class YuanTemplate(BaseTemplate):
                 ]))
                 elements.append(edu_info)
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", styles['detail']))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", styles['detail']))
                 
                 elements.append(Spacer(1, 0.12*inch))
         
         # Skills - Elegant presentation
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('Expertise', styles['section']))
             elements.append(Spacer(1, 0.05*inch))
             
-            skills = resume_data['skills']
-            
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        # Elegant skill boxes
-                        skill_header = Paragraph(category, styles['skill_category'])
-                        elements.append(skill_header)
-                        
-                        skill_box = Table([[Paragraph(', '.join(items), styles['skill_items'])]], 
-                                        colWidths=[6*inch])
-                        skill_box.setStyle(TableStyle([
-                            ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
-                            ('LEFTPADDING', (0, 0), (-1, -1), 12),
-                            ('RIGHTPADDING', (0, 0), (-1, -1), 12),
-                            ('TOPPADDING', (0, 0), (-1, -1), 6),
-                            ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
-                            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ]))
-                        elements.append(skill_box)
-                        elements.append(Spacer(1, 0.06*inch))
-            else:
-                elements.append(Paragraph(', '.join(skills), styles['detail']))
+            for group in resume.skills:
+                if not group.category:
+                    elements.append(Paragraph(group.text, styles['detail']))
+                    continue
+                # Elegant skill boxes
+                skill_header = Paragraph(group.category, styles['skill_category'])
+                elements.append(skill_header)
+                
+                skill_box = Table([[Paragraph(group.text, styles['skill_items'])]], 
+                                colWidths=[6*inch])
+                skill_box.setStyle(TableStyle([
+                    ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#F8F9FA')),
+                    ('LEFTPADDING', (0, 0), (-1, -1), 12),
+                    ('RIGHTPADDING', (0, 0), (-1, -1), 12),
+                    ('TOPPADDING', (0, 0), (-1, -1), 6),
+                    ('BOTTOMPADDING', (0, 0), (-1, -1), 6),
+                    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+                ]))
+                elements.append(skill_box)
+                elements.append(Spacer(1, 0.06*inch))
             
             elements.append(Spacer(1, 0.08*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('Selected Projects', styles['section']))
             elements.append(Spacer(1, 0.05*inch))
             
-            for proj in resume_data['projects']:
-                proj_name = proj.get('name', 'Project')
+            for proj in resume.projects:
+                proj_name = proj.name or 'Project'
                 elements.append(Paragraph(proj_name, styles['role']))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], styles['detail']))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, styles['detail']))
                 
-                if proj.get('technologies'):
-                    tech_text = ', '.join(proj['technologies'])
+                if proj.technologies:
+                    tech_text = ', '.join(proj.technologies)
                     elements.append(Paragraph(tech_text, styles['tech_stack']))
                 
                 elements.append(Spacer(1, 0.1*inch))
         
         # Certifications & Awards
-        if resume_data.get('certifications') or resume_data.get('awards'):
+        if resume.certifications or resume.awards:
             elements.append(Paragraph('Recognitions', styles['section']))
             elements.append(Spacer(1, 0.05*inch))
             
-            if resume_data.get('awards'):
-                for award in resume_data['awards']:
+            if resume.awards:
+                for award in resume.awards:
                     elements.append(Paragraph(f"— {award}", styles['achievement']))
             
-            if resume_data.get('certifications'):
-                for cert in resume_data['certifications']:
-                    cert_text = f"— {cert.get('name', 'Certification')}"
-                    if cert.get('issuer'):
-                        cert_text += f", {cert['issuer']}"
-                    if cert.get('date'):
-                        cert_text += f" ({cert['date']})"
+            if resume.certifications:
+                for cert in resume.certifications:
+                    cert_text = f"— {cert.name or 'Certification'}"
+                    if cert.issuer:
+                        cert_text += f", {cert.issuer}"
+                    if cert.date:
+                        cert_text += f" ({cert.date})"
                     elements.append(Paragraph(cert_text, styles['achievement']))
         
         doc.build(elements)
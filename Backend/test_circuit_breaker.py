@@ -0,0 +1,78 @@
+"""
+Tests for the LaTeX circuit breaker
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.template_manager import TemplateManager
+from utils.circuit_breaker import CircuitBreaker
+from utils.render_executor import RenderExecutor, RenderQueueFull, RenderTimeout
+
+
+def make_breaker():
+    return CircuitBreaker('test', window=4, min_calls=2, failure_rate=0.5,
+                          slow_seconds=1.0, slow_rate=0.5, open_seconds=0.05)
+
+
+def test_opens_on_failures_and_probes_once():
+    """Failures open the breaker; after the cool-down a single probe is let through"""
+    breaker = make_breaker()
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert not breaker.allow()
+    breaker.record_success(0.1)
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_opens_on_slow_calls():
+    """Successful but slow renders also trip the breaker"""
+    breaker = make_breaker()
+    breaker.record_success(0.1)
+    breaker.record_success(2.0)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()['times_opened'] == 1
+
+
+def test_explicit_zero_overrides_the_setting():
+    """0 is a value, not a request for the default"""
+    breaker = CircuitBreaker('zero', min_calls=0, slow_seconds=0, open_seconds=0)
+    assert (breaker.min_calls, breaker.slow_seconds, breaker.open_seconds) == (0, 0, 0)
+
+    breaker.record_success(0.01)
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow()
+
+
+def test_only_renders_that_ran_count_against_the_template(monkeypatch):
+    """Renders refused or timed out before reaching a worker are abandoned, not recorded as failures"""
+    breaker = make_breaker()
+    monkeypatch.setattr(TemplateManager, '_breaker', classmethod(lambda cls, name: breaker))
+
+    def outcome(error):
+        async def run(*args, **kwargs):
+            raise error
+        monkeypatch.setattr(RenderExecutor, 'run', run)
+        with pytest.raises(type(error)):
+            asyncio.run(TemplateManager.generate_resume_async({'personal_info': {'name': 'Queued'}}, 'auto_cv'))
+
+    outcome(RenderQueueFull())
+    outcome(RenderTimeout())
+    assert breaker.stats()['calls'] == 0
+
+    ran = RenderTimeout()
+    ran.seconds = 90.0
+    outcome(ran)
+    assert breaker.stats()['calls'] == 1
@@ -0,0 +1,87 @@
+"""
+Tests for deterministic PDF output
+Identical input must give identical bytes, whichever renderer produced them
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from templates.latex_template_processor import LaTeXTemplateProcessor
+from templates.sample_data import get_sample_resume
+from templates.template_manager import TemplateManager
+from utils.pdf_generator import PDFGenerator
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Moves the wall clock a day forward for each render"""
+    import time
+    offset = [0]
+    real_time = time.time
+
+    def advance():
+        offset[0] += 86400
+    monkeypatch.setattr(time, 'time', lambda: real_time() + offset[0])
+    return advance
+
+
+def test_reportlab_output_is_byte_identical_across_runs(monkeypatch, clock):
+    """ReportLab templates and PDFGenerator give the same bytes on every render"""
+    monkeypatch.setattr(settings, 'DETERMINISTIC_PDF', True)
+    resume = get_sample_resume('full')
+
+    renders = []
+    for _ in range(2):
+        pdfs = [
+            template_info['reportlab_class']().generate(resume).getvalue()
+            for template_info in TemplateManager.TEMPLATES.values() if 'reportlab_class' in template_info
+        ]
+        pdfs.append(PDFGenerator().generate(resume).getvalue())
+        renders.append(pdfs)
+        clock()
+
+    assert renders[0] == renders[1]
+
+
+def test_latex_engines_get_a_fixed_source_date():
+    """The engine environment pins dates and the trailer ID is taken from the document"""
+    env = LaTeXTemplateProcessor._latex_env()
+    assert env['SOURCE_DATE_EPOCH'] == str(settings.PDF_SOURCE_DATE_EPOCH)
+
+    latex = '\\documentclass{article}\n\\begin{document}\nHi\n\\end{document}\n'
+    pinned = LaTeXTemplateProcessor._pin_trailer_id(latex)
+    assert pinned == LaTeXTemplateProcessor._pin_trailer_id(latex) != latex
+    assert '\\pdftrailerid{' in pinned
+
+
+@pytest.mark.skipif(shutil.which('pdflatex') is None, reason="pdflatex is not installed")
+def test_latex_output_is_byte_identical_across_runs(monkeypatch):
+    """Two compiles of the same resume, in different work directories, give the same bytes"""
+    monkeypatch.setattr(settings, 'DETERMINISTIC_PDF', True)
+    resume = get_sample_resume('full')
+    first = LaTeXTemplateProcessor.generate(resume, 'anti_cv').getvalue()
+    second = LaTeXTemplateProcessor.generate(resume, 'anti_cv').getvalue()
+    assert first == second
+
+
+def test_optimized_pdf_is_smaller_and_stays_deterministic(monkeypatch):
+    """optimize_pdf shrinks a render without changing its pages, and gives the same bytes every time"""
+    fitz = pytest.importorskip('fitz')
+    from utils.pdf_optimizer import optimize_pdf
+
+    monkeypatch.setattr(settings, 'DETERMINISTIC_PDF', True)
+    pdf = PDFGenerator().generate(get_sample_resume('full')).getvalue()
+    optimized = optimize_pdf(pdf)
+
+    assert len(optimized) < len(pdf)
+    assert optimized == optimize_pdf(pdf)
+    with fitz.open(stream=pdf, filetype='pdf') as before, fitz.open(stream=optimized, filetype='pdf') as after:
+        assert [page.get_text() for page in before] == [page.get_text() for page in after]
+    assert optimize_pdf(b'not a pdf') == b'not a pdf'
@@ -0,0 +1,91 @@
+"""
+Tests for DOCX export
+"""
+
+import io
+import os
+import sys
+import zipfile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from docx import Document
+
+from templates.sample_data import get_sample_resume
+from templates.template_manager import TemplateManager
+from utils.docx_generator import DOCXBaseDocuments, DOCXTemplates, generate_docx_resume, render_docx_body
+from utils.docx_package import iter_docx_package
+
+
+def test_every_template_has_a_docx_look():
+    """DOCX styles are keyed by TemplateManager ids, unknown ids fall back to auto_cv"""
+    assert set(DOCXTemplates.TEMPLATES) == set(TemplateManager.TEMPLATES)
+    assert DOCXTemplates.resolve('modern') == 'auto_cv'
+
+
+def test_styles_come_from_the_template_not_the_runs():
+    """Section headings take font and colour from the template's style; runs carry no formatting"""
+    buffer = generate_docx_resume(get_sample_resume('full'), 'rendercv_classic', '#10B981')
+    document = Document(buffer)
+
+    heading = document.styles['Heading 2']
+    assert heading.font.name == 'Times New Roman'
+    assert str(heading.font.color.rgb) == '000000'
+    assert all(run._r.rPr is None for paragraph in document.paragraphs for run in paragraph.runs)
+
+
+def test_reused_base_gives_identical_documents():
+    """A base document lent to a second export leaves nothing of the first behind"""
+    DOCXBaseDocuments.clear()
+    resume = get_sample_resume('full')
+    first = generate_docx_resume(get_sample_resume('minimal'), 'ethan', '#3B82F6')
+    second = generate_docx_resume(resume, 'ethan', '#3B82F6')
+    DOCXBaseDocuments.clear()
+    fresh = generate_docx_resume(resume, 'ethan', '#3B82F6')
+
+    def body(buffer):
+        return zipfile.ZipFile(buffer).read('word/document.xml')
+
+    assert body(second) == body(fresh) != body(first)
+
+
+def test_streamed_package_matches_saved_document():
+    """The streamed archive is valid and holds the same parts as python-docx would save"""
+    resume = get_sample_resume('full')
+    saved = zipfile.ZipFile(generate_docx_resume(resume, 'yuan', '#8B5CF6'))
+    chunks = list(iter_docx_package(render_docx_body(resume, 'yuan', '#8B5CF6'), 'yuan', '#8B5CF6'))
+    streamed = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+
+    assert len(chunks) > 1
+    assert streamed.testzip() is None
+    assert streamed.namelist() == saved.namelist()
+    assert all(streamed.read(name) == saved.read(name) for name in saved.namelist())
+
+
+def test_consecutive_exports_share_nothing_but_the_base(monkeypatch):
+    """A base lent to one resume after another carries no paragraphs over; each colour has its own base"""
+    DOCXBaseDocuments.clear()
+    created = []
+    create = DOCXBaseDocuments._create.__func__
+    monkeypatch.setattr(DOCXBaseDocuments, '_create',
+                        classmethod(lambda cls, template, color: created.append(color.lower()) or create(cls, template, color)))
+
+    def texts(buffer):
+        return {paragraph.text for paragraph in Document(buffer).paragraphs if paragraph.text}
+
+    other = {'personal_info': {'name': 'Bo Other', 'email': 'bo@example.org'}, 'summary': 'A different person.'}
+    first = texts(generate_docx_resume(get_sample_resume('full'), 'auto_cv', '#3B82F6'))
+    second = texts(generate_docx_resume(other, 'auto_cv', '#3B82F6'))
+    assert created == ['#3b82f6']
+
+    only_in_first = first - texts(generate_docx_resume(other, 'auto_cv', '#3B82F6'))
+    assert only_in_first and not only_in_first & second
+    assert 'Bo Other' in second
+
+    green = Document(generate_docx_resume(other, 'auto_cv', '#10B981'))
+    assert created == ['#3b82f6', '#10b981']
+    assert str(green.styles['Heading 2'].font.color.rgb) == '10B981'
+    blue = Document(generate_docx_resume(other, 'auto_cv', '#3b82f6'))
+    assert str(blue.styles['Heading 2'].font.color.rgb) == '3B82F6'
+    assert created == ['#3b82f6', '#10b981']
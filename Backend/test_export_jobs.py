@@ -0,0 +1,136 @@
+"""
+Tests for queued export jobs
+"""
+
+import asyncio
+import os
+import sys
+import zipfile
+from io import BytesIO
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from utils import export_jobs
+from utils.export_jobs import ExportJobManager
+
+
+def test_oldest_results_expire_beyond_the_byte_cap(monkeypatch):
+    """Finished files over EXPORT_JOB_MAX_RESULT_BYTES are dropped oldest first and read as expired"""
+    async def render(resume, file_format, template=None):
+        return BytesIO(b'%' * 100)
+    monkeypatch.setattr(export_jobs, 'render_export_queued', render)
+    monkeypatch.setattr(settings, 'EXPORT_JOB_MAX_RESULT_BYTES', 250)
+    monkeypatch.setattr(settings, 'EXPORT_JOB_WORKERS', 1)
+
+    async def run():
+        ExportJobManager.start()
+        try:
+            jobs = [ExportJobManager.submit('user', {'_id': n, 'title': 'cv'}, 'pdf') for n in range(3)]
+            await ExportJobManager.queue.join()
+            return [ExportJobManager.get(job.id, 'user') for job in jobs], ExportJobManager.result_bytes
+        finally:
+            await ExportJobManager.shutdown()
+
+    (first, second, third), result_bytes = asyncio.run(run())
+    assert first is None
+    assert second.result and third.result
+    assert result_bytes == 200
+
+
+def stub_renders(monkeypatch, cancelled=None, slow=()):
+    """Replace rendering with '<id>:<template>' files; 'broken' fails and resumes in slow never finish"""
+    async def render(resume, file_format, template=None):
+        if template == 'broken':
+            raise RuntimeError("render failed")
+        if resume['_id'] in slow:
+            try:
+                await asyncio.sleep(30)
+            except asyncio.CancelledError:
+                cancelled.append(resume['_id'])
+                raise
+        return BytesIO(f"{resume['_id']}:{template}".encode())
+    monkeypatch.setattr(export_jobs, 'render_export_queued', render)
+
+
+def test_batch_archive_is_valid_and_lists_failures(monkeypatch):
+    """Every render gets its own entry, duplicate titles included; failures end up in errors.txt"""
+    stub_renders(monkeypatch)
+    resumes = [{'_id': 'aaaaaa111111', 'title': 'My CV'}, {'_id': 'bbbbbb222222', 'title': 'My CV'}]
+
+    async def collect():
+        return [chunk async for chunk in export_jobs.stream_batch_zip(resumes, ['auto_cv', 'broken'], 'pdf')]
+
+    archive = zipfile.ZipFile(BytesIO(b''.join(asyncio.run(collect()))))
+    assert archive.testzip() is None
+    assert sorted(archive.namelist()) == ['My_CV_222222_auto_cv.pdf', 'My_CV_auto_cv.pdf', 'errors.txt']
+    assert {archive.read(name) for name in archive.namelist() if name.endswith('.pdf')} == {
+        b'aaaaaa111111:auto_cv', b'bbbbbb222222:auto_cv'
+    }
+    errors = archive.read('errors.txt').decode().splitlines()
+    assert sorted(errors) == ['My_CV_222222_broken.pdf: render failed', 'My_CV_broken.pdf: render failed']
+
+
+def test_closing_the_batch_stream_cancels_running_renders(monkeypatch):
+    """A client that goes away mid-archive stops the renders still in flight"""
+    cancelled = []
+    stub_renders(monkeypatch, cancelled=cancelled, slow={'slow1', 'slow2'})
+    monkeypatch.setattr(settings, 'EXPORT_BATCH_CONCURRENCY', 4)
+    resumes = [{'_id': 'fast', 'title': 'Fast'}, {'_id': 'slow1', 'title': 'Slow'}, {'_id': 'slow2', 'title': 'Slow'}]
+
+    async def read_first_entry():
+        stream = export_jobs.stream_batch_zip(resumes, [None], 'pdf')
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0)
+        return first
+
+    assert b'Fast_auto_cv.pdf' in asyncio.run(read_first_entry())
+    assert sorted(cancelled) == ['slow1', 'slow2']
+
+
+def test_batch_endpoint_checks_the_request_and_streams_the_archive(monkeypatch):
+    """Bad ids, unknown templates, oversized batches and other users' resumes are refused up front"""
+    from bson import ObjectId
+    from fastapi.testclient import TestClient
+
+    import main
+    from routes import auth
+
+    mine, theirs = ObjectId(), ObjectId()
+    stored = [{'_id': mine, 'user_id': 'u1', 'title': 'Mine'}, {'_id': theirs, 'user_id': 'u2', 'title': 'Theirs'}]
+
+    class Cursor:
+        def __init__(self, found):
+            self.found = found
+
+        async def to_list(self, length=None):
+            return self.found
+
+    class Resumes:
+        def find(self, query):
+            ids = set(query['_id']['$in'])
+            return Cursor([r for r in stored if r['_id'] in ids and r['user_id'] == query['user_id']])
+
+    class DB:
+        resumes = Resumes()
+
+    stub_renders(monkeypatch)
+    monkeypatch.setattr(main.Database, 'get_db', classmethod(lambda cls: DB()))
+    monkeypatch.setattr(settings, 'EXPORT_BATCH_MAX_ITEMS', 2)
+    monkeypatch.setitem(main.app.dependency_overrides, auth.get_current_user, lambda: {'_id': 'u1'})
+    client = TestClient(main.app)
+
+    def export(resume_ids, templates=()):
+        return client.post('/resume/export/batch', json={'resume_ids': resume_ids, 'templates': list(templates)})
+
+    assert export(['not-an-id']).status_code == 400
+    assert export([str(mine)], ['no_such_template']).status_code == 400
+    assert export([str(mine)], ['auto_cv', 'ethan', 'anti_cv']).status_code == 400
+    assert export([str(mine), str(theirs)]).status_code == 404
+
+    response = export([str(mine)], ['auto_cv', 'ethan'])
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/zip'
+    assert sorted(zipfile.ZipFile(BytesIO(response.content)).namelist()) == ['Mine_auto_cv.pdf', 'Mine_ethan.pdf']
@@ -0,0 +1,63 @@
+"""
+Tests for compiled LaTeX body templates
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.latex_body import LaTeXBodyTemplate, TemplateSyntaxError
+from templates.latex_template_processor import LaTeXTemplateProcessor
+from templates.resume_document import ResumeDocument
+
+TEMPLATE = r"""%! preamble: autocv.tex
+\section{\VAR{info.name or 'Your Name'}}
+\BLOCK{collect contacts}
+\BLOCK{if info.email}
+\href{mailto:\VAR{info.email}}{\VAR{info.email}}
+\BLOCK{endif}
+\BLOCK{if info.phone}
+\VAR{info.phone}
+\BLOCK{endif}
+\BLOCK{endcollect}
+\RAW{r' $|$ '.join(contacts)}
+%# Skills
+\BLOCK{for group in resume.skills}
+\item \VAR{group.text}\BLOCK{if group.category} (\VAR{group.category})\BLOCK{endif}
+\BLOCK{endfor}"""
+
+
+def test_body_template_renders_escaped_values():
+    """Values are escaped, raw output is not, and block-only lines leave no trace"""
+    body = LaTeXBodyTemplate('test', TEMPLATE)
+    resume = ResumeDocument.of({
+        'personal_info': {'name': 'A & B', 'email': 'a_b@c.com', 'phone': '555'},
+        'skills': [{'category': 'C#', 'items': ['50%']}],
+    })
+
+    assert body.metadata == {'preamble': 'autocv.tex'}
+    assert body.render(resume) == (
+        "\\section{A \\& B}\n"
+        "\\href{mailto:a\\_b@c.com}{a\\_b@c.com} $|$ 555\n"
+        "\\item 50\\% (C\\#)"
+    )
+    assert body.render(ResumeDocument.of({})) == "\\section{Your Name}\n"
+
+
+def test_body_template_errors_name_the_line():
+    """Unbalanced blocks and bad expressions fail at compile time"""
+    with pytest.raises(TemplateSyntaxError, match='bad:1'):
+        LaTeXBodyTemplate('bad', "\\BLOCK{if resume.summary}\n\\VAR{resume.summary}")
+    with pytest.raises(TemplateSyntaxError, match='bad:2'):
+        LaTeXBodyTemplate('bad', "ok\n\\VAR{resume.summary +}")
+
+
+def test_every_latex_template_has_a_body():
+    """Body templates register the preamble they are rendered with"""
+    for template_name, filename in LaTeXTemplateProcessor.TEMPLATE_FILES.items():
+        assert template_name in LaTeXTemplateProcessor.BODY_TEMPLATES
+        assert (LaTeXTemplateProcessor.TEMPLATES_DIR / filename).is_file()
@@ -0,0 +1,193 @@
+"""
+Tests for LaTeX source generation and compile bookkeeping
+These do not need a TeX installation
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.latex_engines import LaTeXEngineRegistry
+from templates.latex_escape import escape_latex, escape_latex_unicode
+from templates.latex_template_processor import LaTeXTemplateProcessor
+from templates.latex_validator import LaTeXValidationError, LaTeXValidator
+from templates.resume_document import ResumeDocument
+from templates.sample_data import get_sample_resume
+
+
+def test_theme_color_is_injected_after_frozen_preamble():
+    """The primaryColor line is moved out of the preamble and recoloured"""
+    template = LaTeXTemplateProcessor.get_template_path('rendercv_classic').read_text(encoding='utf-8')
+    latex = LaTeXTemplateProcessor.inject_resume_data(
+        template, get_sample_resume('full'), '#FF0000', 'rendercv_classic'
+    )
+    preamble, _, _ = latex.partition(r'\begin{document}')
+
+    assert preamble.count(r'\definecolor{primaryColor}') == 1
+    assert preamble.endswith('\\definecolor{primaryColor}{RGB}{255, 0, 0}\n')
+
+
+def test_escape_spells_out_text_pdflatex_cannot_typeset():
+    """Specials are escaped, Unicode becomes ASCII for pdfLaTeX and clean text is untouched"""
+    clean = 'Senior Engineer, Acme Corp'
+    assert escape_latex(clean) is clean
+    assert escape_latex('R&D 50% a_b <x>') == r'R\&D 50\% a\_b \textless{}x\textgreater{}'
+    assert escape_latex('José Müller – “Lead” …') == "Jos\\'{e} M\\\"{u}ller -- ``Lead'' \\ldots{}"
+    assert escape_latex('Straße 🚀') == 'Stra\\ss{}e '
+    assert escape_latex_unicode('José & “Lead”') == 'José \\& “Lead”'
+
+
+def test_format_mode_skips_frozen_preamble():
+    """Against a precompiled format only the colour and body are emitted"""
+    template = LaTeXTemplateProcessor.get_template_path('rendercv_classic').read_text(encoding='utf-8')
+    latex = LaTeXTemplateProcessor.inject_resume_data(
+        template, get_sample_resume('full'), '#3B82F6', 'rendercv_classic', format_name='rendercv_classic-test'
+    )
+
+    assert latex.startswith('\\endofdump\n\\definecolor{primaryColor}')
+    assert r'\documentclass' not in latex
+
+
+def test_format_name_changes_with_engine_version(monkeypatch):
+    """A TeX upgrade looks for a new format instead of loading one the new engine rejects"""
+    def format_name(version):
+        monkeypatch.setattr(LaTeXEngineRegistry, 'engines', {'pdflatex': {'available': True, 'version': version, 'path': None}})
+        return LaTeXTemplateProcessor._format_name('rendercv_classic', '\\documentclass{article}')
+
+    assert format_name('pdfTeX 3.141592653-2.6-1.40.25') == format_name('pdfTeX 3.141592653-2.6-1.40.25')
+    assert format_name('pdfTeX 3.141592653-2.6-1.40.25') != format_name('pdfTeX 3.141592653-2.6-1.40.26')
+
+
+def test_rerun_only_when_log_asks(tmp_path):
+    """A second pass is needed only for unresolved references"""
+    (tmp_path / 'resume.aux').write_text('\\relax \n')
+    (tmp_path / 'resume.log').write_text('Output written on resume.pdf\n')
+    assert not LaTeXTemplateProcessor._needs_rerun(tmp_path)
+
+    (tmp_path / 'resume.aux').write_text('\\relax \n\\newlabel{sec}{{1}{1}}\n')
+    (tmp_path / 'resume.log').write_text(
+        'LaTeX Warning: Label(s) may have changed. Rerun to get cross-references right.\n'
+    )
+    assert LaTeXTemplateProcessor._needs_rerun(tmp_path)
+
+
+def test_template_source_reloads_on_change(tmp_path, monkeypatch):
+    """Templates are parsed once and re-read only after the file changes"""
+    monkeypatch.setattr(LaTeXTemplateProcessor, 'TEMPLATES_DIR', tmp_path)
+    monkeypatch.setattr(LaTeXTemplateProcessor, '_sources', {})
+    (tmp_path / 'mystyle.sty').write_text('\\ProvidesPackage{mystyle}\n')
+    template = tmp_path / 'autocv.tex'
+    template.write_text('\\documentclass{article}\n\\usepackage{xcolor,mystyle}\n\\begin{document}\n\\end{document}\n')
+
+    source = LaTeXTemplateProcessor.load_template('auto_cv')
+    assert source.support_files == ('mystyle.sty',)
+    assert LaTeXTemplateProcessor.load_template('auto_cv') is source
+
+    template.write_text('\\documentclass{article}\n\\begin{document}\n\\end{document}\n')
+    os.utime(template, ns=(0, 0))
+    reloaded = LaTeXTemplateProcessor.load_template('auto_cv')
+    assert reloaded is not source
+    assert reloaded.support_files == ()
+
+
+def test_preflight_names_the_field_that_breaks_the_document():
+    """Unbalanced or unescaped input is reported against its resume field"""
+    resume = ResumeDocument.of({'personal_info': {'name': 'Ada', 'website': 'https://ada.dev/}'}})
+    source = LaTeXTemplateProcessor.load_template('anti_cv')
+    latex = LaTeXTemplateProcessor.render_template(source, resume, template_name='anti_cv')
+
+    with pytest.raises(LaTeXValidationError) as error:
+        LaTeXValidator.validate(latex, resume)
+    assert error.value.issues[0].kind == 'brace'
+    assert error.value.issues[0].field == 'personal_info.website'
+
+    clean = LaTeXTemplateProcessor.render_template(source, get_sample_resume('full'), template_name='anti_cv')
+    assert LaTeXValidator.check(clean) == []
+    assert [issue.kind for issue in LaTeXValidator.check('\\begin{document}\n$x & 50\\% \\end{itemize}\n')] == [
+        'special', 'environment', 'environment', 'math'
+    ]
+
+
+def test_preflight_checks_urls_of_templates_that_redefine_href():
+    """A URL is only skipped as verbatim where \\href is hyperref's; a macro argument is checked"""
+    body = '\\begin{document}\n\\href{https://ada.dev/#about}{site}\n\\end{document}\n'
+    hyperref = '\\documentclass{article}\n\\usepackage{hyperref}\n'
+    redefined = '\\documentclass{article}\n%\\usepackage{hyperref}\n\\newcommand{\\href}[2]{#2}\n'
+
+    assert LaTeXValidator.check(hyperref + body) == []
+    assert [issue.message for issue in LaTeXValidator.check(redefined + body)] == ['unescaped #']
+    # Against a format the rendered document has no preamble; the template's is passed in
+    assert LaTeXValidator.check('\\endofdump\n' + body, preamble=redefined)
+
+
+def test_preflight_failure_skips_the_engine(monkeypatch):
+    """Invalid LaTeX is rejected without spawning pdflatex"""
+    def compile_latex(*args, **kwargs):
+        raise AssertionError("compile_latex should not run")
+    monkeypatch.setattr(LaTeXTemplateProcessor, 'compile_latex', compile_latex)
+
+    with pytest.raises(LaTeXValidationError):
+        LaTeXTemplateProcessor.generate({'personal_info': {'github': 'https://github.com/{ada'}}, 'anti_cv')
+
+
+def test_compile_workspaces_are_reused_and_cleaned(tmp_path, monkeypatch):
+    """Cold compiles reuse a work directory, keeping support links and dropping job outputs"""
+    from config import settings
+    from templates.latex_engines import LaTeXEngineRegistry
+    from templates.latex_workspaces import LaTeXWorkspacePool
+
+    monkeypatch.setattr(settings, 'LATEX_POOL_SIZE', 0)
+    monkeypatch.setattr(LaTeXEngineRegistry, 'is_available', classmethod(lambda cls, engine: True))
+    monkeypatch.setattr(LaTeXWorkspacePool, '_instance', LaTeXWorkspacePool(1, tmp_path))
+    # Stands in for pdflatex: checks the linked style file and writes the outputs
+    engine = (
+        "import os, sys; assert os.path.islink('myresume.sty');"
+        "open('resume.aux', 'w').write('\\\\relax'); open('resume.pdf', 'wb').write(open(sys.argv[1], 'rb').read())"
+    )
+    monkeypatch.setattr(LaTeXTemplateProcessor, '_latex_command',
+                        classmethod(lambda cls, engine_name='pdflatex', format_name=None: [sys.executable, '-c', engine]))
+
+    first = LaTeXTemplateProcessor.compile_latex('first', support_files=('myresume.sty',))
+    second = LaTeXTemplateProcessor.compile_latex('second', support_files=('myresume.sty',))
+
+    assert (first.getvalue(), second.getvalue()) == (b'first', b'second')
+    [workdir] = tmp_path.iterdir()
+    assert sorted(path.name for path in workdir.iterdir()) == ['myresume.sty']
+
+
+def test_compile_that_exceeds_a_limit_is_reported(tmp_path):
+    """An engine stopped by an rlimit raises LaTeXResourceLimitError with its usage"""
+    pytest.importorskip('resource')
+    from templates.latex_sandbox import CompileLimits, LaTeXResourceLimitError, LaTeXSandbox
+
+    limits = CompileLimits(cpu_seconds=10, memory_mb=0, output_mb=1, open_files=64)
+    engine = [sys.executable, '-c', "open('resume.pdf', 'wb').write(b'x' * 2 * 1024 * 1024)"]
+    with pytest.raises(LaTeXResourceLimitError) as error:
+        LaTeXSandbox.run(engine, tmp_path, None, 10, limits)
+    assert error.value.limit == 'output size'
+    assert error.value.usage.cpu_seconds > 0
+
+    result = LaTeXSandbox.run([sys.executable, '-c', "print('ok')"], tmp_path, None, 10, limits)
+    assert (result.returncode, result.stdout.strip()) == (0, b'ok')
+
+
+def test_template_without_latex_source_never_compiles(monkeypatch):
+    """yuan has no .tex of its own, so it renders with ReportLab even when its engine is installed"""
+    from templates.latex_engines import LaTeXEngineRegistry
+    from templates.render_cache import RenderCache
+    from templates.template_manager import TemplateManager
+
+    def compile_latex(*args, **kwargs):
+        raise AssertionError("yuan reached compile_latex")
+    monkeypatch.setattr(LaTeXEngineRegistry, 'is_available', classmethod(lambda cls, engine: True))
+    monkeypatch.setattr(LaTeXTemplateProcessor, 'compile_latex', classmethod(compile_latex))
+    monkeypatch.setattr(RenderCache, 'get', lambda self, key: None)
+
+    assert not LaTeXTemplateProcessor.has_source('yuan')
+    assert TemplateManager._breaker('yuan') is None
+    pdf = TemplateManager.generate_resume(get_sample_resume('full'), 'yuan').getvalue()
+    assert pdf.startswith(b'%PDF')
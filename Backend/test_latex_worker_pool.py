@@ -0,0 +1,141 @@
+"""
+Tests for the warm LaTeX worker pool
+Most use a Python stand-in for pdflatex that reads the body pipe like the real engine
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from templates.latex_sandbox import CompileLimits, LaTeXResourceLimitError
+from templates.latex_worker_pool import LaTeXWorkerPool
+
+pytestmark = pytest.mark.skipif(not hasattr(os, 'mkfifo'), reason="warm workers need named pipes")
+
+# Stands in for pdflatex: writes "<first preamble line>|<body>" to resume.pdf once the body
+# arrives; a body line starting with #! is run first, to fail or stall the compile
+ENGINE = [sys.executable, '-c', (
+    "import sys\n"
+    "preamble = open(sys.argv[1]).readline().strip()\n"
+    "body = open('body.tex').read().strip()\n"
+    "if body.startswith('#!'): exec(body[2:])\n"
+    "open('resume.pdf', 'w').write(preamble + '|' + body)\n"
+)]
+LIMITS = CompileLimits(cpu_seconds=10, memory_mb=0, output_mb=16, open_files=64)
+
+
+@pytest.fixture
+def make_pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, 'LATEX_WORKSPACE_DIR', str(tmp_path))
+    pools = []
+
+    def make_pool(size=2, max_jobs=10):
+        pools.append(LaTeXWorkerPool(size, max_jobs))
+        return pools[-1]
+    yield make_pool
+    for pool in pools:
+        pool.close()
+
+
+def compile_with(pool, preamble, body, timeout=10):
+    """One job on a worker for preamble; the worker and what its job produced"""
+    worker = pool.checkout(preamble, ENGINE, limits=LIMITS)
+    try:
+        result = worker.run(body, timeout)
+        output = (worker.workdir / 'resume.pdf').read_text() if result.returncode == 0 else None
+        return worker, output
+    finally:
+        pool.release(worker)
+
+
+def test_released_workers_are_reused_for_their_preamble(make_pool):
+    """A worker goes back idle, warm, after its job and serves the next one with the same preamble"""
+    pool = make_pool()
+    first, output = compile_with(pool, 'P1', 'one')
+    assert output == 'P1|one'
+    assert list(pool._idle.values()) == [first] and not pool._busy
+    assert first.process is not None and not (first.workdir / 'resume.pdf').exists()
+
+    second, output = compile_with(pool, 'P1', 'two')
+    assert second is first and output == 'P1|two'
+
+
+def test_full_pool_hands_out_nothing_and_rebinds_the_least_recently_used(make_pool):
+    """A busy pool returns None; an idle worker for another preamble is replaced, oldest first"""
+    pool = make_pool(size=2)
+    busy = pool.checkout('P1', ENGINE, limits=LIMITS)
+    other = pool.checkout('P2', ENGINE, limits=LIMITS)
+    assert pool.checkout('P3', ENGINE, limits=LIMITS) is None
+    pool.release(busy)
+    pool.release(other)
+
+    rebound, output = compile_with(pool, 'P3', 'three')
+    assert output == 'P3|three'
+    assert not busy.workdir.exists() and other.workdir.exists()
+    assert set(pool._idle.values()) == {other, rebound}
+
+
+def test_workers_are_recycled_after_max_jobs(make_pool):
+    """A worker that has served max_jobs is closed and the next job gets a fresh one"""
+    pool = make_pool(max_jobs=2)
+    first, _ = compile_with(pool, 'P1', 'one')
+    again, _ = compile_with(pool, 'P1', 'two')
+    assert again is first
+    assert not first.workdir.exists() and not pool._idle and not pool._busy
+
+    fresh, output = compile_with(pool, 'P1', 'three')
+    assert fresh is not first and output == 'P1|three'
+
+
+def test_failed_killed_and_stalled_compiles_leave_a_working_worker(make_pool):
+    """After an engine error, a killed engine or a timeout the worker respawns and compiles again"""
+    pool = make_pool()
+    worker, output = compile_with(pool, 'P1', '#!sys.exit(1)')
+    assert output is None
+
+    with pytest.raises(LaTeXResourceLimitError):
+        # SIGXCPU is how the CPU limit stops an engine
+        compile_with(pool, 'P1', '#!import os, signal; os.kill(os.getpid(), signal.SIGXCPU)')
+
+    with pytest.raises(subprocess.TimeoutExpired):
+        compile_with(pool, 'P1', '#!import time; time.sleep(30)', timeout=0.5)
+
+    again, output = compile_with(pool, 'P1', 'after')
+    assert again is worker and output == 'P1|after'
+    assert len(pool._idle) == 1 and not pool._busy
+
+
+def test_worker_that_cannot_restart_is_dropped(make_pool, monkeypatch):
+    """If the next warm process cannot be started the worker is closed instead of going back idle"""
+    pool = make_pool()
+    worker = pool.checkout('P1', ENGINE, limits=LIMITS)
+    worker.run('one', 10)
+
+    def spawn():
+        raise OSError("no more processes")
+    monkeypatch.setattr(worker, 'spawn', spawn)
+    pool.release(worker)
+
+    assert not pool._idle and not pool._busy
+    assert not worker.workdir.exists()
+
+
+@pytest.mark.skipif(shutil.which('pdflatex') is None, reason="pdflatex is not installed")
+def test_warm_pdflatex_compiles_the_body(make_pool):
+    """A real pdflatex reads the preamble up front and typesets the body written to the pipe"""
+    pool = make_pool()
+    command = ['pdflatex', '-interaction=nonstopmode', '-halt-on-error']
+    worker = pool.checkout('\\documentclass{article}', command, limits=CompileLimits.from_settings())
+    try:
+        result = worker.run('\\begin{document}Warm\\end{document}', 60)
+        assert result.returncode == 0
+        assert (worker.workdir / 'resume.pdf').read_bytes().startswith(b'%PDF')
+    finally:
+        pool.release(worker)
@@ -0,0 +1,85 @@
+"""
+Tests for the rendered document cache
+"""
+
+import os
+import sys
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.render_cache import RenderCache
+
+
+def test_key_ignores_dict_order():
+    """Equivalent resume data hashes to the same key"""
+    first = RenderCache.make_key('pdf', 'auto_cv', '#3B82F6', {'a': 1, 'b': [1, 2]}, '1')
+    second = RenderCache.make_key('pdf', 'auto_cv', '#3b82f6', {'b': [1, 2], 'a': 1}, '1')
+    assert first == second
+    assert first != RenderCache.make_key('pdf', 'auto_cv', '#3B82F6', {'a': 1, 'b': [1, 2]}, '2')
+
+
+def test_memory_tier_evicts_by_bytes():
+    """Least recently used entries are evicted once the byte budget is exceeded"""
+    cache = RenderCache(max_bytes=10)
+    cache.put('a', b'12345')
+    cache.put('b', b'12345')
+    assert cache.get('a') == b'12345'
+    cache.put('c', b'12345')
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'12345'
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['bytes'] == 10
+
+
+def test_disk_tier_survives_memory_clear(tmp_path):
+    """Entries written to disk are found after the memory tier is dropped"""
+    cache = RenderCache(max_bytes=1024, disk_dir=str(tmp_path))
+    key = RenderCache.make_key('pdf', 'ethan', '#000000', {}, '1')
+    cache.put(key, b'%PDF-1.4')
+    cache.clear()
+
+    assert cache.get(key) == b'%PDF-1.4'
+    assert cache.stats()['disk_hits'] == 1
+
+
+def test_thumbnails_are_cached_apart_by_pdf_and_size():
+    """Preview images get their own cache, keyed by PDF content and the requested size"""
+    import pytest
+    pytest.importorskip('fitz')
+    from PIL import Image
+    from io import BytesIO
+    from utils.pdf_generator import PDFGenerator
+    from utils.pdf_thumbnails import ThumbnailCache, rasterize_pdf
+    from templates.sample_data import get_sample_resume
+
+    assert ThumbnailCache.get_cache() is not RenderCache.get_cache()
+    pdf = PDFGenerator().generate(get_sample_resume('full')).getvalue()
+    key = ThumbnailCache.thumbnail_key(pdf, 'webp', 300, None, False)
+    assert key == ThumbnailCache.thumbnail_key(bytes(pdf), 'webp', 300, None, False)
+    assert key != ThumbnailCache.thumbnail_key(pdf, 'webp', 600, None, False)
+
+    image = Image.open(BytesIO(rasterize_pdf(pdf, 'webp', width=300)))
+    assert (image.format, image.width) == ('WEBP', 300)
+
+
+def test_thumbnails_stay_within_page_and_pixel_limits(monkeypatch):
+    """Too many pages is refused, and an image over the pixel budget is rendered at a lower dpi"""
+    import pytest
+    pytest.importorskip('fitz')
+    from PIL import Image
+    from io import BytesIO
+    from config import settings
+    from utils.pdf_generator import PDFGenerator
+    from utils.pdf_thumbnails import ThumbnailTooLarge, rasterize_pdf
+    from templates.sample_data import get_sample_resume
+
+    pdf = PDFGenerator().generate(get_sample_resume('full')).getvalue()
+    monkeypatch.setattr(settings, 'THUMBNAIL_MAX_PAGES', 1)
+    with pytest.raises(ThumbnailTooLarge):
+        rasterize_pdf(pdf, 'png', dpi=300, all_pages=True)
+
+    monkeypatch.setattr(settings, 'THUMBNAIL_MAX_PIXELS', 1_000_000)
+    image = Image.open(BytesIO(rasterize_pdf(pdf, 'png', dpi=300)))
+    assert image.width * image.height <= 1_000_000
@@ -0,0 +1,95 @@
+"""
+Tests for the render process pool
+"""
+
+import asyncio
+import os
+import signal
+import sys
+import time
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from utils.render_executor import RenderExecutor, RenderTimeout
+
+
+@pytest.fixture
+def executor(monkeypatch):
+    monkeypatch.setattr(settings, 'RENDER_WORKERS', 1)
+    RenderExecutor.start()
+    yield RenderExecutor
+    RenderExecutor.shutdown()
+
+
+def test_timeout_counts_running_time_only(executor):
+    """Jobs queued behind others get the full timeout once they start; a job that overruns is interrupted"""
+    async def run():
+        await executor.run(time.sleep, 0)
+        await asyncio.gather(*(executor.run(time.sleep, 0.4, timeout=0.8) for _ in range(3)))
+
+        start = time.monotonic()
+        with pytest.raises(RenderTimeout):
+            await executor.run(time.sleep, 10, timeout=0.5)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) < 5
+
+
+def test_queue_wait_is_limited(executor, monkeypatch):
+    """A render stuck behind a busy worker gives up after RENDER_QUEUE_TIMEOUT, reporting no running time"""
+    async def run():
+        await executor.run(time.sleep, 0)
+        monkeypatch.setattr(settings, 'RENDER_QUEUE_TIMEOUT', 0.5)
+        busy = asyncio.ensure_future(executor.run(time.sleep, 2))
+        await asyncio.sleep(0.1)
+        with pytest.raises(RenderTimeout) as error:
+            await executor.run(time.sleep, 0)
+        await busy
+        while executor.pending:
+            await asyncio.sleep(0.05)
+        return error.value.seconds
+
+    assert asyncio.run(run()) == 0
+
+
+def test_cancelling_a_finished_job_spares_the_next_one(executor):
+    """A cancel signal that reaches the worker after its job finished is ignored by the next job"""
+    async def run():
+        await executor.run(time.sleep, 0)
+        stale_token = executor._next_token
+        job = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+        while not any(executor._job_slots):
+            await asyncio.sleep(0.01)
+        slot = next(slot for slot, pid in enumerate(executor._job_slots) if pid)
+        finished = Future()
+        finished.set_result(None)
+        executor._cancel(finished, slot, stale_token)
+        return await job
+
+    asyncio.run(run())
+
+
+def test_pool_is_replaced_after_a_worker_dies(executor):
+    """A worker killed mid-render or while idle fails at most that render; the next one gets a new pool"""
+    async def run():
+        job = asyncio.ensure_future(executor.run(time.sleep, 10))
+        while not any(executor._job_slots):
+            await asyncio.sleep(0.01)
+        os.kill(next(pid for pid in executor._job_slots if pid), signal.SIGKILL)
+        with pytest.raises(BrokenProcessPool):
+            await job
+        await executor.run(time.sleep, 0)
+
+        os.kill(await executor.run(os.getpid), signal.SIGKILL)
+        await asyncio.sleep(0.5)
+        assert await executor.run(os.getpid)
+        await asyncio.sleep(0.1)
+        return executor.pending, len(executor._free_slots)
+
+    assert asyncio.run(run()) == (0, executor.max_pending)
@@ -0,0 +1,56 @@
+"""
+Tests for the normalised resume document
+"""
+
+import os
+import pickle
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from templates.resume_document import ResumeDocument, ResumeDocumentCache
+
+
+def test_alternative_shapes_are_normalised():
+    """Alternative field names, null values and list descriptions resolve to one shape"""
+    resume = ResumeDocument.of({
+        'personal_info': {'name': 'Ada', 'location': None},
+        'objective': 'Build things',
+        'experience': [{'position': 'Engineer', 'start_date': '2020', 'end_date': '',
+                        'description': ['Shipped', '', 'Scaled']}],
+        'education': [{'degree': 'BSc', 'field': 'Physics', 'grade': 'First', 'start_date': '2014'}],
+        'skills': ['Python', 'Go'],
+    })
+
+    assert resume.personal_info.location == ""
+    assert resume.profile == 'Build things'
+    assert resume.experience[0].highlights == ('Shipped', 'Scaled')
+    assert resume.experience[0].period() == '2020 - Present'
+    assert (resume.education[0].field, resume.education[0].gpa) == ('Physics', 'First')
+    assert resume.education[0].dates() == '2014 - '
+    assert resume.skills[0].category == "" and resume.skills[0].text == 'Python, Go'
+
+
+def test_documents_are_read_only_and_picklable():
+    """Documents can be shared between renders and sent to render workers"""
+    resume = ResumeDocument.of({'summary': 'Hi', 'custom_sections': {'extra': ['a']}})
+    with pytest.raises(AttributeError):
+        resume.summary = 'Bye'
+    assert pickle.loads(pickle.dumps(resume)) == resume
+
+
+def test_cache_is_keyed_by_resume_version():
+    """A stored resume is normalised once per version"""
+    stored = {'_id': 'r1', 'version': 1, 'data': {'summary': 'First'}}
+    assert ResumeDocumentCache.get(stored) is ResumeDocumentCache.get(dict(stored))
+
+    updated = {'_id': 'r1', 'version': 2, 'data': {'summary': 'Second'}}
+    assert ResumeDocumentCache.get(updated).summary == 'Second'
+
+    # A resume stored before versioning becomes version 1 on its first update
+    legacy = {'_id': 'r2', 'data': {'summary': 'Before'}}
+    assert ResumeDocumentCache.get(legacy).summary == 'Before'
+    assert ResumeDocumentCache.get({**legacy, 'version': 1, 'data': {'summary': 'After'}}).summary == 'After'
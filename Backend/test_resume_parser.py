@@ -0,0 +1,111 @@
+"""
+Tests for resume upload parsing
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+from io import BytesIO
+
+import pytest
+from fastapi import UploadFile
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from templates.sample_data import get_sample_resume
+from templates.template_manager import TemplateManager
+from utils.pdf_extraction import PypdfEngine, extract_pdf_text
+from utils.resume_parser import parse_pdf_resume, parse_resume_upload
+from utils.uploads import UploadTooLarge, spooled_upload
+
+
+@pytest.fixture
+def resume_pdf(tmp_path):
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(TemplateManager.render_resume(get_sample_resume('full'), 'ethan').getvalue())
+    return str(path)
+
+
+def test_pymupdf_reads_layout_and_finds_the_name(resume_pdf):
+    """The default engine returns blocks with font sizes, which locate the name"""
+    pytest.importorskip('fitz')
+    extracted = extract_pdf_text(resume_pdf)
+    assert extracted.engine == 'pymupdf'
+    assert extracted.blocks and extracted.pages == len({block.page for block in extracted.blocks})
+
+    personal_info = parse_pdf_resume(resume_pdf)['personal_info']
+    assert personal_info['name'] == 'Alex Johnson'
+    assert personal_info['email'] == 'alex.johnson@email.com'
+
+
+def test_falls_back_to_the_next_engine(resume_pdf, monkeypatch):
+    """An engine that fails hands over to the next one"""
+    def fail(self, source):
+        raise ValueError("broken")
+    monkeypatch.setattr(PypdfEngine, 'extract', fail)
+    with pytest.raises(ValueError):
+        extract_pdf_text(resume_pdf, ['pypdf'])
+
+    pytest.importorskip('fitz')
+    assert extract_pdf_text(resume_pdf, ['pypdf', 'pymupdf']).engine == 'pymupdf'
+
+
+def test_uploads_are_parsed_from_memory_or_a_private_spool_file(resume_pdf, monkeypatch):
+    """Small uploads stay in memory, large ones are spooled to a file that is removed, oversized ones are refused"""
+    with open(resume_pdf, 'rb') as f:
+        content = f.read()
+
+    async def read(max_bytes, spool_bytes):
+        monkeypatch.setattr(settings, 'UPLOAD_MAX_BYTES', max_bytes)
+        monkeypatch.setattr(settings, 'UPLOAD_SPOOL_BYTES', spool_bytes)
+        async with spooled_upload(UploadFile(BytesIO(content)), suffix='.pdf') as source:
+            parsed = parse_resume_upload(source, 'pdf')
+            return source, os.path.exists(source) if isinstance(source, str) else None, parsed
+
+    source, _, parsed = asyncio.run(read(len(content), len(content)))
+    assert source == content
+    assert parsed['personal_info']['email'] == 'alex.johnson@email.com'
+
+    source, existed, parsed = asyncio.run(read(len(content), 1024))
+    assert existed and not os.path.exists(source)
+    assert parsed['personal_info']['email'] == 'alex.johnson@email.com'
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(read(len(content) - 1, 1024))
+
+
+def test_spool_file_is_written_off_the_event_loop(monkeypatch):
+    """Creating and writing the spool file happens in a worker thread"""
+    threads = []
+    named_temporary_file = tempfile.NamedTemporaryFile
+
+    class Recording:
+        def __init__(self, *args, **kwargs):
+            self.file = named_temporary_file(*args, **kwargs)
+            self.name = self.file.name
+            threads.append(threading.current_thread())
+
+        def writelines(self, chunks):
+            threads.append(threading.current_thread())
+            self.file.writelines(chunks)
+
+        def write(self, data):
+            threads.append(threading.current_thread())
+            return self.file.write(data)
+
+        def close(self):
+            self.file.close()
+
+    monkeypatch.setattr(tempfile, 'NamedTemporaryFile', Recording)
+    monkeypatch.setattr(settings, 'UPLOAD_SPOOL_BYTES', 1024)
+
+    async def read():
+        async with spooled_upload(UploadFile(BytesIO(b'x' * 1024 * 1024))) as source:
+            return os.path.getsize(source)
+
+    assert asyncio.run(read()) == 1024 * 1024
+    assert threads and threading.main_thread() not in threads
@@ -0,0 +1,82 @@
+"""
+Tests for the shared ReportLab style registry
+"""
+
+import os
+import sys
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from templates.anti_cv import AntiCVTemplate
+from templates.auto_cv import AutoCVTemplate
+from templates.ethan_template import EthanTemplate
+from templates.rendercv_classic import RenderCVClassicTemplate
+from templates.sample_data import get_sample_resume
+from templates.style_registry import StyleRegistry
+from templates.yuan_template import YuanTemplate
+from utils.pdf_generator import PDFGenerator
+
+RENDERERS = {
+    'auto_cv': lambda color: AutoCVTemplate(theme_color=color),
+    'anti_cv': lambda color: AntiCVTemplate(theme_color=color),
+    'ethan': lambda color: EthanTemplate(theme_color=color),
+    'rendercv_classic': lambda color: RenderCVClassicTemplate(theme_color=color),
+    'yuan': lambda color: YuanTemplate(theme_color=color),
+    'pdf_generator': lambda color: PDFGenerator('modern', color),
+}
+
+
+@pytest.fixture(autouse=True)
+def empty_registry():
+    StyleRegistry.clear()
+    yield
+    StyleRegistry.clear()
+
+
+def test_stylesheet_is_built_once_per_template_and_colour():
+    """The same (template, colour), in any case, returns the same read-only mapping"""
+    first = AutoCVTemplate(theme_color='#3B82F6').get_styles()
+    assert AutoCVTemplate(theme_color='#3b82f6').get_styles() is first
+    assert StyleRegistry.stats() == {'entries': 1, 'hits': 1, 'misses': 1}
+    with pytest.raises(TypeError):
+        first['extra'] = first[next(iter(first))]
+
+    other = AutoCVTemplate(theme_color='#FF0000').get_styles()
+    assert other is not first
+    assert any(other[name].textColor != first[name].textColor for name in first)
+
+
+def test_least_recently_used_stylesheet_is_evicted(monkeypatch):
+    """Beyond STYLE_CACHE_SIZE the stylesheet used longest ago is built again"""
+    monkeypatch.setattr(settings, 'STYLE_CACHE_SIZE', 2)
+    builds = []
+
+    def get(color):
+        return StyleRegistry.get('test', color, lambda: builds.append(color) or {})
+
+    get('#000001')
+    get('#000002')
+    get('#000001')
+    get('#000003')
+    get('#000001')
+    get('#000002')
+    assert builds == ['#000001', '#000002', '#000003', '#000002']
+
+
+def test_renders_leave_shared_styles_untouched(monkeypatch):
+    """Rendering another resume in between neither changes a shared style nor the next render's bytes"""
+    monkeypatch.setattr(settings, 'DETERMINISTIC_PDF', True)
+    full, creative = get_sample_resume('full'), get_sample_resume('creative')
+
+    for name, make_renderer in RENDERERS.items():
+        first = make_renderer('#10B981').generate(full).getvalue()
+        styles = StyleRegistry._styles.copy()
+        snapshot = {key: {n: dict(vars(style)) for n, style in sheet.items()} for key, sheet in styles.items()}
+
+        make_renderer('#10B981').generate(creative)
+        assert make_renderer('#10B981').generate(full).getvalue() == first, name
+        assert {key: {n: dict(vars(style)) for n, style in sheet.items()} for key, sheet in styles.items()} == snapshot, name
@@ -0,0 +1,121 @@
+"""Circuit breaker - stops sending work to a renderer that keeps failing or stalling"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Failure-rate and slow-call breaker over a sliding window of recent calls.
+
+    closed     calls go through and their outcomes are recorded
+    open       calls are refused until LATEX_BREAKER_OPEN_SECONDS have passed
+    half_open  a single probe call is let through; its outcome closes or reopens
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, window: Optional[int] = None, min_calls: Optional[int] = None,
+                 failure_rate: Optional[float] = None, slow_seconds: Optional[float] = None,
+                 slow_rate: Optional[float] = None, open_seconds: Optional[float] = None):
+        self.name = name
+        self.window = window if window is not None else settings.LATEX_BREAKER_WINDOW
+        self.min_calls = min_calls if min_calls is not None else settings.LATEX_BREAKER_MIN_CALLS
+        self.failure_rate = failure_rate if failure_rate is not None else settings.LATEX_BREAKER_FAILURE_RATE
+        self.slow_seconds = slow_seconds if slow_seconds is not None else settings.LATEX_BREAKER_SLOW_SECONDS
+        self.slow_rate = slow_rate if slow_rate is not None else settings.LATEX_BREAKER_SLOW_RATE
+        self.open_seconds = open_seconds if open_seconds is not None else settings.LATEX_BREAKER_OPEN_SECONDS
+
+        self.state = self.CLOSED
+        self._calls: deque = deque(maxlen=self.window)  # (failed, slow) per call
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.times_opened = 0
+        self.rejected = 0
+
+    def allow(self) -> bool:
+        """Whether the next call may go through; False means use the fallback"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._transition(self.HALF_OPEN)
+            if self.state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self, seconds: float):
+        self._record(failed=False, seconds=seconds)
+
+    def record_failure(self):
+        self._record(failed=True, seconds=0.0)
+
+    def abandon(self):
+        """The call was allowed but never ran (queue full, client gone)"""
+        with self._lock:
+            self._probing = False
+
+    def stats(self) -> Dict[str, object]:
+        """State and rates for the health endpoint"""
+        with self._lock:
+            failures, slow = self._rates()
+            return {
+                'state': self.state,
+                'calls': len(self._calls),
+                'failure_rate': round(failures, 3),
+                'slow_rate': round(slow, 3),
+                'times_opened': self.times_opened,
+                'rejected': self.rejected,
+            }
+
+    def _record(self, failed: bool, seconds: float):
+        slow = not failed and seconds >= self.slow_seconds
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self._probing = False
+                if failed or slow:
+                    self._open()
+                else:
+                    self._calls.clear()
+                    self._transition(self.CLOSED)
+                return
+            if self.state == self.OPEN:
+                return
+
+            self._calls.append((failed, slow))
+            if len(self._calls) < self.min_calls:
+                return
+            failures, slow_calls = self._rates()
+            if failures >= self.failure_rate or slow_calls >= self.slow_rate:
+                self._open()
+
+    def _rates(self):
+        if not self._calls:
+            return 0.0, 0.0
+        total = len(self._calls)
+        return (
+            sum(1 for failed, _ in self._calls if failed) / total,
+            sum(1 for _, slow in self._calls if slow) / total,
+        )
+
+    def _open(self):
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+        self._calls.clear()
+        self._transition(self.OPEN)
+
+    def _transition(self, state: str):
+        logger.warning(f"Circuit breaker {self.name}: {self.state} -> {state}")
+        self.state = state
@@ -1,230 +1,413 @@
+import threading
+from collections import OrderedDict
 from docx import Document
-from docx.shared import Pt, RGBColor, Inches
+from docx.document import Document as DocxDocument
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.opc.oxml import serialize_part_xml
+from docx.oxml.ns import qn
+from docx.shared import Pt, RGBColor, Inches
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple, Union
+
+from config import settings
+from templates.resume_document import ResumeDocument
+
+
+def split_document_xml(xml: bytes) -> Tuple[bytes, bytes, bytes]:
+    """document.xml as what comes before, inside and after the body's content; sectPr ends the body"""
+    start = xml.index(b'<w:body>') + len(b'<w:body>')
+    end = xml.rindex(b'<w:sectPr')
+    return xml[:start], xml[start:end], xml[end:]
+
+
+def hex_to_rgb(hex_color: str):
+    """Convert hex color to RGB tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+class DOCXTemplateStyle(NamedTuple):
+    """How one TemplateManager template looks in Word; None colours follow the theme colour"""
+    font: str
+    body_size: float
+    name_size: float
+    section_size: float
+    item_size: float
+    name_color: Optional[str] = None
+    section_color: Optional[str] = None
+    centered: bool = True
+    name_caps: bool = False
+    section_caps: bool = True
+    margins: Tuple[float, float, float, float] = (0.75, 0.75, 0.75, 0.75)
+
+
+class DOCXTemplates:
+    """DOCX look of each TemplateManager template, after its ReportLab stylesheet"""
+
+    TEMPLATES: Dict[str, DOCXTemplateStyle] = {
+        'auto_cv': DOCXTemplateStyle('Arial', 9, 20, 12, 10, name_caps=True),
+        'anti_cv': DOCXTemplateStyle('Arial', 10, 24, 16, 11, centered=False, section_caps=False,
+                                     margins=(1.0, 1.0, 0.8, 0.8)),
+        'ethan': DOCXTemplateStyle('Arial', 9, 22, 11, 10, name_color='#1A1A1A', margins=(0.5, 0.5, 0.6, 0.6)),
+        'rendercv_classic': DOCXTemplateStyle('Times New Roman', 10, 20, 12, 11, name_color='#000000',
+                                              section_color='#000000', section_caps=False,
+                                              margins=(1.0, 1.0, 1.0, 1.0)),
+        'yuan': DOCXTemplateStyle('Arial', 9, 24, 13, 11, name_color='#1A1A1A', section_caps=False,
+                                  margins=(0.8, 0.8, 0.8, 0.8)),
+    }
+
+    # Same fallback as TemplateManager for unknown or legacy ids such as "modern"
+    DEFAULT = 'auto_cv'
+
+    @classmethod
+    def resolve(cls, template: str) -> str:
+        return template if template in cls.TEMPLATES else cls.DEFAULT
+
+
+class DOCXBase(NamedTuple):
+    """A parsed base document and the ids of its paragraph styles by role, looked up once"""
+    document: DocxDocument
+    style_ids: Dict[str, str]
+
+
+class DOCXBaseDocuments:
+    """
+    python-docx base documents, parsed once per template and theme colour and reused.
+
+    Document() unzips and parses the default template package (styles,
+    numbering, theme XML) on every call. A base is parsed once, its styles
+    and margins set for the template and colour, and lent to one export at
+    a time; release empties the body the export filled, which is all an
+    export changes. Bases for up to DOCX_BASE_CACHE_SIZE templates and
+    colours are kept.
+    """
+
+    # Paragraph style behind each role an export uses; the custom ones are added to the base
+    ROLE_STYLES = {
+        'name': 'Heading 1',
+        'section': 'Heading 2',
+        'body': 'Normal',
+        'bullet': 'List Bullet',
+        'contact': 'Resume Contact',
+        'item': 'Resume Item',
+        'detail': 'Resume Detail',
+    }
+
+    # Dates, contact details and other secondary text
+    MUTED_COLOR = '#808080'
+
+    # Idle bases kept per template and colour, enough for concurrent exports in one process
+    MAX_IDLE_PER_KEY = 4
+
+    _idle: "OrderedDict[Tuple[str, str], List[DOCXBase]]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def checkout(cls, template: str, theme_color: str) -> DOCXBase:
+        """An empty base document for this template and colour, parsed now only if none is idle"""
+        key = (DOCXTemplates.resolve(template), theme_color.lower())
+        with cls._lock:
+            idle = cls._idle.get(key)
+            if idle:
+                cls._idle.move_to_end(key)
+                return idle.pop()
+        return cls._create(key[0], theme_color)
+
+    @classmethod
+    def release(cls, template: str, theme_color: str, base: DOCXBase):
+        """Empty a base after its export was saved and keep it for the next one"""
+        if settings.DOCX_BASE_CACHE_SIZE <= 0:
+            return
+        body = base.document.element.body
+        for child in list(body):
+            # The final section properties belong to the template
+            if child is not body.sectPr:
+                body.remove(child)
+
+        key = (DOCXTemplates.resolve(template), theme_color.lower())
+        with cls._lock:
+            idle = cls._idle.setdefault(key, [])
+            cls._idle.move_to_end(key)
+            if len(idle) < cls.MAX_IDLE_PER_KEY:
+                idle.append(base)
+            while len(cls._idle) > settings.DOCX_BASE_CACHE_SIZE:
+                cls._idle.popitem(last=False)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._idle.clear()
+
+    @classmethod
+    def _create(cls, template: str, theme_color: str) -> DOCXBase:
+        """Parse the default package and write the template's styles into it"""
+        spec = DOCXTemplates.TEMPLATES[template]
+        document = Document()
+        styles = document.styles
+        alignment = WD_ALIGN_PARAGRAPH.CENTER if spec.centered else WD_ALIGN_PARAGRAPH.LEFT
+
+        section = document.sections[0]
+        section.right_margin, section.left_margin, section.top_margin, section.bottom_margin = (
+            Inches(margin) for margin in spec.margins
+        )
+
+        normal = styles['Normal']
+        cls._set_font(normal, spec.font, spec.body_size)
+        normal.paragraph_format.space_after = Pt(3)
+
+        name_style = styles['Heading 1']
+        cls._set_font(name_style, spec.font, spec.name_size, spec.name_color or theme_color, bold=True)
+        name_style.font.all_caps = spec.name_caps
+        name_style.paragraph_format.alignment = alignment
+
+        heading = styles['Heading 2']
+        cls._set_font(heading, spec.font, spec.section_size, spec.section_color or theme_color, bold=True)
+        heading.font.all_caps = spec.section_caps
+
+        cls._set_font(styles['List Bullet'], spec.font, spec.body_size)
+
+        contact = cls._add_style(styles, 'Resume Contact', spec.font, spec.body_size, cls.MUTED_COLOR)
+        contact.paragraph_format.alignment = alignment
+        cls._add_style(styles, 'Resume Item', spec.font, spec.item_size, bold=True)
+        cls._add_style(styles, 'Resume Detail', spec.font, spec.body_size, cls.MUTED_COLOR, italic=True)
+
+        return DOCXBase(document, {role: styles[name].style_id for role, name in cls.ROLE_STYLES.items()})
+
+    @staticmethod
+    def _add_style(styles, name: str, font: str, size: float, color: Optional[str] = None,
+                   bold: bool = False, italic: bool = False):
+        style = styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+        style.base_style = styles['Normal']
+        style.quick_style = True
+        DOCXBaseDocuments._set_font(style, font, size, color, bold, italic)
+        return style
+
+    @staticmethod
+    def _set_font(style, font: str, size: float, color: Optional[str] = None,
+                  bold: Optional[bool] = None, italic: Optional[bool] = None):
+        style.font.name = font
+        # Theme fonts on the built-in headings would win over the name
+        r_fonts = style.element.rPr.rFonts
+        for attr in ('asciiTheme', 'hAnsiTheme', 'eastAsiaTheme', 'cstheme'):
+            r_fonts.attrib.pop(qn(f'w:{attr}'), None)
+        style.font.size = Pt(size)
+        if color:
+            style.font.color.rgb = RGBColor(*hex_to_rgb(color))
+        if bold is not None:
+            style.font.bold = bold
+        if italic is not None:
+            style.font.italic = italic
 
 
 class DOCXGenerator:
-    """Generate professional DOCX resumes"""
+    """Generate professional DOCX resumes in the look of a TemplateManager template"""
     
-    def __init__(self, template: str = "modern", theme_color: str = "#3B82F6"):
+    def __init__(self, template: str = "auto_cv", theme_color: str = "#3B82F6"):
         self.template = template
         self.theme_color = theme_color
-        self.doc = Document()
+        self.base = DOCXBaseDocuments.checkout(template, theme_color)
+        self.doc = self.base.document
         self.buffer = BytesIO()
     
     def hex_to_rgb(self, hex_color: str):
         """Convert hex color to RGB tuple"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return hex_to_rgb(hex_color)
+    
+    def add_styled_paragraph(self, text: str, role: str):
+        """
+        Add a paragraph in the base's style for a role, set by id: python-docx would
+        look the style up by name and scan every style for the default one
+        """
+        para = self.doc.add_paragraph(text)
+        para._p.style = self.base.style_ids[role]
+        return para
     
-    def add_heading(self, text: str, level: int = 1):
-        """Add a styled heading"""
-        heading = self.doc.add_heading(text, level=level)
-        if level == 1:
-            heading.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = heading.runs[0]
-        run.font.color.rgb = RGBColor(*self.hex_to_rgb(self.theme_color))
-        return heading
+    def add_heading(self, text: str):
+        """Add a section heading"""
+        return self.add_styled_paragraph(text, 'section')
     
     def add_paragraph(self, text: str, bold: bool = False, italic: bool = False):
-        """Add a paragraph with optional styling"""
-        para = self.doc.add_paragraph()
-        run = para.add_run(text)
-        run.font.size = Pt(11)
-        if bold:
-            run.bold = True
-        if italic:
-            run.italic = True
-        return para
+        """Add a body paragraph, or an item title (bold) or detail line (italic)"""
+        return self.add_styled_paragraph(text, 'item' if bold else 'detail' if italic else 'body')
+    
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> BytesIO:
+        """Generate DOCX resume; the base document goes back to DOCXBaseDocuments afterwards"""
+        try:
+            self._build(resume_data)
+            self.doc.save(self.buffer)
+            self.buffer.seek(0)
+            return self.buffer
+        finally:
+            DOCXBaseDocuments.release(self.template, self.theme_color, self.base)
+    
+    def generate_body(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> bytes:
+        """Only the content of document.xml's body, for docx_package to write the package around"""
+        try:
+            self._build(resume_data)
+            return split_document_xml(serialize_part_xml(self.doc.element))[1]
+        finally:
+            DOCXBaseDocuments.release(self.template, self.theme_color, self.base)
     
-    def generate(self, resume_data: Dict[str, Any]) -> BytesIO:
-        """Generate DOCX resume"""
+    def _build(self, resume_data: Union[ResumeDocument, Dict[str, Any]]):
+        resume = ResumeDocument.of(resume_data)
         
         # Personal Info
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            name_para = self.doc.add_heading(personal_info['name'], level=1)
-            name_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+        personal_info = resume.personal_info
+        if personal_info.name:
+            self.add_styled_paragraph(personal_info.name, 'name')
         
         # Contact information
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
         
         if contact_parts:
-            contact_para = self.doc.add_paragraph(' | '.join(contact_parts))
-            contact_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            self.add_styled_paragraph(' | '.join(contact_parts), 'contact')
         
         # Links
         links = []
-        if personal_info.get('linkedin'):
-            links.append(f"LinkedIn: {personal_info['linkedin']}")
-        if personal_info.get('github'):
-            links.append(f"GitHub: {personal_info['github']}")
-        if personal_info.get('portfolio'):
-            links.append(f"Portfolio: {personal_info['portfolio']}")
+        if personal_info.linkedin:
+            links.append(f"LinkedIn: {personal_info.linkedin}")
+        if personal_info.github:
+            links.append(f"GitHub: {personal_info.github}")
+        if personal_info.portfolio:
+            links.append(f"Portfolio: {personal_info.portfolio}")
         
         if links:
-            links_para = self.doc.add_paragraph(' | '.join(links))
-            links_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
+            self.add_styled_paragraph(' | '.join(links), 'contact')
         
         self.doc.add_paragraph()  # Spacer
         
         # Summary/Objective
-        if resume_data.get('summary'):
-            self.add_heading('CAREER OBJECTIVE / PROFESSIONAL SUMMARY', level=2)
-            self.add_paragraph(resume_data['summary'])
+        if resume.summary:
+            self.add_heading('Career Objective / Professional Summary')
+            self.add_paragraph(resume.summary)
             self.doc.add_paragraph()
-        elif resume_data.get('objective'):
-            self.add_heading('OBJECTIVE', level=2)
-            self.add_paragraph(resume_data['objective'])
+        elif resume.objective:
+            self.add_heading('Objective')
+            self.add_paragraph(resume.objective)
             self.doc.add_paragraph()
         
         # Skills - MOVED UP
-        if resume_data.get('skills'):
-            self.add_heading('TECHNICAL SKILLS', level=2)
-            skills = resume_data['skills']
-            
-            # Handle both formats: List[str] or List[{category, items}]
-            if skills and isinstance(skills[0], dict):
-                # New format with categories
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skills_text = f"{category}: {', '.join(items)}"
-                        self.add_paragraph(skills_text)
-            else:
-                # Old format: simple list
-                skills_text = ', '.join(skills)
-                self.add_paragraph(skills_text)
+        if resume.skills:
+            self.add_heading('Technical Skills')
+            for group in resume.skills:
+                self.add_paragraph(f"{group.category}: {group.text}" if group.category else group.text)
             self.doc.add_paragraph()
         
         # Projects - MOVED UP
-        if resume_data.get('projects'):
-            self.add_heading('PROJECTS', level=2)
-            for proj in resume_data['projects']:
-                self.add_paragraph(proj.get('name', 'Project'), bold=True)
+        if resume.projects:
+            self.add_heading('Projects')
+            for proj in resume.projects:
+                self.add_paragraph(proj.name or 'Project', bold=True)
                 
-                if proj.get('description'):
-                    self.add_paragraph(proj['description'])
+                if proj.description:
+                    self.add_paragraph(proj.description)
                 
-                if proj.get('technologies'):
-                    tech_text = f"Technologies: {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"Technologies: {', '.join(proj.technologies)}"
                     self.add_paragraph(tech_text, italic=True)
                 
-                if proj.get('url'):
-                    self.add_paragraph(f"URL: {proj['url']}")
+                if proj.url:
+                    self.add_paragraph(f"URL: {proj.url}")
                 
                 self.doc.add_paragraph()
         
         # Experience / Internship Experience
-        if resume_data.get('experience'):
-            self.add_heading('INTERNSHIP / WORK EXPERIENCE', level=2)
-            for exp in resume_data['experience']:
+        if resume.experience:
+            self.add_heading('Internship / Work Experience')
+            for exp in resume.experience:
                 # Position and company
                 self.add_paragraph(
-                    f"{exp.get('position', 'Position')} at {exp.get('company', 'Company')}",
+                    f"{exp.position or 'Position'} at {exp.company or 'Company'}",
                     bold=True
                 )
                 
                 # Dates and location
                 date_info = []
-                if exp.get('start_date'):
-                    date_range = f"{exp['start_date']} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
-                    date_info.append(date_range)
-                if exp.get('location'):
-                    date_info.append(exp['location'])
+                if exp.start_date:
+                    date_info.append(exp.period())
+                if exp.location:
+                    date_info.append(exp.location)
                 
                 if date_info:
                     self.add_paragraph(' | '.join(date_info), italic=True)
                 
-                # Description (can be string or list)
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:  # Skip empty strings
-                                para = self.doc.add_paragraph(item, style='List Bullet')
-                    else:
-                        self.add_paragraph(description)
-                
-                # Achievements
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        para = self.doc.add_paragraph(achievement, style='List Bullet')
+                # Description and achievements
+                if exp.description:
+                    self.add_paragraph(exp.description)
+                for item in exp.highlights + exp.achievements:
+                    self.add_styled_paragraph(item, 'bullet')
                 
                 self.doc.add_paragraph()  # Spacer
         
         # Certifications
-        if resume_data.get('certifications'):
-            self.add_heading('CERTIFICATIONS', level=2)
-            for cert in resume_data['certifications']:
-                cert_text = f"{cert.get('name', 'Certification')} - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+        if resume.certifications:
+            self.add_heading('Certifications')
+            for cert in resume.certifications:
+                cert_text = f"{cert.name or 'Certification'} - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 self.add_paragraph(cert_text)
             self.doc.add_paragraph()
         
         # Education - MOVED TO END
-        if resume_data.get('education'):
-            self.add_heading('EDUCATION', level=2)
-            for edu in resume_data['education']:
+        if resume.education:
+            self.add_heading('Education')
+            for edu in resume.education:
                 # Degree
-                degree_text = f"{edu.get('degree', 'Degree')}"
-                field = edu.get('field_of_study') or edu.get('field', '')
+                degree_text = f"{edu.degree or 'Degree'}"
+                field = edu.field
                 if field:
                     degree_text += f" in {field}"
                 self.add_paragraph(degree_text, bold=True)
                 
                 # Institution
-                self.add_paragraph(edu.get('institution', 'Institution'))
+                self.add_paragraph(edu.institution or 'Institution')
                 
                 # Dates and grade
                 date_info = []
-                if edu.get('graduation_date'):
-                    date_info.append(edu['graduation_date'])
-                elif edu.get('start_date'):
-                    date_range = f"{edu['start_date']} - {edu.get('end_date', 'Present')}"
+                if edu.graduation_date:
+                    date_info.append(edu.graduation_date)
+                elif edu.start_date:
+                    date_range = f"{edu.start_date} - {edu.end_date or 'Present'}"
                     date_info.append(date_range)
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    date_info.append(f"GPA: {gpa}")
+                if edu.gpa:
+                    date_info.append(f"GPA: {edu.gpa}")
                 
                 if date_info:
                     self.add_paragraph(' | '.join(date_info), italic=True)
                 
-                if edu.get('description'):
-                    self.add_paragraph(edu['description'])
+                if edu.description:
+                    self.add_paragraph(edu.description)
                 
                 self.doc.add_paragraph()
         
         # Languages
-        if resume_data.get('languages'):
-            self.add_heading('LANGUAGES', level=2)
-            languages_text = ', '.join(resume_data['languages'])
-            self.add_paragraph(languages_text)
+        if resume.languages:
+            self.add_heading('Languages')
+            self.add_paragraph(', '.join(resume.languages))
             self.doc.add_paragraph()
         
         # Awards
-        if resume_data.get('awards'):
-            self.add_heading('AWARDS & HONORS', level=2)
-            for award in resume_data['awards']:
-                para = self.doc.add_paragraph(award, style='List Bullet')
-        
-        # Save to buffer
-        self.doc.save(self.buffer)
-        self.buffer.seek(0)
-        return self.buffer
+        if resume.awards:
+            self.add_heading('Awards & Honors')
+            for award in resume.awards:
+                self.add_styled_paragraph(award, 'bullet')
 
 
-def generate_docx_resume(resume_data: Dict[str, Any], template: str = "modern", theme_color: str = "#3B82F6") -> BytesIO:
+def generate_docx_resume(resume_data: Union[ResumeDocument, Dict[str, Any]], template: str = "auto_cv", theme_color: str = "#3B82F6") -> BytesIO:
     """Main function to generate DOCX resume"""
     generator = DOCXGenerator(template, theme_color)
     return generator.generate(resume_data)
+
+
+def render_docx_body(resume_data: Union[ResumeDocument, Dict[str, Any]], template: str = "auto_cv", theme_color: str = "#3B82F6") -> bytes:
+    """Render a resume's document.xml body; see docx_package.iter_docx_package"""
+    generator = DOCXGenerator(template, theme_color)
+    return generator.generate_body(resume_data)
@@ -0,0 +1,162 @@
+"""DOCX package writer - streams a DOCX archive around a rendered document body"""
+
+import struct
+import threading
+import zlib
+from collections import OrderedDict
+from io import BytesIO
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+from zipfile import ZipFile
+
+from config import settings
+from utils.docx_generator import DOCXBaseDocuments, DOCXTemplates, split_document_xml
+
+DOCUMENT_PART = 'word/document.xml'
+
+# Body bytes compressed per step of the document.xml entry
+CHUNK_SIZE = 64 * 1024
+
+# ZIP records, as written by zipfile
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_DATA_DESCRIPTOR = struct.Struct('<4sLLL')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+
+_DEFLATED = 8
+_VERSION = 20
+_USES_DATA_DESCRIPTOR = 0x08
+_UTF8_NAME = 0x800
+# 1980-01-01 00:00, the earliest DOS date, so identical input gives identical archives
+_DOS_TIME, _DOS_DATE = 0, (1 << 5) | 1
+
+
+class PackagePart(NamedTuple):
+    """One ZIP entry of a package, deflated ahead of time; document.xml has no data"""
+    name: bytes
+    crc: int
+    size: int
+    data: Optional[bytes]
+
+
+class DOCXPackage(NamedTuple):
+    """Everything in a template's DOCX package except the resume's body"""
+    parts: Tuple[PackagePart, ...]
+    document_head: bytes
+    document_tail: bytes
+
+
+class DOCXPackages:
+    """
+    Static package parts per template and theme colour, built and deflated once.
+
+    styles.xml and stylesWithEffects.xml are most of a DOCX package by size,
+    and deflating them was half the cost of an export. A package is built
+    from DOCXBaseDocuments' empty base, so it matches what
+    DOCXGenerator.generate would save. Up to DOCX_BASE_CACHE_SIZE are kept.
+    """
+
+    _packages: "OrderedDict[Tuple[str, str], DOCXPackage]" = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, template: str, theme_color: str) -> DOCXPackage:
+        key = (DOCXTemplates.resolve(template), theme_color.lower())
+        with cls._lock:
+            package = cls._packages.get(key)
+            if package is not None:
+                cls._packages.move_to_end(key)
+                return package
+
+        # Built outside the lock; a concurrent miss just builds an identical copy
+        package = cls._create(key[0], theme_color)
+        if settings.DOCX_BASE_CACHE_SIZE > 0:
+            with cls._lock:
+                cls._packages[key] = package
+                while len(cls._packages) > settings.DOCX_BASE_CACHE_SIZE:
+                    cls._packages.popitem(last=False)
+        return package
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._packages.clear()
+
+    @classmethod
+    def _create(cls, template: str, theme_color: str) -> DOCXPackage:
+        base = DOCXBaseDocuments.checkout(template, theme_color)
+        try:
+            buffer = BytesIO()
+            base.document.save(buffer)
+        finally:
+            DOCXBaseDocuments.release(template, theme_color, base)
+
+        parts = []
+        with ZipFile(buffer) as archive:
+            for name in archive.namelist():
+                data = archive.read(name)
+                if name == DOCUMENT_PART:
+                    head, _, tail = split_document_xml(data)
+                    parts.append(PackagePart(name.encode('utf-8'), 0, 0, None))
+                    continue
+                compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+                deflated = compressor.compress(data) + compressor.flush()
+                parts.append(PackagePart(name.encode('utf-8'), zlib.crc32(data), len(data), deflated))
+        return DOCXPackage(tuple(parts), head, tail)
+
+
+def iter_docx_package(body: bytes, template: str = "auto_cv", theme_color: str = "#3B82F6") -> Iterator[bytes]:
+    """
+    Yield a DOCX archive part by part, with body (from render_docx_body) as
+    the content of document.xml. Static parts are copied already deflated;
+    document.xml is deflated CHUNK_SIZE bytes at a time and followed by a
+    data descriptor, so nothing waits for the whole archive.
+    """
+    package = DOCXPackages.get(template, theme_color)
+    central: List[bytes] = []
+    offset = 0
+
+    for part in package.parts:
+        if part.data is not None:
+            flags, crc, size, compressed_size = _UTF8_NAME, part.crc, part.size, len(part.data)
+            header = _local_header(part.name, flags, crc, compressed_size, size)
+            yield header + part.data
+            length = len(header) + compressed_size
+        else:
+            flags = _UTF8_NAME | _USES_DATA_DESCRIPTOR
+            header = _local_header(part.name, flags, 0, 0, 0)
+            yield header
+            length = len(header)
+            compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15)
+            crc = size = compressed_size = 0
+            pieces = [package.document_head]
+            view = memoryview(body)
+            pieces += [view[start:start + CHUNK_SIZE] for start in range(0, len(body), CHUNK_SIZE)]
+            pieces.append(package.document_tail)
+            for piece in pieces:
+                crc = zlib.crc32(piece, crc)
+                size += len(piece)
+                compressed = compressor.compress(piece)
+                if compressed:
+                    compressed_size += len(compressed)
+                    yield compressed
+            compressed = compressor.flush()
+            compressed_size += len(compressed)
+            descriptor = _DATA_DESCRIPTOR.pack(b'PK\x07\x08', crc, compressed_size, size)
+            yield compressed + descriptor
+            length += compressed_size + len(descriptor)
+
+        central.append(_CENTRAL_HEADER.pack(
+            b'PK\x01\x02', _VERSION, 0, _VERSION, 0, flags, _DEFLATED, _DOS_TIME, _DOS_DATE,
+            crc, compressed_size, size, len(part.name), 0, 0, 0, 0, 0, offset
+        ) + part.name)
+        offset += length
+
+    directory = b''.join(central)
+    yield directory + _END_RECORD.pack(b'PK\x05\x06', 0, 0, len(central), len(central), len(directory), offset, 0)
+
+
+def _local_header(name: bytes, flags: int, crc: int, compressed_size: int, size: int) -> bytes:
+    return _LOCAL_HEADER.pack(
+        b'PK\x03\x04', _VERSION, 0, flags, _DEFLATED, _DOS_TIME, _DOS_DATE,
+        crc, compressed_size, size, len(name), 0
+    ) + name
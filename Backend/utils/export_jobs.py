@@ -0,0 +1,326 @@
+"""Export jobs - queued and batch PDF/DOCX exports that do not hold a request open per file"""
+
+import asyncio
+import logging
+import re
+import time
+import uuid
+import zipfile
+from io import BytesIO
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from fastapi import Request
+
+from config import settings
+from templates.resume_document import ResumeDocumentCache
+from templates.template_manager import TemplateManager
+from utils.docx_generator import render_docx_body
+from utils.docx_package import iter_docx_package
+from utils.pdf_generator import generate_pdf_resume
+from utils.render_executor import RenderExecutor, RenderError, RenderQueueFull
+
+logger = logging.getLogger(__name__)
+
+EXPORT_MEDIA_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
+}
+
+
+async def render_docx(resume: Dict[str, Any], template: Optional[str] = None,
+                      request: Optional[Request] = None) -> Iterator[bytes]:
+    """
+    Render a stored resume's DOCX body on the render executor and return an
+    iterator that writes the package around it, for a StreamingResponse
+    """
+    template = template or resume.get("template", "auto_cv")
+    theme_color = resume.get("theme_color", "#3B82F6")
+    body = await RenderExecutor.run(
+        render_docx_body,
+        ResumeDocumentCache.get(resume),
+        template=template,
+        theme_color=theme_color,
+        request=request
+    )
+    return iter_docx_package(body, template, theme_color)
+
+
+async def render_export(resume: Dict[str, Any], file_format: str, template: Optional[str] = None,
+                        request: Optional[Request] = None) -> BytesIO:
+    """Render a stored resume as PDF or DOCX on the render executor"""
+    if file_format == 'docx':
+        chunks = await render_docx(resume, template, request)
+        # Off the event loop: a template's first package is built while iterating
+        return BytesIO(await asyncio.to_thread(b"".join, chunks))
+
+    theme_color = resume.get("theme_color", "#3B82F6")
+    # Normalised once per resume version and shared by every format and template
+    document = ResumeDocumentCache.get(resume)
+
+    # Use resume's stored template, or override if specified
+    try:
+        return await TemplateManager.generate_resume_async(
+            resume_data=document,
+            template_name=template or resume.get("template", "auto_cv"),
+            theme_color=theme_color,
+            request=request,
+            optimize=settings.PDF_OPTIMIZE_EXPORTS
+        )
+    except RenderError:
+        raise
+    except Exception:
+        # Fallback to old system if template fails
+        return await RenderExecutor.run(
+            generate_pdf_resume,
+            document,
+            template=resume.get("template", "modern"),
+            theme_color=theme_color,
+            request=request
+        )
+
+
+async def render_export_queued(resume: Dict[str, Any], file_format: str,
+                               template: Optional[str] = None) -> BytesIO:
+    """render_export for background work: waits for room on the executor instead of failing"""
+    while True:
+        try:
+            return await render_export(resume, file_format, template)
+        except RenderQueueFull:
+            # Interactive exports filled the executor
+            await asyncio.sleep(0.5)
+
+
+class _ZipStream:
+    """Write-only sink for ZipFile; having no tell() makes it write streaming-friendly entries"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+async def stream_batch_zip(resumes: List[Dict[str, Any]], templates: List[Optional[str]],
+                           file_format: str) -> AsyncIterator[bytes]:
+    """
+    Render every resume in every template and yield a ZIP archive as entries finish.
+
+    Renders run in parallel, at most EXPORT_BATCH_CONCURRENCY at a time. Failed
+    renders do not abort the archive; they are listed in errors.txt at the end.
+    """
+    concurrency = settings.EXPORT_BATCH_CONCURRENCY or RenderExecutor.max_workers or 1
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def render(resume: Dict[str, Any], template: Optional[str]):
+        async with semaphore:
+            try:
+                buffer = await render_export_queued(resume, file_format, template)
+                return resume, template, buffer.getvalue(), None
+            except Exception as e:
+                return resume, template, None, str(e)
+
+    tasks = [asyncio.ensure_future(render(resume, template)) for resume in resumes for template in templates]
+    sink = _ZipStream()
+    archive = zipfile.ZipFile(sink, 'w')
+    errors = []
+    names = set()
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            resume, template, data, error = await next_done
+            name = _batch_entry_name(resume, template or resume.get("template", "auto_cv"), file_format, names)
+            if error is not None:
+                errors.append(f"{name}: {error}")
+                continue
+            # PDF and DOCX are already compressed
+            archive.writestr(zipfile.ZipInfo(name, time.localtime()[:6]), data, zipfile.ZIP_STORED)
+            yield sink.drain()
+        if errors:
+            archive.writestr("errors.txt", "\n".join(errors) + "\n", zipfile.ZIP_DEFLATED)
+        archive.close()
+        yield sink.drain()
+    finally:
+        # Client went away or rendering failed; stop the renders still in flight
+        for task in tasks:
+            task.cancel()
+
+
+def _batch_entry_name(resume: Dict[str, Any], template: str, file_format: str, names: set) -> str:
+    title = re.sub(r'[^A-Za-z0-9._-]+', '_', resume.get("title", "resume")).strip('._') or "resume"
+    name = f"{title}_{template}.{file_format}"
+    if name in names:
+        name = f"{title}_{str(resume.get('_id', ''))[-6:]}_{template}.{file_format}"
+    names.add(name)
+    return name
+
+
+class ExportJob:
+    """One queued export and, once finished, its result"""
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+
+    def __init__(self, user_id: str, resume: Dict[str, Any], file_format: str, template: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.user_id = user_id
+        self.resume = resume
+        self.file_format = file_format
+        self.template = template
+        self.status = self.QUEUED
+        self.error: Optional[str] = None
+        self.result: Optional[bytes] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+
+    @property
+    def filename(self) -> str:
+        return f"{self.resume.get('title', 'resume')}.{self.file_format}"
+
+    @property
+    def media_type(self) -> str:
+        return EXPORT_MEDIA_TYPES[self.file_format]
+
+    def to_dict(self) -> Dict[str, Any]:
+        expires_at = self.finished_at + settings.EXPORT_JOB_TTL if self.finished_at else None
+        return {
+            'job_id': self.id,
+            'status': self.status,
+            'format': self.file_format,
+            'template': self.template,
+            'resume_id': str(self.resume.get('_id', '')),
+            'error': self.error,
+            'created_at': self.created_at,
+            'finished_at': self.finished_at,
+            'expires_at': expires_at,
+        }
+
+
+class ExportJobManager:
+    """
+    In-process job queue in front of the render executor.
+
+    Jobs are kept in memory, so with several uvicorn workers a client has to
+    poll the worker that accepted its job. Finished jobs are dropped
+    EXPORT_JOB_TTL seconds after they complete, or earlier, oldest first,
+    once their files add up to more than EXPORT_JOB_MAX_RESULT_BYTES.
+    """
+
+    jobs: Dict[str, ExportJob] = {}
+    result_bytes: int = 0
+    queue: Optional[asyncio.Queue] = None
+    _consumers: List[asyncio.Task] = []
+
+    @classmethod
+    def start(cls):
+        """Start the consumers; must be called from the running event loop"""
+        if cls.queue is not None:
+            return
+        cls.queue = asyncio.Queue()
+        workers = settings.EXPORT_JOB_WORKERS or RenderExecutor.max_workers or 1
+        cls._consumers = [asyncio.create_task(cls._consume()) for _ in range(workers)]
+        logger.info(f"Export job queue started with {workers} consumers")
+
+    @classmethod
+    async def shutdown(cls):
+        """Stop the consumers, abandoning queued jobs"""
+        for task in cls._consumers:
+            task.cancel()
+        await asyncio.gather(*cls._consumers, return_exceptions=True)
+        cls._consumers = []
+        cls.queue = None
+        cls.jobs = {}
+        cls.result_bytes = 0
+
+    @classmethod
+    def submit(cls, user_id: str, resume: Dict[str, Any], file_format: str,
+               template: Optional[str] = None) -> ExportJob:
+        """Queue an export; raises RenderQueueFull when too many jobs are waiting"""
+        if cls.queue is None:
+            cls.start()
+        cls._purge()
+        if cls.queue.qsize() >= settings.EXPORT_JOB_MAX_PENDING:
+            raise RenderQueueFull("Too many export jobs are queued, please retry shortly")
+        job = ExportJob(user_id, resume, file_format, template)
+        cls.jobs[job.id] = job
+        cls.queue.put_nowait(job)
+        return job
+
+    @classmethod
+    def get(cls, job_id: str, user_id: str) -> Optional[ExportJob]:
+        """A job owned by user_id, or None if it does not exist or has expired"""
+        cls._purge()
+        job = cls.jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    @classmethod
+    def stats(cls) -> Dict[str, int]:
+        """Job counts and memory held by results, for the health endpoint"""
+        counts = {status: 0 for status in (ExportJob.QUEUED, ExportJob.RUNNING, ExportJob.DONE, ExportJob.FAILED)}
+        for job in cls.jobs.values():
+            counts[job.status] += 1
+        counts['result_bytes'] = cls.result_bytes
+        return counts
+
+    @classmethod
+    async def _consume(cls):
+        queue = cls.queue
+        while True:
+            job = await queue.get()
+            try:
+                await cls._run(job)
+            finally:
+                queue.task_done()
+
+    @classmethod
+    async def _run(cls, job: ExportJob):
+        job.status = ExportJob.RUNNING
+        try:
+            buffer = await render_export_queued(job.resume, job.file_format, job.template)
+            job.result = buffer.getvalue()
+            job.status = ExportJob.DONE
+            cls.result_bytes += len(job.result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Export job {job.id} failed: {e}")
+            job.error = str(e)
+            job.status = ExportJob.FAILED
+        finally:
+            job.finished_at = time.time()
+            # The resume document is only needed to render
+            job.resume = {'_id': job.resume.get('_id'), 'title': job.resume.get('title', 'resume')}
+            cls._purge()
+
+    @classmethod
+    def _purge(cls):
+        """Drop jobs past EXPORT_JOB_TTL, then the oldest results over EXPORT_JOB_MAX_RESULT_BYTES"""
+        cutoff = time.time() - settings.EXPORT_JOB_TTL
+        expired = [job_id for job_id, job in cls.jobs.items() if job.finished_at and job.finished_at < cutoff]
+        for job_id in expired:
+            cls._drop(job_id)
+        if cls.result_bytes <= settings.EXPORT_JOB_MAX_RESULT_BYTES:
+            return
+        done = sorted((job for job in cls.jobs.values() if job.result is not None), key=lambda job: job.finished_at)
+        for job in done:
+            if cls.result_bytes <= settings.EXPORT_JOB_MAX_RESULT_BYTES:
+                break
+            logger.info(f"Export job {job.id} expired early to stay within EXPORT_JOB_MAX_RESULT_BYTES")
+            cls._drop(job.id)
+
+    @classmethod
+    def _drop(cls, job_id: str):
+        job = cls.jobs.pop(job_id)
+        if job.result is not None:
+            cls.result_bytes -= len(job.result)
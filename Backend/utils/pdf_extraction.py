@@ -0,0 +1,139 @@
+"""PDF text extraction - engines that turn uploaded PDFs into text and layout blocks"""
+
+import logging
+from abc import ABC, abstractmethod
+from io import BytesIO
+from typing import Dict, List, NamedTuple, Optional, Tuple, Union
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class TextBlock(NamedTuple):
+    """A block of text as laid out on a page, with the largest font size used in it"""
+    page: int
+    bbox: Tuple[float, float, float, float]
+    text: str
+    font_size: float
+    bold: bool
+
+
+class PDFText(NamedTuple):
+    """Text of a PDF and, from engines that read the layout, its blocks in page order"""
+    text: str
+    blocks: List[TextBlock]
+    pages: int
+    engine: str
+
+
+# A PDF's path, or its contents
+PDFSource = Union[str, bytes]
+
+
+class PDFTextEngine(ABC):
+    """One way of extracting text from a PDF; ENGINES holds one instance of each"""
+
+    name = ''
+
+    @abstractmethod
+    def available(self) -> bool:
+        """Whether the library behind the engine is installed"""
+        pass
+
+    @abstractmethod
+    def extract(self, source: PDFSource) -> PDFText:
+        """Text, and layout if the engine reads it, of a PDF's path or bytes"""
+        pass
+
+
+class PyMuPDFEngine(PDFTextEngine):
+    """MuPDF's text layout: reading-order blocks, font sizes and weights"""
+
+    name = 'pymupdf'
+
+    # Span flag MuPDF sets for bold fonts
+    BOLD = 16
+
+    def available(self) -> bool:
+        try:
+            import fitz  # noqa: F401 - PyMuPDF
+        except ImportError:
+            return False
+        return True
+
+    def extract(self, source: PDFSource) -> PDFText:
+        import fitz  # PyMuPDF
+
+        blocks = []
+        if isinstance(source, bytes):
+            doc = fitz.open(stream=source, filetype='pdf')
+        else:
+            doc = fitz.open(source, filetype='pdf')
+        with doc:
+            pages = len(doc)
+            for number, page in enumerate(doc):
+                for block in page.get_text('dict', flags=fitz.TEXTFLAGS_TEXT)['blocks']:
+                    spans = [span for line in block['lines'] for span in line['spans'] if span['text'].strip()]
+                    if not spans:
+                        continue
+                    lines = ("".join(span['text'] for span in line['spans']).strip() for line in block['lines'])
+                    blocks.append(TextBlock(
+                        page=number,
+                        bbox=tuple(block['bbox']),
+                        text="\n".join(line for line in lines if line),
+                        font_size=max(span['size'] for span in spans),
+                        bold=all(span['flags'] & self.BOLD for span in spans),
+                    ))
+        return PDFText("\n".join(block.text for block in blocks), blocks, pages, self.name)
+
+
+class PypdfEngine(PDFTextEngine):
+    """pypdf's text extraction, without layout"""
+
+    name = 'pypdf'
+
+    def available(self) -> bool:
+        try:
+            import pypdf  # noqa: F401
+        except ImportError:
+            return False
+        return True
+
+    def extract(self, source: PDFSource) -> PDFText:
+        from pypdf import PdfReader
+
+        reader = PdfReader(BytesIO(source) if isinstance(source, bytes) else source)
+        text = "\n".join(page.extract_text() for page in reader.pages)
+        return PDFText(text, [], len(reader.pages), self.name)
+
+
+# Instantiated at import, so an engine missing an override fails here rather than mid-upload
+ENGINES: Dict[str, PDFTextEngine] = {engine.name: engine for engine in (PyMuPDFEngine(), PypdfEngine())}
+
+
+def extract_pdf_text(source: PDFSource, engines: Optional[List[str]] = None) -> PDFText:
+    """
+    Extract text from a PDF's path or bytes with the first of engines
+    (PDF_TEXT_ENGINES by default) that is installed and finds any text; the
+    next engine is tried when one fails or comes back empty. Raises the last
+    error if no engine could read the PDF.
+    """
+    result = None
+    error: Optional[Exception] = None
+    for name in engines or settings.PDF_TEXT_ENGINES:
+        engine = ENGINES.get(name)
+        if engine is None or not engine.available():
+            logger.warning(f"PDF text engine {name} is not available")
+            continue
+        try:
+            result = engine.extract(source)
+        except Exception as e:
+            logger.warning(f"{name} could not read the PDF, trying the next engine: {e}")
+            error = e
+            continue
+        if result.text.strip():
+            return result
+    if result is not None:
+        return result
+    raise error or RuntimeError("No PDF text engine is installed")
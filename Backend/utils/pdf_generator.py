@@ -5,7 +5,11 @@ from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Tabl
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_RIGHT
 from io import BytesIO
-from typing import Dict, Any
+from typing import Dict, Any, Union
+
+from config import settings
+from templates.resume_document import ResumeDocument
+from templates.style_registry import StyleRegistry
 
 
 class PDFGenerator:
@@ -21,21 +25,8 @@ class PDFGenerator:
         hex_color = hex_color.lstrip('#')
         return tuple(int(hex_color[i:i+2], 16)/255 for i in (0, 2, 4))
     
-    def generate(self, resume_data: Dict[str, Any]) -> BytesIO:
-        """Generate PDF resume"""
-        doc = SimpleDocTemplate(
-            self.buffer,
-            pagesize=letter,
-            rightMargin=0.75*inch,
-            leftMargin=0.75*inch,
-            topMargin=0.75*inch,
-            bottomMargin=0.75*inch
-        )
-        
-        # Container for the 'Flowable' objects
-        elements = []
-        
-        # Define styles
+    def _modern_styles(self) -> Dict[str, ParagraphStyle]:
+        """Paragraph styles for the Modern layout"""
         styles = getSampleStyleSheet()
         
         # Custom styles
@@ -96,10 +87,52 @@ class PDFGenerator:
             alignment=TA_RIGHT,
         )
         
+        link_style = ParagraphStyle(
+            'Links',
+            parent=contact_style,
+            textColor=colors.HexColor(self.theme_color)
+        )
+        
+        return {
+            'title': title_style,
+            'contact': contact_style,
+            'heading': heading_style,
+            'subheading': subheading_style,
+            'body': body_style,
+            'date': date_style,
+            'link': link_style,
+        }
+    
+    def generate(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> BytesIO:
+        """Generate PDF resume"""
+        resume = ResumeDocument.of(resume_data)
+        doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=letter,
+            rightMargin=0.75*inch,
+            leftMargin=0.75*inch,
+            topMargin=0.75*inch,
+            bottomMargin=0.75*inch,
+            invariant=settings.DETERMINISTIC_PDF
+        )
+        
+        # Container for the 'Flowable' objects
+        elements = []
+        
+        # Define styles, built once per theme colour and shared between renders
+        styles = StyleRegistry.get('PDFGenerator.modern', self.theme_color, self._modern_styles)
+        title_style = styles['title']
+        contact_style = styles['contact']
+        heading_style = styles['heading']
+        subheading_style = styles['subheading']
+        body_style = styles['body']
+        date_style = styles['date']
+        link_style = styles['link']
+        
         # Personal Info - Header with underline
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], title_style))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, title_style))
             # Add underline using a table
             underline = Table([['']], colWidths=[6*inch])
             underline.setStyle(TableStyle([
@@ -111,90 +144,73 @@ class PDFGenerator:
         
         # Contact information
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
         
         if contact_parts:
             elements.append(Paragraph(' | '.join(contact_parts), contact_style))
         
         # Links
         links = []
-        if personal_info.get('linkedin'):
-            links.append(f"LinkedIn: {personal_info['linkedin']}")
-        if personal_info.get('github'):
-            links.append(f"GitHub: {personal_info['github']}")
-        if personal_info.get('website'):
-            links.append(f"Website: {personal_info['website']}")
+        if personal_info.linkedin:
+            links.append(f"LinkedIn: {personal_info.linkedin}")
+        if personal_info.github:
+            links.append(f"GitHub: {personal_info.github}")
+        if personal_info.website:
+            links.append(f"Website: {personal_info.website}")
         
         if links:
-            link_style = ParagraphStyle(
-                'Links',
-                parent=contact_style,
-                textColor=colors.HexColor(self.theme_color)
-            )
             elements.append(Paragraph(' | '.join(links), link_style))
         
         elements.append(Spacer(1, 0.2*inch))
         
         # Summary/Objective
-        if resume_data.get('summary'):
+        if resume.summary:
             elements.append(Paragraph('CAREER OBJECTIVE / PROFESSIONAL SUMMARY', heading_style))
-            elements.append(Paragraph(resume_data['summary'], body_style))
+            elements.append(Paragraph(resume.summary, body_style))
             elements.append(Spacer(1, 0.1*inch))
-        elif resume_data.get('objective'):
+        elif resume.objective:
             elements.append(Paragraph('OBJECTIVE', heading_style))
-            elements.append(Paragraph(resume_data['objective'], body_style))
+            elements.append(Paragraph(resume.objective, body_style))
             elements.append(Spacer(1, 0.1*inch))
         
         # Skills - MOVED UP
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('TECHNICAL SKILLS', heading_style))
-            skills = resume_data['skills']
-            
-            # Handle both formats: List[str] or List[{category, items}]
-            if skills and isinstance(skills[0], dict):
-                # New format with categories
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skills_text = f"<b>{category}:</b> {', '.join(items)}"
-                        elements.append(Paragraph(skills_text, body_style))
-            else:
-                # Old format: simple list
-                skills_text = ', '.join(skills)
+            for group in resume.skills:
+                skills_text = f"<b>{group.category}:</b> {group.text}" if group.category else group.text
                 elements.append(Paragraph(skills_text, body_style))
             
             elements.append(Spacer(1, 0.1*inch))
         
         # Projects - MOVED UP
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', heading_style))
-            for proj in resume_data['projects']:
-                proj_title = f"<b>{proj.get('name', 'Project')}</b>"
+            for proj in resume.projects:
+                proj_title = f"<b>{proj.name or 'Project'}</b>"
                 elements.append(Paragraph(proj_title, subheading_style))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], body_style))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, body_style))
                 
-                if proj.get('technologies'):
-                    tech_text = f"<b>Technologies:</b> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"<b>Technologies:</b> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, body_style))
                 
                 elements.append(Spacer(1, 0.1*inch))
         
         # Experience / Internship Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('INTERNSHIP / WORK EXPERIENCE', heading_style))
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Create a table for position (left) and dates (right)
-                date_range = f"{exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                date_range = f"{exp.start_date or 'Start'} - {exp.end_text}"
                 
-                position_cell = Paragraph(f"<b>{exp.get('position', 'Position')}</b>", subheading_style)
+                position_cell = Paragraph(f"<b>{exp.position or 'Position'}</b>", subheading_style)
                 date_cell = Paragraph(f"<i>{date_range}</i>", date_style)
                 
                 exp_table = Table([[position_cell, date_cell]], colWidths=[4.5*inch, 1.5*inch])
@@ -206,42 +222,33 @@ class PDFGenerator:
                 elements.append(exp_table)
                 
                 # Company
-                elements.append(Paragraph(exp.get('company', 'Company'), body_style))
-                
-                # Description (can be string or list)
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:  # Skip empty strings
-                                elements.append(Paragraph(f"• {item}", body_style))
-                    else:
-                        elements.append(Paragraph(description, body_style))
-                
-                # Achievements
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", body_style))
+                elements.append(Paragraph(exp.company or 'Company', body_style))
+                
+                # Description and achievements
+                if exp.description:
+                    elements.append(Paragraph(exp.description, body_style))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", body_style))
                 
                 elements.append(Spacer(1, 0.1*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', heading_style))
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b> - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b> - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 elements.append(Paragraph(cert_text, body_style))
             elements.append(Spacer(1, 0.1*inch))
         
         # Education - MOVED TO END
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', heading_style))
-            for edu in resume_data['education']:
+            for edu in resume.education:
                 # Handle both field_of_study and field
-                field = edu.get('field_of_study') or edu.get('field', '')
-                edu_title = f"<b>{edu.get('degree', 'Degree')}</b>"
+                field = edu.field
+                edu_title = f"<b>{edu.degree or 'Degree'}</b>"
                 if field:
                     edu_title += f" in {field}"
                 
@@ -249,13 +256,7 @@ class PDFGenerator:
                 degree_cell = Paragraph(edu_title, subheading_style)
                 
                 # Handle graduation_date or start_date/end_date
-                date_text = ''
-                if edu.get('graduation_date'):
-                    date_text = edu['graduation_date']
-                else:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+                date_text = edu.dates()
                 
                 if date_text:
                     date_cell = Paragraph(f"<i>{date_text}</i>", date_style)
@@ -270,12 +271,11 @@ class PDFGenerator:
                     elements.append(degree_cell)
                 
                 # Institution
-                elements.append(Paragraph(edu.get('institution', 'Institution'), body_style))
+                elements.append(Paragraph(edu.institution or 'Institution', body_style))
                 
                 # Handle GPA
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", body_style))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", body_style))
                 
                 elements.append(Spacer(1, 0.1*inch))
         
@@ -284,18 +284,8 @@ class PDFGenerator:
         self.buffer.seek(0)
         return self.buffer
 
-    def _generate_google(self, resume_data: Dict[str, Any]) -> BytesIO:
-        """Generate Google-style PDF resume - Clean, minimalist, technical focus"""
-        doc = SimpleDocTemplate(
-            self.buffer,
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch
-        )
-        
-        elements = []
+    def _google_styles(self) -> Dict[str, ParagraphStyle]:
+        """Paragraph styles for the Google layout"""
         styles = getSampleStyleSheet()
         
         # Google style: Simple, clean, Helvetica-like fonts
@@ -356,21 +346,53 @@ class PDFGenerator:
             leading=11,
         )
         
+        return {
+            'name': name_style,
+            'contact': contact_style,
+            'section': section_style,
+            'item_title': item_title_style,
+            'item_subtitle': item_subtitle_style,
+            'body': body_style,
+        }
+    
+    def _generate_google(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> BytesIO:
+        """Generate Google-style PDF resume - Clean, minimalist, technical focus"""
+        resume = ResumeDocument.of(resume_data)
+        doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=letter,
+            rightMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch,
+            invariant=settings.DETERMINISTIC_PDF
+        )
+        
+        elements = []
+        # Built once and shared between renders
+        styles = StyleRegistry.get('PDFGenerator.google', None, self._google_styles)
+        name_style = styles['name']
+        contact_style = styles['contact']
+        section_style = styles['section']
+        item_title_style = styles['item_title']
+        item_subtitle_style = styles['item_subtitle']
+        body_style = styles['body']
+        
         # Personal Info - Google minimalist style
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'].upper(), name_style))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name.upper(), name_style))
         
         # Contact - all on one line
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('linkedin'):
-            contact_parts.append(personal_info['linkedin'].replace('https://linkedin.com/in/', ''))
-        if personal_info.get('github'):
-            contact_parts.append(personal_info['github'].replace('https://github.com/', 'github.com/'))
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.linkedin:
+            contact_parts.append(personal_info.linkedin.replace('https://linkedin.com/in/', ''))
+        if personal_info.github:
+            contact_parts.append(personal_info.github.replace('https://github.com/', 'github.com/'))
         
         if contact_parts:
             elements.append(Paragraph(' • '.join(contact_parts), contact_style))
@@ -379,24 +401,18 @@ class PDFGenerator:
         elements.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=8))
         
         # Education First (Google style)
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', section_style))
-            for edu in resume_data['education']:
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = f"{edu.get('degree', 'Degree')}"
+            for edu in resume.education:
+                field = edu.field
+                degree_text = f"{edu.degree or 'Degree'}"
                 if field:
                     degree_text += f", {field}"
                 
                 # Create table for institution (left) and dates (right)
-                inst_cell = Paragraph(f"<b>{edu.get('institution', 'Institution')}</b>", item_title_style)
+                inst_cell = Paragraph(f"<b>{edu.institution or 'Institution'}</b>", item_title_style)
                 
-                date_text = ''
-                if edu.get('graduation_date'):
-                    date_text = edu['graduation_date']
-                else:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+                date_text = edu.dates()
                 
                 if date_text:
                     date_cell = Paragraph(date_text, item_subtitle_style)
@@ -413,37 +429,27 @@ class PDFGenerator:
                 
                 elements.append(Paragraph(degree_text, body_style))
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", body_style))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Technical Skills
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('TECHNICAL SKILLS', section_style))
-            skills = resume_data['skills']
-            
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skills_text = f"<b>{category}:</b> {', '.join(items)}"
-                        elements.append(Paragraph(skills_text, body_style))
-            else:
-                skills_text = ', '.join(skills)
+            for group in resume.skills:
+                skills_text = f"<b>{group.category}:</b> {group.text}" if group.category else group.text
                 elements.append(Paragraph(skills_text, body_style))
             
             elements.append(Spacer(1, 0.05*inch))
         
         # Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('EXPERIENCE', section_style))
-            for exp in resume_data['experience']:
-                date_range = f"{exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+            for exp in resume.experience:
+                date_range = f"{exp.start_date or 'Start'} - {exp.end_text}"
                 
-                position_cell = Paragraph(f"<b>{exp.get('position', 'Position')}</b>", item_title_style)
+                position_cell = Paragraph(f"<b>{exp.position or 'Position'}</b>", item_title_style)
                 date_cell = Paragraph(date_range, item_subtitle_style)
                 
                 exp_table = Table([[position_cell, date_cell]], colWidths=[5.5*inch, 2*inch])
@@ -455,46 +461,38 @@ class PDFGenerator:
                 ]))
                 elements.append(exp_table)
                 
-                elements.append(Paragraph(f"<i>{exp.get('company', 'Company')}</i>", item_subtitle_style))
-                
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", body_style))
-                    else:
-                        elements.append(Paragraph(description, body_style))
+                elements.append(Paragraph(f"<i>{exp.company or 'Company'}</i>", item_subtitle_style))
                 
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", body_style))
+                if exp.description:
+                    elements.append(Paragraph(exp.description, body_style))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', section_style))
-            for proj in resume_data['projects']:
-                proj_title = f"<b>{proj.get('name', 'Project')}</b>"
+            for proj in resume.projects:
+                proj_title = f"<b>{proj.name or 'Project'}</b>"
                 elements.append(Paragraph(proj_title, item_title_style))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(proj['description'], body_style))
+                if proj.description:
+                    elements.append(Paragraph(proj.description, body_style))
                 
-                if proj.get('technologies'):
-                    tech_text = f"<i>Technologies:</i> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"<i>Technologies:</i> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', section_style))
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b> - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b> - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 elements.append(Paragraph(cert_text, body_style))
             elements.append(Spacer(1, 0.05*inch))
         
@@ -502,18 +500,8 @@ class PDFGenerator:
         self.buffer.seek(0)
         return self.buffer
     
-    def _generate_amazon(self, resume_data: Dict[str, Any]) -> BytesIO:
-        """Generate Amazon-style PDF resume - Leadership principles, metrics-driven"""
-        doc = SimpleDocTemplate(
-            self.buffer,
-            pagesize=letter,
-            rightMargin=0.6*inch,
-            leftMargin=0.6*inch,
-            topMargin=0.6*inch,
-            bottomMargin=0.6*inch
-        )
-        
-        elements = []
+    def _amazon_styles(self) -> Dict[str, ParagraphStyle]:
+        """Paragraph styles for the Amazon layout"""
         styles = getSampleStyleSheet()
         
         # Amazon style: Professional, emphasis on impact metrics
@@ -574,72 +562,97 @@ class PDFGenerator:
             leftIndent=15,
         )
         
+        link_style = ParagraphStyle('AmazonLinks', parent=contact_style, fontSize=8)
+        
+        return {
+            'name': name_style,
+            'contact': contact_style,
+            'section': section_style,
+            'item_title': item_title_style,
+            'item_subtitle': item_subtitle_style,
+            'body': body_style,
+            'link': link_style,
+        }
+    
+    def _generate_amazon(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> BytesIO:
+        """Generate Amazon-style PDF resume - Leadership principles, metrics-driven"""
+        resume = ResumeDocument.of(resume_data)
+        doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=letter,
+            rightMargin=0.6*inch,
+            leftMargin=0.6*inch,
+            topMargin=0.6*inch,
+            bottomMargin=0.6*inch,
+            invariant=settings.DETERMINISTIC_PDF
+        )
+        
+        elements = []
+        # Built once and shared between renders
+        styles = StyleRegistry.get('PDFGenerator.amazon', None, self._amazon_styles)
+        name_style = styles['name']
+        contact_style = styles['contact']
+        section_style = styles['section']
+        item_title_style = styles['item_title']
+        item_subtitle_style = styles['item_subtitle']
+        body_style = styles['body']
+        link_style = styles['link']
+        
         # Personal Info - Amazon centered style
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], name_style))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, name_style))
         
         # Contact
         contact_parts = []
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
         
         if contact_parts:
             elements.append(Paragraph(' | '.join(contact_parts), contact_style))
         
         # Links
         links = []
-        if personal_info.get('linkedin'):
-            links.append(personal_info['linkedin'])
-        if personal_info.get('github'):
-            links.append(personal_info['github'])
+        if personal_info.linkedin:
+            links.append(personal_info.linkedin)
+        if personal_info.github:
+            links.append(personal_info.github)
         
         if links:
-            link_style = ParagraphStyle('AmazonLinks', parent=contact_style, fontSize=8)
             elements.append(Paragraph(' | '.join(links), link_style))
             elements.append(Spacer(1, 0.1*inch))
         
         # Professional Summary
-        if resume_data.get('summary') or resume_data.get('objective'):
+        if resume.profile:
             elements.append(Paragraph('PROFESSIONAL SUMMARY', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
-            summary_text = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary_text, body_style))
+            elements.append(Paragraph(resume.profile, body_style))
             elements.append(Spacer(1, 0.05*inch))
         
         # Core Competencies / Skills
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('CORE COMPETENCIES', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
-            skills = resume_data['skills']
-            
-            if skills and isinstance(skills[0], dict):
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skills_text = f"<b>{category}:</b> {', '.join(items)}"
-                        elements.append(Paragraph(skills_text, body_style))
-            else:
-                skills_text = ', '.join(skills)
+            for group in resume.skills:
+                skills_text = f"<b>{group.category}:</b> {group.text}" if group.category else group.text
                 elements.append(Paragraph(skills_text, body_style))
             
             elements.append(Spacer(1, 0.05*inch))
         
         # Professional Experience
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('PROFESSIONAL EXPERIENCE', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
             
-            for exp in resume_data['experience']:
-                date_range = f"{exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+            for exp in resume.experience:
+                date_range = f"{exp.start_date or 'Start'} - {exp.end_text}"
                 
                 # Company and Position
-                position_cell = Paragraph(f"<b>{exp.get('company', 'Company')}</b> - {exp.get('position', 'Position')}", item_title_style)
+                position_cell = Paragraph(f"<b>{exp.company or 'Company'}</b> - {exp.position or 'Position'}", item_title_style)
                 date_cell = Paragraph(date_range, item_subtitle_style)
                 
                 exp_table = Table([[position_cell, date_cell]], colWidths=[5*inch, 1.5*inch])
@@ -652,59 +665,45 @@ class PDFGenerator:
                 elements.append(exp_table)
                 
                 # Impact-focused descriptions (Amazon loves metrics!)
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", body_style))
-                    else:
-                        elements.append(Paragraph(f"• {description}", body_style))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", body_style))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", body_style))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", body_style))
                 
                 elements.append(Spacer(1, 0.08*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('KEY PROJECTS', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
             
-            for proj in resume_data['projects']:
-                proj_title = f"<b>{proj.get('name', 'Project')}</b>"
+            for proj in resume.projects:
+                proj_title = f"<b>{proj.name or 'Project'}</b>"
                 elements.append(Paragraph(proj_title, item_title_style))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(f"• {proj['description']}", body_style))
+                if proj.description:
+                    elements.append(Paragraph(f"• {proj.description}", body_style))
                 
-                if proj.get('technologies'):
-                    tech_text = f"• <b>Technologies Used:</b> {', '.join(proj['technologies'])}"
+                if proj.technologies:
+                    tech_text = f"• <b>Technologies Used:</b> {', '.join(proj.technologies)}"
                     elements.append(Paragraph(tech_text, body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
             
-            for edu in resume_data['education']:
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = f"{edu.get('degree', 'Degree')}"
+            for edu in resume.education:
+                field = edu.field
+                degree_text = f"{edu.degree or 'Degree'}"
                 if field:
                     degree_text += f" in {field}"
                 
-                inst_cell = Paragraph(f"<b>{edu.get('institution', 'Institution')}</b> - {degree_text}", item_title_style)
+                inst_cell = Paragraph(f"<b>{edu.institution or 'Institution'}</b> - {degree_text}", item_title_style)
                 
-                date_text = ''
-                if edu.get('graduation_date'):
-                    date_text = edu['graduation_date']
-                else:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+                date_text = edu.dates()
                 
                 if date_text:
                     date_cell = Paragraph(date_text, item_subtitle_style)
@@ -719,21 +718,20 @@ class PDFGenerator:
                 else:
                     elements.append(inst_cell)
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", body_style))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS & AWARDS', section_style))
             elements.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=4))
             
-            for cert in resume_data['certifications']:
-                cert_text = f"<b>{cert.get('name', 'Certification')}</b> - {cert.get('issuer', 'Issuer')}"
-                if cert.get('date'):
-                    cert_text += f" ({cert['date']})"
+            for cert in resume.certifications:
+                cert_text = f"<b>{cert.name or 'Certification'}</b> - {cert.issuer or 'Issuer'}"
+                if cert.date:
+                    cert_text += f" ({cert.date})"
                 elements.append(Paragraph(f"• {cert_text}", body_style))
             elements.append(Spacer(1, 0.05*inch))
         
@@ -741,18 +739,8 @@ class PDFGenerator:
         self.buffer.seek(0)
         return self.buffer
     
-    def _generate_meta(self, resume_data: Dict[str, Any]) -> BytesIO:
-        """Generate Meta/Facebook-style PDF resume - Bold, impact-first, modern"""
-        doc = SimpleDocTemplate(
-            self.buffer,
-            pagesize=letter,
-            rightMargin=0.5*inch,
-            leftMargin=0.5*inch,
-            topMargin=0.5*inch,
-            bottomMargin=0.5*inch
-        )
-        
-        elements = []
+    def _meta_styles(self) -> Dict[str, ParagraphStyle]:
+        """Paragraph styles for the Meta layout"""
         styles = getSampleStyleSheet()
         
         # Meta style: Bold headers, clean layout, impact metrics
@@ -825,67 +813,95 @@ class PDFGenerator:
             leftIndent=12,
         )
         
+        summary_style = ParagraphStyle(
+            'MetaSummary',
+            parent=body_style,
+            fontSize=10,
+            spaceAfter=8,
+        )
+        
+        return {
+            'name': name_style,
+            'contact': contact_style,
+            'section': section_style,
+            'item_title': item_title_style,
+            'item_subtitle': item_subtitle_style,
+            'body': body_style,
+            'impact': impact_style,
+            'summary': summary_style,
+        }
+    
+    def _generate_meta(self, resume_data: Union[ResumeDocument, Dict[str, Any]]) -> BytesIO:
+        """Generate Meta/Facebook-style PDF resume - Bold, impact-first, modern"""
+        resume = ResumeDocument.of(resume_data)
+        doc = SimpleDocTemplate(
+            self.buffer,
+            pagesize=letter,
+            rightMargin=0.5*inch,
+            leftMargin=0.5*inch,
+            topMargin=0.5*inch,
+            bottomMargin=0.5*inch,
+            invariant=settings.DETERMINISTIC_PDF
+        )
+        
+        elements = []
+        # Built once and shared between renders
+        styles = StyleRegistry.get('PDFGenerator.meta', None, self._meta_styles)
+        name_style = styles['name']
+        contact_style = styles['contact']
+        section_style = styles['section']
+        item_title_style = styles['item_title']
+        item_subtitle_style = styles['item_subtitle']
+        body_style = styles['body']
+        impact_style = styles['impact']
+        summary_style = styles['summary']
+        
         # Personal Info - Meta bold style
-        personal_info = resume_data.get('personal_info', {})
-        if personal_info.get('name'):
-            elements.append(Paragraph(personal_info['name'], name_style))
+        personal_info = resume.personal_info
+        if personal_info.name:
+            elements.append(Paragraph(personal_info.name, name_style))
         
         # Contact - compact format
         contact_parts = []
-        if personal_info.get('phone'):
-            contact_parts.append(personal_info['phone'])
-        if personal_info.get('email'):
-            contact_parts.append(personal_info['email'])
-        if personal_info.get('location'):
-            contact_parts.append(personal_info['location'])
-        if personal_info.get('linkedin'):
-            linkedin_clean = personal_info['linkedin'].replace('https://', '').replace('http://', '')
+        if personal_info.phone:
+            contact_parts.append(personal_info.phone)
+        if personal_info.email:
+            contact_parts.append(personal_info.email)
+        if personal_info.location:
+            contact_parts.append(personal_info.location)
+        if personal_info.linkedin:
+            linkedin_clean = personal_info.linkedin.replace('https://', '').replace('http://', '')
             contact_parts.append(linkedin_clean)
-        if personal_info.get('github'):
-            github_clean = personal_info['github'].replace('https://', '').replace('http://', '')
+        if personal_info.github:
+            github_clean = personal_info.github.replace('https://', '').replace('http://', '')
             contact_parts.append(github_clean)
         
         if contact_parts:
             elements.append(Paragraph(' • '.join(contact_parts), contact_style))
         
         # Summary (if available)
-        if resume_data.get('summary') or resume_data.get('objective'):
-            summary_style = ParagraphStyle(
-                'MetaSummary',
-                parent=body_style,
-                fontSize=10,
-                spaceAfter=8,
-            )
-            summary_text = resume_data.get('summary') or resume_data.get('objective')
-            elements.append(Paragraph(summary_text, summary_style))
+        if resume.profile:
+            elements.append(Paragraph(resume.profile, summary_style))
         
         # Technical Skills - Compact format
-        if resume_data.get('skills'):
+        if resume.skills:
             elements.append(Paragraph('TECHNICAL SKILLS', section_style))
-            skills = resume_data['skills']
-            
-            if skills and isinstance(skills[0], dict):
-                skill_lines = []
-                for skill_cat in skills:
-                    category = skill_cat.get('category', '')
-                    items = skill_cat.get('items', [])
-                    if category and items:
-                        skill_lines.append(f"<b>{category}:</b> {', '.join(items)}")
-                elements.append(Paragraph(' | '.join(skill_lines), body_style))
-            else:
-                skills_text = ', '.join(skills)
-                elements.append(Paragraph(skills_text, body_style))
+            skill_lines = [
+                f"<b>{group.category}:</b> {group.text}" if group.category else group.text
+                for group in resume.skills
+            ]
+            elements.append(Paragraph(' | '.join(skill_lines), body_style))
             
             elements.append(Spacer(1, 0.05*inch))
         
         # Experience - Impact first
-        if resume_data.get('experience'):
+        if resume.experience:
             elements.append(Paragraph('EXPERIENCE', section_style))
             
-            for exp in resume_data['experience']:
+            for exp in resume.experience:
                 # Title row
-                position_text = f"<b>{exp.get('position', 'Position')}</b> | {exp.get('company', 'Company')}"
-                date_range = f"{exp.get('start_date', 'Start')} - {exp.get('end_date', 'Present') if not exp.get('current') else 'Present'}"
+                position_text = f"<b>{exp.position or 'Position'}</b> | {exp.company or 'Company'}"
+                date_range = f"{exp.start_date or 'Start'} - {exp.end_text}"
                 
                 title_cell = Paragraph(position_text, item_title_style)
                 date_cell = Paragraph(date_range, item_subtitle_style)
@@ -900,59 +916,45 @@ class PDFGenerator:
                 elements.append(title_table)
                 
                 # Impact bullets
-                description = exp.get('description')
-                if description:
-                    if isinstance(description, list):
-                        for item in description:
-                            if item:
-                                elements.append(Paragraph(f"• {item}", impact_style))
-                    else:
-                        elements.append(Paragraph(f"• {description}", impact_style))
-                
-                if exp.get('achievements'):
-                    for achievement in exp['achievements']:
-                        elements.append(Paragraph(f"• {achievement}", impact_style))
+                if exp.description:
+                    elements.append(Paragraph(f"• {exp.description}", impact_style))
+                for item in exp.highlights + exp.achievements:
+                    elements.append(Paragraph(f"• {item}", impact_style))
                 
                 elements.append(Spacer(1, 0.06*inch))
         
         # Projects
-        if resume_data.get('projects'):
+        if resume.projects:
             elements.append(Paragraph('PROJECTS', section_style))
             
-            for proj in resume_data['projects']:
-                proj_title = f"<b>{proj.get('name', 'Project')}</b>"
+            for proj in resume.projects:
+                proj_title = f"<b>{proj.name or 'Project'}</b>"
                 
-                if proj.get('technologies'):
-                    tech_list = ', '.join(proj['technologies'])
+                if proj.technologies:
+                    tech_list = ', '.join(proj.technologies)
                     proj_title += f" | <i>{tech_list}</i>"
                 
                 elements.append(Paragraph(proj_title, item_title_style))
                 
-                if proj.get('description'):
-                    elements.append(Paragraph(f"• {proj['description']}", impact_style))
+                if proj.description:
+                    elements.append(Paragraph(f"• {proj.description}", impact_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Education
-        if resume_data.get('education'):
+        if resume.education:
             elements.append(Paragraph('EDUCATION', section_style))
             
-            for edu in resume_data['education']:
-                field = edu.get('field_of_study') or edu.get('field', '')
-                degree_text = f"<b>{edu.get('degree', 'Degree')}</b>"
+            for edu in resume.education:
+                field = edu.field
+                degree_text = f"<b>{edu.degree or 'Degree'}</b>"
                 if field:
                     degree_text += f" in {field}"
-                degree_text += f" | {edu.get('institution', 'Institution')}"
+                degree_text += f" | {edu.institution or 'Institution'}"
                 
                 degree_cell = Paragraph(degree_text, item_title_style)
                 
-                date_text = ''
-                if edu.get('graduation_date'):
-                    date_text = edu['graduation_date']
-                else:
-                    date_range = f"{edu.get('start_date', '')} - {edu.get('end_date', '')}"
-                    if date_range.strip() != '-':
-                        date_text = date_range
+                date_text = edu.dates()
                 
                 if date_text:
                     date_cell = Paragraph(date_text, item_subtitle_style)
@@ -967,23 +969,22 @@ class PDFGenerator:
                 else:
                     elements.append(degree_cell)
                 
-                if edu.get('gpa') or edu.get('grade'):
-                    gpa = edu.get('gpa') or edu.get('grade')
-                    elements.append(Paragraph(f"GPA: {gpa}", body_style))
+                if edu.gpa:
+                    elements.append(Paragraph(f"GPA: {edu.gpa}", body_style))
                 
                 elements.append(Spacer(1, 0.05*inch))
         
         # Certifications
-        if resume_data.get('certifications'):
+        if resume.certifications:
             elements.append(Paragraph('CERTIFICATIONS', section_style))
             
             cert_items = []
-            for cert in resume_data['certifications']:
-                cert_text = f"{cert.get('name', 'Certification')}"
-                if cert.get('issuer'):
-                    cert_text += f" ({cert['issuer']})"
-                if cert.get('date'):
-                    cert_text += f" - {cert['date']}"
+            for cert in resume.certifications:
+                cert_text = f"{cert.name or 'Certification'}"
+                if cert.issuer:
+                    cert_text += f" ({cert.issuer})"
+                if cert.date:
+                    cert_text += f" - {cert.date}"
                 cert_items.append(cert_text)
             
             elements.append(Paragraph(' | '.join(cert_items), body_style))
@@ -994,7 +995,7 @@ class PDFGenerator:
         return self.buffer
 
 
-def generate_pdf_resume(resume_data: Dict[str, Any], template: str = "modern", theme_color: str = "#3B82F6") -> BytesIO:
+def generate_pdf_resume(resume_data: Union[ResumeDocument, Dict[str, Any]], template: str = "modern", theme_color: str = "#3B82F6") -> BytesIO:
     """Main function to generate PDF resume"""
     generator = PDFGenerator(template, theme_color)
     return generator.generate(resume_data)
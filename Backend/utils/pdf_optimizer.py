@@ -0,0 +1,52 @@
+"""PDF optimizer - shrinks rendered PDFs with PyMuPDF before they are sent"""
+
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:
+    fitz = None
+
+try:
+    import fontTools  # noqa: F401 - PyMuPDF needs it to subset fonts
+except ImportError:
+    fontTools = None
+
+
+# garbage=4 drops unused objects and merges duplicate ones, streams included,
+# so fonts and images embedded more than once are stored once
+SAVE_OPTIONS = {
+    'garbage': 4,
+    'deflate': True,
+    'deflate_images': True,
+    'deflate_fonts': True,
+    # Keep the trailer ID the renderer wrote (see DETERMINISTIC_PDF)
+    'no_new_id': True,
+}
+
+# Object streams need PyMuPDF 1.24 or later
+if fitz is not None and 'use_objstms' in inspect.signature(fitz.Document.tobytes).parameters:
+    SAVE_OPTIONS['use_objstms'] = 1
+
+
+def optimize_pdf(pdf_bytes: bytes) -> bytes:
+    """
+    Garbage-collect, deduplicate and deflate a PDF, subset its fonts when
+    fontTools is installed and write object streams where PyMuPDF supports
+    them. Returns the input unchanged if PyMuPDF is missing, the PDF cannot
+    be read or the result would not be smaller.
+    """
+    if fitz is None:
+        return pdf_bytes
+    try:
+        with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+            if fontTools is not None:
+                doc.subset_fonts()
+            optimized = doc.tobytes(**SAVE_OPTIONS)
+    except Exception as e:
+        logger.warning(f"PDF optimization failed, sending the PDF as rendered: {e}")
+        return pdf_bytes
+    return optimized if len(optimized) < len(pdf_bytes) else pdf_bytes
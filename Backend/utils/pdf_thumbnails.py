@@ -0,0 +1,140 @@
+"""PDF thumbnails - page images of rendered PDFs for live previews"""
+
+import hashlib
+import math
+import os
+import threading
+from io import BytesIO
+from typing import Optional
+
+from fastapi import Request
+
+from config import settings
+from templates.render_cache import RenderCache
+from utils.render_executor import RenderExecutor
+
+IMAGE_MEDIA_TYPES = {
+    'png': 'image/png',
+    'webp': 'image/webp',
+}
+
+# Width used when neither width nor dpi is given, about a preview pane's size
+DEFAULT_WIDTH = 600
+
+# Space between stacked pages when every page is rendered
+PAGE_GAP = 16
+
+
+class ThumbnailTooLarge(ValueError):
+    """The PDF has more pages than a preview may stack"""
+    status_code = 400
+
+
+class ThumbnailCache(RenderCache):
+    """Page images keyed by the PDF's content hash and the requested size and format"""
+
+    _instance: Optional["ThumbnailCache"] = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def get_cache(cls) -> "ThumbnailCache":
+        """Return the process-wide thumbnail cache, kept apart from the PDFs it is made from"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                disk_dir = os.path.join(settings.RENDER_CACHE_DIR, "thumbnails") if settings.RENDER_CACHE_DIR else None
+                cls._instance = cls(settings.THUMBNAIL_CACHE_MAX_BYTES, disk_dir)
+            return cls._instance
+
+    @staticmethod
+    def thumbnail_key(pdf_bytes: bytes, image_format: str, width: Optional[int], dpi: Optional[int],
+                      all_pages: bool) -> str:
+        """Key of one rasterisation of a PDF"""
+        digest = hashlib.sha256(pdf_bytes).hexdigest()
+        canonical = f"thumbnail:{digest}:{image_format}:{width or ''}:{dpi or ''}:{'all' if all_pages else 'first'}"
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def rasterize_pdf(pdf_bytes: bytes, image_format: str = 'png', width: Optional[int] = None,
+                  dpi: Optional[int] = None, all_pages: bool = False) -> bytes:
+    """
+    Render page 1 (or every page, stacked top to bottom) as a PNG or WebP
+    image, scaled to width pixels or rendered at dpi; width wins if both
+    are given. Raises ThumbnailTooLarge for more than THUMBNAIL_MAX_PAGES
+    pages, and scales the image down to THUMBNAIL_MAX_PIXELS.
+    """
+    import fitz  # PyMuPDF
+
+    if image_format not in IMAGE_MEDIA_TYPES:
+        raise ValueError(f"Unsupported image format: {image_format}")
+    if width is None and dpi is None:
+        width = DEFAULT_WIDTH
+
+    with fitz.open(stream=pdf_bytes, filetype='pdf') as doc:
+        if all_pages and len(doc) > settings.THUMBNAIL_MAX_PAGES:
+            raise ThumbnailTooLarge(
+                f"Resume has {len(doc)} pages, previews show at most {settings.THUMBNAIL_MAX_PAGES}"
+            )
+        pages = list(doc) if all_pages else [doc[0]]
+        zooms = [width / page.rect.width if width else dpi / 72 for page in pages]
+        scale = _pixel_budget_scale([page.rect for page in pages], zooms)
+        pixmaps = []
+        for page, zoom in zip(pages, zooms):
+            zoom *= scale
+            pixmaps.append(page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False))
+
+    if len(pixmaps) == 1 and image_format == 'png':
+        return pixmaps[0].tobytes('png')
+
+    # Pillow stacks pages and writes WebP, which MuPDF cannot
+    from PIL import Image
+
+    images = [Image.frombytes('RGB', (pixmap.width, pixmap.height), pixmap.samples) for pixmap in pixmaps]
+    if len(images) == 1:
+        image = images[0]
+    else:
+        height = sum(page.height for page in images) + PAGE_GAP * (len(images) - 1)
+        image = Image.new('RGB', (max(page.width for page in images), height), 'white')
+        top = 0
+        for page in images:
+            image.paste(page, (0, top))
+            top += page.height + PAGE_GAP
+
+    output = BytesIO()
+    if image_format == 'webp':
+        image.save(output, 'WEBP', quality=settings.THUMBNAIL_WEBP_QUALITY, method=4)
+    else:
+        image.save(output, 'PNG')
+    return output.getvalue()
+
+
+def _image_area(rects, zooms, scale: float) -> float:
+    """Pixel area of the stacked image of these pages; MuPDF rounds each page up to whole pixels"""
+    width = max(math.ceil(rect.width * zoom * scale) + 1 for rect, zoom in zip(rects, zooms))
+    height = sum(math.ceil(rect.height * zoom * scale) + 1 for rect, zoom in zip(rects, zooms))
+    height += PAGE_GAP * (len(rects) - 1)
+    return width * height
+
+
+def _pixel_budget_scale(rects, zooms) -> float:
+    """Factor that brings the image within THUMBNAIL_MAX_PIXELS, 1 if it already is"""
+    area = _image_area(rects, zooms, 1.0)
+    if area <= settings.THUMBNAIL_MAX_PIXELS:
+        return 1.0
+    scale = math.sqrt(settings.THUMBNAIL_MAX_PIXELS / area)
+    # The gaps between pages do not shrink with the pages
+    while _image_area(rects, zooms, scale) > settings.THUMBNAIL_MAX_PIXELS:
+        scale *= 0.95
+    return scale
+
+
+async def render_thumbnail(pdf_bytes: bytes, image_format: str = 'png', width: Optional[int] = None,
+                           dpi: Optional[int] = None, all_pages: bool = False,
+                           request: Optional[Request] = None) -> bytes:
+    """rasterize_pdf on the render executor, reusing a cached image of the same PDF and size"""
+    cache = ThumbnailCache.get_cache()
+    key = ThumbnailCache.thumbnail_key(pdf_bytes, image_format, width, dpi, all_pages)
+    image = cache.get(key)
+    if image is None:
+        image = await RenderExecutor.run(rasterize_pdf, pdf_bytes, image_format, width, dpi, all_pages, request=request)
+        cache.put(key, image)
+    return image
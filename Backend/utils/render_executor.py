@@ -0,0 +1,271 @@
+"""Render executor - runs PDF/DOCX rendering on a bounded process pool"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, List, Optional, Tuple
+
+from fastapi import Request
+
+from config import settings
+from templates.latex_engines import LaTeXEngineRegistry
+
+logger = logging.getLogger(__name__)
+
+# Worker-side state, set up by _init_worker in each pool process
+_job_slots = None
+_cancel_tokens = None
+_current_job = None  # (slot, token) of the running job
+
+
+class RenderError(Exception):
+    """Base class for render scheduling failures"""
+    status_code = 500
+
+
+class RenderQueueFull(RenderError):
+    """Too many renders are queued"""
+    status_code = 503
+
+
+class RenderTimeout(RenderError):
+    """A render did not start within RENDER_QUEUE_TIMEOUT, or finish within RENDER_TIMEOUT of starting"""
+    status_code = 504
+    # Seconds the job had been running on a worker when it was abandoned, 0 if it never started
+    seconds = 0.0
+
+
+class RenderCancelled(RenderError):
+    """The client went away before the render finished"""
+    status_code = 499
+
+
+def _cancel_current_job(signum, frame):
+    """
+    Abort the running job if it is the one the parent cancelled; a signal
+    meant for a job that has since finished finds another token and is
+    ignored. subprocess.run kills any child pdflatex on the way out.
+    """
+    if _current_job is not None:
+        slot, token = _current_job
+        if _cancel_tokens[slot] == token:
+            raise RenderCancelled("Render cancelled")
+
+
+def _consume_result(job: asyncio.Future):
+    """Mark the outcome of abandoned jobs as retrieved so asyncio does not log it"""
+    if not job.cancelled():
+        job.exception()
+
+
+def _init_worker(job_slots, cancel_tokens, latex_engines):
+    """Pool process initializer"""
+    global _job_slots, _cancel_tokens
+    _job_slots = job_slots
+    _cancel_tokens = cancel_tokens
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, _cancel_current_job)
+    from templates.latex_template_processor import LaTeXTemplateProcessor
+    LaTeXEngineRegistry.load(latex_engines)
+    # Warm LaTeX workers belong to the process that runs the compiles
+    LaTeXTemplateProcessor.start_worker_pool()
+
+
+def _run_job(slot: int, token: int, fn: Callable, args: tuple, kwargs: dict) -> Any:
+    """Run one render, publishing this process id so the parent can time and cancel it"""
+    global _current_job
+    _current_job = (slot, token)
+    _job_slots[slot] = os.getpid()
+    try:
+        if _cancel_tokens[slot] == token:
+            # Cancelled after the pool had already handed it to this worker
+            raise RenderCancelled("Render cancelled")
+        return fn(*args, **kwargs)
+    finally:
+        _current_job = None
+        _job_slots[slot] = 0
+
+
+class RenderExecutor:
+    """Process pool for CPU-bound and subprocess-bound rendering"""
+
+    executor: Optional[ProcessPoolExecutor] = None
+    max_workers: int = 0
+    max_pending: int = 0
+    pending: int = 0
+    _free_slots: List[int] = []
+    _job_slots = None  # pid of the worker running each slot's job, 0 while queued
+    _cancel_tokens = None  # token of the job last cancelled in each slot
+    _next_token: int = 0
+
+    # Seconds between checks of whether a queued job has started
+    START_POLL_INTERVAL = 0.05
+
+    @classmethod
+    def start(cls):
+        """Start the process pool"""
+        if cls.executor is not None:
+            return
+        context = multiprocessing.get_context('spawn')
+        cls.max_workers = settings.RENDER_WORKERS or os.cpu_count() or 1
+        cls.max_pending = cls.max_workers + settings.RENDER_QUEUE_SIZE
+        cls._job_slots = context.Array('i', cls.max_pending, lock=False)
+        cls._cancel_tokens = context.Array('q', cls.max_pending, lock=False)
+        cls._free_slots = list(range(cls.max_pending))
+        cls.pending = 0
+        cls.executor = ProcessPoolExecutor(
+            max_workers=cls.max_workers,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(cls._job_slots, cls._cancel_tokens, LaTeXEngineRegistry.status())
+        )
+        logger.info(f"Render executor started with {cls.max_workers} workers")
+
+    @classmethod
+    def shutdown(cls):
+        """Stop the process pool, abandoning queued renders"""
+        if cls.executor is not None:
+            cls.executor.shutdown(wait=False, cancel_futures=True)
+            cls.executor = None
+
+    @classmethod
+    def stats(cls) -> dict:
+        """Queue depth for the health endpoint"""
+        return {
+            'workers': cls.max_workers,
+            'pending': cls.pending,
+            'max_pending': cls.max_pending,
+        }
+
+    @classmethod
+    async def run(cls, fn: Callable, *args, request: Optional[Request] = None,
+                  timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs) in the pool and await its result.
+
+        Raises RenderQueueFull when the queue is at capacity, RenderTimeout when
+        the job has run for ``timeout`` seconds (RENDER_TIMEOUT by default; time
+        spent queued does not count) or waited RENDER_QUEUE_TIMEOUT for a
+        worker, and RenderCancelled if ``request`` disconnects first. Running
+        jobs are interrupted in both cases.
+        """
+        if cls.executor is None:
+            cls.start()
+        if cls.pending >= cls.max_pending:
+            raise RenderQueueFull("Render queue is full, please retry shortly")
+
+        timeout = timeout or settings.RENDER_TIMEOUT
+        loop = asyncio.get_running_loop()
+        cls._next_token += 1
+        token = cls._next_token
+        try:
+            executor, slot, future = cls._submit(_run_job, token, fn, args, kwargs)
+        except BrokenProcessPool:
+            # A worker died (OOM killer, crash) since the last render; replace the pool once
+            cls._restart(cls.executor)
+            executor, slot, future = cls._submit(_run_job, token, fn, args, kwargs)
+        # The slot is reused only once the worker has let go of it
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(cls._release, executor, slot))
+        job = asyncio.wrap_future(future)
+        job.add_done_callback(_consume_result)
+        watcher = asyncio.ensure_future(cls._wait_for_disconnect(request)) if request else None
+        try:
+            waiting = {job, watcher} if watcher else {job}
+            done, started = await cls._wait(waiting, slot, timeout)
+        except asyncio.CancelledError:
+            cls._cancel(future, slot, token)
+            raise
+        finally:
+            if watcher:
+                watcher.cancel()
+
+        if job in done:
+            try:
+                return job.result()
+            except BrokenProcessPool:
+                cls._restart(executor)
+                raise
+
+        cls._cancel(future, slot, token)
+        if watcher in done:
+            raise RenderCancelled("Client disconnected during render")
+        if started is None:
+            raise RenderTimeout(f"Render did not start within {settings.RENDER_QUEUE_TIMEOUT:.0f}s, workers are busy")
+        error = RenderTimeout(f"Render did not finish within {timeout:.0f}s")
+        error.seconds = time.monotonic() - started
+        raise error
+
+    @classmethod
+    async def _wait(cls, waiting: set, slot: int, timeout: float) -> Tuple[set, Optional[float]]:
+        """
+        Wait for the first of waiting, with the timeout counted from when a
+        worker picks the job up and RENDER_QUEUE_TIMEOUT limiting the wait for
+        one; returns what finished and when the job started, None if it never did
+        """
+        queued_until = time.monotonic() + settings.RENDER_QUEUE_TIMEOUT
+        started = None
+        while True:
+            if started is None and cls._job_slots[slot]:
+                started = time.monotonic()
+            deadline = queued_until if started is None else started + timeout
+            wait = deadline - time.monotonic()
+            if started is None:
+                wait = min(wait, cls.START_POLL_INTERVAL)
+            done, _ = await asyncio.wait(waiting, timeout=max(wait, 0), return_when=asyncio.FIRST_COMPLETED)
+            if done or time.monotonic() >= deadline:
+                if not done and started is None and cls._job_slots[slot]:
+                    # Picked up just now; it gets its running time
+                    continue
+                return done, started
+
+    @classmethod
+    def _submit(cls, fn: Callable, token: int, *args) -> Tuple[ProcessPoolExecutor, int, Any]:
+        """Take a slot and submit to the current pool, giving the slot back if the pool refuses"""
+        executor = cls.executor
+        slot = cls._free_slots.pop()
+        cls.pending += 1
+        try:
+            return executor, slot, executor.submit(fn, slot, token, *args)
+        except BaseException:
+            cls.pending -= 1
+            cls._free_slots.append(slot)
+            raise
+
+    @classmethod
+    def _restart(cls, executor: Optional[ProcessPoolExecutor]):
+        """Replace a broken pool, unless another render has already done so"""
+        if executor is not None and executor is cls.executor:
+            logger.error("Render worker died, restarting the render executor")
+            cls.shutdown()
+            cls.start()
+
+    @classmethod
+    def _release(cls, executor: ProcessPoolExecutor, slot: int):
+        # Slots of a pool that has since been replaced belong to nobody
+        if executor is cls.executor:
+            cls.pending -= 1
+            cls._free_slots.append(slot)
+
+    @classmethod
+    def _cancel(cls, future, slot: int, token: int):
+        """Drop a queued job, or signal the worker running it"""
+        if future.cancel():
+            return
+        # Only the job holding this token acts on the signal, should the worker have moved on
+        cls._cancel_tokens[slot] = token
+        pid = cls._job_slots[slot]
+        if pid and hasattr(signal, 'SIGUSR1'):
+            try:
+                os.kill(pid, signal.SIGUSR1)
+            except ProcessLookupError:
+                pass
+
+    @staticmethod
+    async def _wait_for_disconnect(request: Request, interval: float = 0.5):
+        while not await request.is_disconnected():
+            await asyncio.sleep(interval)
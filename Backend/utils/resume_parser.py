@@ -1,6 +1,10 @@
 """Resume parser - extracts data from PDF/DOCX files"""
-from typing import Dict, Any, List
+from io import BytesIO
+from typing import Dict, Any, List, Optional, Sequence, Union
 import re
+import statistics
+
+from utils.pdf_extraction import TextBlock, extract_pdf_text
 
 
 def extract_email(text: str) -> str:
@@ -69,12 +73,26 @@ def extract_skills(text: str) -> List[str]:
     return found_skills
 
 
-def parse_resume_text(text: str) -> Dict[str, Any]:
-    """Parse resume text and extract structured data"""
+def extract_name(blocks: Sequence[TextBlock]) -> str:
+    """The name is the first line of the largest text on page 1, if it stands out from the rest"""
+    first_page = [block for block in blocks if block.page == 0]
+    if len(first_page) < 2:
+        return ""
+    largest = max(first_page, key=lambda block: block.font_size)
+    if largest.font_size <= statistics.median(block.font_size for block in first_page):
+        return ""
+    line = largest.text.split('\n', 1)[0].strip()
+    if '@' in line or re.search(r'\d', line) or len(line.split()) > 5:
+        return ""
+    return line
+
+
+def parse_resume_text(text: str, blocks: Optional[Sequence[TextBlock]] = None) -> Dict[str, Any]:
+    """Parse resume text and extract structured data; layout blocks, when given, locate the name"""
     
     # Extract personal info
     personal_info = {
-        'name': '',  # Would need more sophisticated NER for names
+        'name': extract_name(blocks) if blocks else '',  # Plain text would need NER for names
         'email': extract_email(text),
         'phone': extract_phone(text),
         'location': '',
@@ -104,17 +122,11 @@ def parse_resume_text(text: str) -> Dict[str, Any]:
     return resume_data
 
 
-def parse_pdf_resume(file_path: str) -> Dict[str, Any]:
-    """Parse PDF resume file"""
+def parse_pdf_resume(source: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse a PDF resume from its path or contents"""
     try:
-        from pypdf import PdfReader
-        
-        reader = PdfReader(file_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text()
-        
-        return parse_resume_text(text)
+        extracted = extract_pdf_text(source)
+        return parse_resume_text(extracted.text, extracted.blocks)
     except Exception as e:
         return {
             'error': f"Failed to parse PDF: {str(e)}",
@@ -123,12 +135,12 @@ def parse_pdf_resume(file_path: str) -> Dict[str, Any]:
         }
 
 
-def parse_docx_resume(file_path: str) -> Dict[str, Any]:
-    """Parse DOCX resume file"""
+def parse_docx_resume(source: Union[str, bytes]) -> Dict[str, Any]:
+    """Parse a DOCX resume from its path or contents"""
     try:
         from docx import Document
         
-        doc = Document(file_path)
+        doc = Document(BytesIO(source) if isinstance(source, bytes) else source)
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         
         return parse_resume_text(text)
@@ -138,3 +150,10 @@ def parse_docx_resume(file_path: str) -> Dict[str, Any]:
             'personal_info': {},
             'skills': []
         }
+
+
+def parse_resume_upload(source: Union[str, bytes], file_type: str) -> Dict[str, Any]:
+    """Parse an uploaded 'pdf' or 'docx' resume; runs on the render executor"""
+    if file_type == 'pdf':
+        return parse_pdf_resume(source)
+    return parse_docx_resume(source)
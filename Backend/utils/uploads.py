@@ -0,0 +1,74 @@
+"""Uploads - reads uploaded files within a size limit, into memory or a private temporary file"""
+
+import asyncio
+import os
+import tempfile
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, List, Union
+
+from fastapi import UploadFile
+
+from config import settings
+
+# Bytes read from the upload at a time
+CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLarge(Exception):
+    """The upload is larger than UPLOAD_MAX_BYTES"""
+    status_code = 413
+
+
+@asynccontextmanager
+async def spooled_upload(file: UploadFile, suffix: str = "") -> AsyncIterator[Union[bytes, str]]:
+    """
+    The upload's contents as bytes, or, above UPLOAD_SPOOL_BYTES, the path of
+    a temporary file with a random name that is removed on exit. Uploads
+    larger than UPLOAD_MAX_BYTES raise UploadTooLarge, without reading past
+    the limit. Disk writes run in a thread, off the event loop.
+    """
+    max_bytes = settings.UPLOAD_MAX_BYTES
+    if file.size is not None and file.size > max_bytes:
+        raise UploadTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+
+    chunks: List[bytes] = []
+    size = 0
+    spool = None
+    try:
+        while True:
+            chunk = await file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if size > max_bytes:
+                raise UploadTooLarge(f"File is larger than {max_bytes // (1024 * 1024)} MB")
+            if spool is None and size > settings.UPLOAD_SPOOL_BYTES:
+                # Large files go to the parse worker by path rather than through the pool's pipe
+                spool = await asyncio.to_thread(_open_spool, suffix, chunks)
+                chunks = []
+            if spool is not None:
+                await asyncio.to_thread(spool.write, chunk)
+            else:
+                chunks.append(chunk)
+
+        if spool is None:
+            yield b"".join(chunks)
+        else:
+            await asyncio.to_thread(spool.close)
+            yield spool.name
+    finally:
+        if spool is not None:
+            spool.close()
+            os.unlink(spool.name)
+
+
+def _open_spool(suffix: str, chunks: List[bytes]):
+    """A private temporary file holding the chunks read so far"""
+    spool = tempfile.NamedTemporaryFile(suffix=suffix, delete=False)
+    try:
+        spool.writelines(chunks)
+    except BaseException:
+        spool.close()
+        os.unlink(spool.name)
+        raise
+    return spool